@@ -0,0 +1,203 @@
+"""
+================================================================================
+EigenFlow API Payloads | 只读数据载荷
+
+信号清单 / 历史信号 / 净值曲线的 JSON 载荷与预序列化响应：
+- 每个载荷带数据版本键（core.loader.FileVersion 等），版本不变时直接复用
+  已序列化的字节（原文 + gzip）与强 ETag，不重新读取、不重新序列化
+- 供 api.server 提供 HTTP 服务，也供静态快照构建复用同一份载荷
+================================================================================
+"""
+
+import gzip
+import hashlib
+import json
+import math
+import os
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+
+from core import loader
+from core.archive import SignalArchive, normalize_date
+from core.security_master import load_master
+from core.signal_store import CURRENT_FILE, SignalStore, current_version_dir
+from core.trading_calendar import load_calendar
+from backtest.metrics import metrics_for
+
+
+# ==================== 常量 | Constants ====================
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAX_TOP_N = 500
+
+PreparedResponse = namedtuple('PreparedResponse', ['body', 'gzip_body', 'etag'])
+
+
+class DataRoot:
+    """数据目录（与 app_v3.py 使用相同的文件布局） | Data file layout"""
+
+    def __init__(self, base_dir: str = BASE_DIR):
+        self.base_dir = base_dir
+        self.signal_path = os.path.join(base_dir, 'trade_list_top10.csv')
+        self.signal_store_dir = os.path.join(base_dir, 'signal_store')
+        self.archive_dir = os.path.join(base_dir, 'signal_archive')
+        self.equity_path = os.path.join(base_dir, 'equity.csv')
+        self.securities_path = os.path.join(base_dir, 'securities.csv')
+        self.holidays_path = os.path.join(base_dir, 'holidays.csv')
+
+    def version_of(self, path: str):
+        """文件版本，不存在时为 None"""
+        return loader.file_version(path) if os.path.exists(path) else None
+
+    def signal_version(self):
+        """当前信号来源版本（列式存储优先）"""
+        current = os.path.join(self.signal_store_dir, CURRENT_FILE)
+        if os.path.exists(current):
+            return loader.file_version(current)
+        return self.version_of(self.signal_path)
+
+    def top_signals(self, n: int):
+        """Top-N 信号（列式存储优先，否则 CSV），不存在时为 None"""
+        current = os.path.join(self.signal_store_dir, CURRENT_FILE)
+        if os.path.exists(current):
+            store, _ = loader.load_cached(
+                current,
+                lambda data: SignalStore(current_version_dir(self.signal_store_dir)),
+                'signal_store',
+            )
+            return store.top(n)
+        if os.path.exists(self.signal_path):
+            return loader.read_csv(self.signal_path).head(n)
+        return None
+
+    def archive(self) -> SignalArchive:
+        return SignalArchive(self.archive_dir, load_calendar(self.holidays_path))
+
+
+# ==================== 序列化 | Serialization ====================
+
+def _clean(values) -> list:
+    """数组 -> JSON 列表（NaN / inf -> null，numpy 标量 -> Python）"""
+    out = []
+    for v in np.asarray(values).tolist():
+        if isinstance(v, float) and not math.isfinite(v):
+            v = None
+        out.append(v)
+    return out
+
+
+def prepare(payload: dict) -> PreparedResponse:
+    """序列化一次，得到原文 / gzip 字节与强 ETag | Serialize once"""
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':'), allow_nan=False).encode('utf-8')
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    return PreparedResponse(body, gzip.compress(body, compresslevel=6, mtime=0), etag)
+
+
+_prepared = {}
+_prepared_lock = threading.Lock()
+_MAX_PREPARED = 256
+
+
+def cached_response(key, build) -> PreparedResponse:
+    """
+    按数据版本键缓存预序列化响应
+
+    Args:
+        key: 含数据版本的缓存键
+        build: 无参函数，返回载荷 dict（仅在未命中时调用）
+    """
+    with _prepared_lock:
+        response = _prepared.get(key)
+    if response is not None:
+        return response
+    response = prepare(build())
+    with _prepared_lock:
+        if len(_prepared) >= _MAX_PREPARED:
+            _prepared.clear()
+        _prepared[key] = response
+    return response
+
+
+# ==================== 载荷 | Payloads ====================
+
+def _signal_rows(root: DataRoot, df) -> dict:
+    """信号表 -> 列式 JSON（rank / symbol / name / exchange / board / score）"""
+    df = load_master(root.securities_path).enrich(df)
+    rows = {
+        'rank': list(range(1, len(df) + 1)),
+        'symbol': df['symbol'].tolist(),
+        'name': df['name'].astype(str).tolist(),
+        'exchange': df['exchange'].tolist(),
+        'board': df['board'].tolist(),
+    }
+    if 'score' in df.columns:
+        rows['score'] = _clean(df['score'].to_numpy(dtype=np.float64))
+    return rows
+
+
+def latest_signals(root: DataRoot, n: int = 10):
+    """
+    当前信号清单
+
+    Returns:
+        PreparedResponse；无信号数据时为 None
+    """
+    n = max(1, min(int(n), MAX_TOP_N))
+    version = root.signal_version()
+    if version is None:
+        return None
+
+    def build():
+        updated = datetime.fromtimestamp(version.mtime_ns / 1e9).strftime('%Y-%m-%d %H:%M:%S')
+        return {'updated': updated, 'signals': _signal_rows(root, root.top_signals(n))}
+    key = ('latest', root.base_dir, version, root.version_of(root.securities_path), n)
+    return cached_response(key, build)
+
+
+def archive_dates(root: DataRoot):
+    """已归档的信号日期列表"""
+    archive = root.archive()
+    key = ('dates', root.base_dir, root.version_of(archive.index_path))
+    return cached_response(key, lambda: {'dates': archive.dates()})
+
+
+def archived_signals(root: DataRoot, day: str):
+    """
+    某一历史交易日的信号清单
+
+    Returns:
+        PreparedResponse；该日无归档时为 None
+    """
+    archive = root.archive()
+    day = normalize_date(day)
+    if day not in archive:
+        return None
+    key = ('day', root.base_dir, root.version_of(archive.index_path),
+           root.version_of(root.securities_path), day)
+    return cached_response(key, lambda: {'date': day, 'signals': _signal_rows(root, archive.load(day))})
+
+
+def equity_series(root: DataRoot):
+    """
+    净值曲线与汇总指标
+
+    Returns:
+        PreparedResponse；无净值数据时为 None
+    """
+    version = root.version_of(root.equity_path)
+    if version is None:
+        return None
+
+    def build():
+        metrics = metrics_for(root.equity_path)
+        df = loader.read_csv(root.equity_path, parse_dates=['date'])
+        summary = {k: _clean([v])[0] for k, v in metrics.summary().items()}
+        return {
+            'summary': summary,
+            'date': df['date'].dt.strftime('%Y-%m-%d').tolist(),
+            'equity': _clean(df['equity'].to_numpy(dtype=np.float64)),
+        }
+    return cached_response(('equity', root.base_dir, version), build)
@@ -0,0 +1,210 @@
+"""
+================================================================================
+EigenFlow Signal API | 只读信号 API
+
+轻量 HTTP/JSON 服务（标准库 http.server，无额外依赖），与 Streamlit 页面共用 Access Key：
+    GET /health                       健康检查（无需密钥）
+    GET /v1/signals?n=10              当前信号清单
+    GET /v1/signals/dates             已归档日期
+    GET /v1/signals/<YYYY-MM-DD>      历史某日信号
+    GET /v1/equity                    净值曲线与汇总指标
+    GET /v1/auth                      仅校验密钥（204），供 Nginx auth_request 保护静态快照
+
+- 密钥：仅接受请求头 X-Access-Key 或 Authorization: Bearer <key>
+  （不接受 ?key=，避免密钥进入 URL、代理日志与浏览器历史）
+- 响应按数据版本预序列化（见 api.payloads），附强 ETag；
+  If-None-Match 命中时返回 304 且无响应体，轮询客户端几乎零成本
+- 客户端接受 gzip 时直接发送预压缩字节
+
+启动：python -m api.server --port 8600
+================================================================================
+"""
+
+import json
+import logging
+import re
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from core.access import validate_access_key
+from api import payloads
+
+
+# ==================== 常量 | Constants ====================
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8600
+DAY_PATTERN = re.compile(r'^/v1/signals/(\d{4}-\d{2}-\d{2})$')
+GZIP_SUFFIX = '-gz'
+HEALTH = payloads.prepare({'status': 'ok'})
+
+logger = logging.getLogger(__name__)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match 是否命中（支持多个值与 *；原文 / gzip 两种表示均视为命中）"""
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    gz_etag = etag[:-1] + GZIP_SUFFIX + '"'
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate in (etag, gz_etag):
+            return True
+    return False
+
+
+# ==================== 请求处理 | Handler ====================
+
+class SignalAPIHandler(BaseHTTPRequestHandler):
+    """只读信号 API 请求处理 | Read-only signal API handler"""
+
+    server_version = 'EigenFlowAPI/1.0'
+    protocol_version = 'HTTP/1.1'
+    root = payloads.DataRoot()
+    verbose = False
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+    # ---------- 响应 | Responses ----------
+
+    def _send_json_error(self, status: HTTPStatus, message: str, head: bool = False):
+        body = json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _send_prepared(self, response: payloads.PreparedResponse, head: bool = False):
+        use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        etag = response.etag[:-1] + GZIP_SUFFIX + '"' if use_gzip else response.etag
+
+        common = [
+            ('ETag', etag),
+            ('Cache-Control', 'private, no-cache'),
+            ('Vary', 'Accept-Encoding, Authorization, X-Access-Key'),
+        ]
+        if _etag_matches(self.headers.get('If-None-Match', ''), response.etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            for name, value in common:
+                self.send_header(name, value)
+            self.end_headers()
+            return
+
+        body = response.gzip_body if use_gzip else response.body
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        for name, value in common:
+            self.send_header(name, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    # ---------- 路由 | Routing ----------
+
+    def _access_key(self) -> str:
+        key = self.headers.get('X-Access-Key')
+        if not key:
+            auth = self.headers.get('Authorization', '')
+            if auth.startswith('Bearer '):
+                key = auth[len('Bearer '):]
+        return key or ''
+
+    def _route(self, head: bool = False):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        path = url.path.rstrip('/') or '/'
+
+        if path == '/health':
+            self._send_prepared(HEALTH, head)
+            return
+
+        if not path.startswith('/v1/'):
+            self._send_json_error(HTTPStatus.NOT_FOUND, 'not found', head)
+            return
+        if not validate_access_key(self._access_key()):
+            self._send_json_error(HTTPStatus.UNAUTHORIZED, 'invalid access key', head)
+            return
+        if path == '/v1/auth':
+            self.send_response(HTTPStatus.NO_CONTENT)
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            return
+
+        try:
+            if path == '/v1/signals':
+                n = (query.get('n') or ['10'])[0]
+                if not n.isdigit():
+                    self._send_json_error(HTTPStatus.BAD_REQUEST, 'n must be a positive integer', head)
+                    return
+                response = payloads.latest_signals(self.root, int(n))
+            elif path == '/v1/signals/dates':
+                response = payloads.archive_dates(self.root)
+            elif path == '/v1/equity':
+                response = payloads.equity_series(self.root)
+            else:
+                match = DAY_PATTERN.match(path)
+                if match is None:
+                    self._send_json_error(HTTPStatus.NOT_FOUND, 'not found', head)
+                    return
+                response = payloads.archived_signals(self.root, match.group(1))
+        except Exception:
+            # 异常细节只写服务端日志，不回显给客户端
+            logger.exception("data load failed for %s", path)
+            self._send_json_error(HTTPStatus.INTERNAL_SERVER_ERROR, 'data load failed', head)
+            return
+
+        if response is None:
+            self._send_json_error(HTTPStatus.NOT_FOUND, 'no data', head)
+            return
+        self._send_prepared(response, head)
+
+    def do_GET(self):
+        self._route()
+
+    def do_HEAD(self):
+        self._route(head=True)
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, base_dir: str = None,
+                verbose: bool = False) -> ThreadingHTTPServer:
+    """创建（未启动的）API 服务 | Build the HTTP server"""
+    handler = type('BoundSignalAPIHandler', (SignalAPIHandler,), {
+        'root': payloads.DataRoot(base_dir or payloads.BASE_DIR),
+        'verbose': verbose,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='EigenFlow 只读信号 API')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--root', default=None, help='数据目录，默认项目根目录')
+    parser.add_argument('--verbose', action='store_true', help='打印访问日志')
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.root, args.verbose)
+    print(f"[成功] API 已启动: http://{args.host}:{args.port}/v1/signals")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[再见] API 已停止")
+    finally:
+        server.server_close()
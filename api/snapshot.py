@@ -0,0 +1,237 @@
+"""
+================================================================================
+EigenFlow Snapshot | 订阅页静态快照
+
+把 Signal List 与 Backtest 摘要预渲染为静态文件，每个数据版本只构建一次：
+    snapshot/
+        index.html(.gz)     信号清单 + 回测指标 + 净值缩略图（内联 SVG，无外部脚本）
+        signals.json(.gz)   与 API /v1/signals 相同的字节
+        equity.json(.gz)    与 API /v1/equity 相同的字节
+        manifest.json       数据版本（信号 / 主表 / 净值文件摘要）与构建时间
+
+- manifest 中的数据版本与当前一致时直接跳过（可放在定时任务中反复执行）
+- 每个文件先写临时文件再 os.replace，manifest 最后写入
+- 内容只依赖数据版本，不含“今日 / 下一交易日”等随时间变化的文字
+
+Nginx 示例（gzip_static 直接发送 .gz；访问仍经只读 API 校验 Access Key）:
+    location /snapshot/ {
+        auth_request /_auth;
+        gzip_static on;
+        alias /srv/eigenflow/snapshot/;
+    }
+    location = /_auth {
+        internal;
+        proxy_pass http://127.0.0.1:8600/v1/auth;
+        proxy_pass_request_body off;
+        proxy_set_header Content-Length "";
+        proxy_set_header X-Access-Key $cookie_eigenflow_key;
+    }
+  API 只从请求头读取密钥；浏览器直接打开快照地址无法附带自定义请求头，
+  因此由 Nginx 把 Cookie eigenflow_key 转为 X-Access-Key（需由前端页面写入该 Cookie，
+  建议 Secure; HttpOnly; SameSite=Strict）。脚本客户端可直接发送 Authorization: Bearer，
+  此时 Cookie 为空、X-Access-Key 不生效，API 回退到 Authorization 头
+
+构建：python -m api.snapshot --out snapshot
+================================================================================
+"""
+
+import gzip
+import html
+import json
+import os
+import time
+
+import numpy as np
+
+from api import payloads
+from ui.charts import lttb
+from ui.signal_list import render_signal_html
+
+
+# ==================== 常量 | Constants ====================
+
+MANIFEST_FILE = 'manifest.json'
+SPARK_WIDTH = 660
+SPARK_HEIGHT = 160
+
+SNAPSHOT_CSS = """
+body { font-family: -apple-system, "PingFang SC", "Microsoft YaHei", sans-serif; background: #fff; color: #2c3e50; }
+.container { max-width: 700px; margin: 0 auto; padding: 0.5rem 1rem 3rem; }
+.main-title { font-size: 1.2em; font-weight: 600; text-align: center; margin-bottom: 5px; color: #2c3e50; }
+.subtitle { text-align: center; color: #7f8c8d; font-size: 0.75em; margin-bottom: 10px; }
+.signal-card { padding: 20px; border-radius: 12px; margin: 15px 0; text-align: center; }
+.risk-on { background: linear-gradient(135deg, #f5f7fa 0%, #e4e8eb 100%); border: 1px solid #bdc3c7; }
+.signal-label { font-size: 0.85em; color: #7f8c8d; margin-bottom: 5px; }
+.stock-item { background: #fafafa; padding: 15px; border-radius: 10px; margin: 10px 0; border-left: 3px solid #3498db; }
+.metrics { display: grid; grid-template-columns: repeat(4, 1fr); gap: 10px; margin: 10px 0; }
+.metric { background: #fafafa; border-radius: 8px; padding: 10px; }
+.metric .label { font-size: 0.75em; color: #7f8c8d; }
+.metric .value { font-size: 1.2em; font-weight: 600; }
+.disclaimer-box { background: #f8f9fa; border: 1px solid #dee2e6; border-radius: 8px; padding: 15px; margin: 20px 0; font-size: 0.8em; color: #6c757d; }
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>EigenFlow | 量化研究</title>
+<style>{css}</style>
+</head>
+<body>
+<div class="container">
+<div class="main-title">📊 EigenFlow | 量化研究</div>
+<div class="subtitle">数据更新 | Updated: {updated}</div>
+<h3>📊 Signal List</h3>
+{signals}
+<h3>📉 Backtest History</h3>
+{backtest}
+<div class="disclaimer-box">⚠️ 本页面仅供研究与学习，不构成任何投资建议；过往表现不代表未来收益 |
+For research and educational purposes only. Not investment advice. Past performance ≠ future results.</div>
+</div>
+</body>
+</html>
+"""
+
+METRIC_TEMPLATE = '<div class="metric"><div class="label">{label}</div><div class="value">{value}</div></div>'
+
+
+# ==================== 渲染 | Rendering ====================
+
+def _pct(value) -> str:
+    return '—' if value is None else f"{value * 100:.2f}%"
+
+
+def render_backtest_html(equity: dict) -> str:
+    """回测指标卡片 + 净值缩略图（内联 SVG） | Backtest summary block"""
+    if equity is None:
+        return '<p>暂无历史数据 | No historical data available</p>'
+
+    summary = equity['summary']
+    sharpe = summary.get('sharpe')
+    cards = [
+        ('收益率 | Return', _pct(summary.get('total_return'))),
+        ('年化收益 | CAGR', _pct(summary.get('annual_return'))),
+        ('夏普 | Sharpe', '—' if sharpe is None else f"{sharpe:.2f}"),
+        ('最大回撤 | Max DD', _pct(summary.get('max_drawdown'))),
+    ]
+    parts = ['<div class="metrics">']
+    parts.extend(METRIC_TEMPLATE.format(label=label, value=value) for label, value in cards)
+    parts.append('</div>')
+
+    values = np.array([np.nan if v is None else v for v in equity['equity']], dtype=np.float64)
+    keep = np.flatnonzero(np.isfinite(values))
+    if len(keep) >= 2:
+        values = values[keep]
+        idx = lttb(np.arange(len(values), dtype=np.float64), values, SPARK_WIDTH)
+        xs = idx / max(1, len(values) - 1) * SPARK_WIDTH
+        lo, hi = values.min(), values.max()
+        ys = SPARK_HEIGHT - (values[idx] - lo) / ((hi - lo) or 1.0) * (SPARK_HEIGHT - 10) - 5
+        points = ' '.join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+        parts.append(
+            f'<svg viewBox="0 0 {SPARK_WIDTH} {SPARK_HEIGHT}" width="100%" role="img" '
+            f'aria-label="策略净值曲线 | Strategy NAV Curve">'
+            f'<polyline fill="none" stroke="#3498db" stroke-width="2" points="{points}"/></svg>'
+        )
+        dates = equity['date']
+        parts.append(f'<div class="subtitle">{html.escape(dates[keep[0]])} — {html.escape(dates[keep[-1]])}</div>')
+    return '\n'.join(parts)
+
+
+def render_page(signals: dict, equity: dict) -> str:
+    """完整静态页面 | Full snapshot page"""
+    rows = signals['signals']
+    return PAGE_TEMPLATE.format(
+        css=SNAPSHOT_CSS,
+        updated=html.escape(signals['updated']),
+        signals=render_signal_html(rows['symbol'], rows['name'], rows.get('score', [0.0] * len(rows['symbol']))),
+        backtest=render_backtest_html(equity),
+    )
+
+
+# ==================== 构建 | Build ====================
+
+def data_versions(root: payloads.DataRoot) -> dict:
+    """快照依赖的数据版本（文件摘要） | Content digests the snapshot depends on"""
+    versions = {
+        'signals': root.signal_version(),
+        'securities': root.version_of(root.securities_path),
+        'equity': root.version_of(root.equity_path),
+    }
+    return {name: (v.digest if v is not None else None) for name, v in versions.items()}
+
+
+def _write(path: str, data: bytes, compress: bool = True):
+    """原子写入文件（及预压缩 .gz） | Atomic write plus .gz sibling"""
+    targets = [(path, data)]
+    if compress:
+        targets.append((path + '.gz', gzip.compress(data, compresslevel=9, mtime=0)))
+    for target, content in targets:
+        tmp = target + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, target)
+
+
+def build_snapshot(root: payloads.DataRoot, out_dir: str, n: int = 10, force: bool = False):
+    """
+    构建静态快照
+
+    Args:
+        root: 数据目录
+        out_dir: 输出目录
+        n: 信号条数
+        force: 忽略 manifest，强制重建
+
+    Returns:
+        新的 manifest dict；数据版本未变时返回 None
+    """
+    versions = data_versions(root)
+    versions['n'] = n
+    if versions['signals'] is None:
+        raise FileNotFoundError("no signal data to snapshot")
+
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            if json.load(f).get('versions') == versions:
+                return None
+
+    signals = payloads.latest_signals(root, n)
+    equity = payloads.equity_series(root)
+
+    os.makedirs(out_dir, exist_ok=True)
+    _write(os.path.join(out_dir, 'signals.json'), signals.body)
+    if equity is not None:
+        _write(os.path.join(out_dir, 'equity.json'), equity.body)
+    else:
+        for name in ('equity.json', 'equity.json.gz'):
+            if os.path.exists(os.path.join(out_dir, name)):
+                os.remove(os.path.join(out_dir, name))
+    page = render_page(json.loads(signals.body), json.loads(equity.body) if equity is not None else None)
+    _write(os.path.join(out_dir, 'index.html'), page.encode('utf-8'))
+
+    manifest = {
+        'versions': versions,
+        'built': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'etags': {'signals.json': signals.etag, 'equity.json': equity.etag if equity is not None else None},
+    }
+    _write(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'), compress=False)
+    return manifest
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='构建订阅页静态快照（每个数据版本一次）')
+    parser.add_argument('--out', default='snapshot')
+    parser.add_argument('--root', default=None, help='数据目录，默认项目根目录')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--force', action='store_true', help='数据未变也强制重建')
+    args = parser.parse_args()
+
+    result = build_snapshot(payloads.DataRoot(args.root or payloads.BASE_DIR), args.out, args.top, args.force)
+    if result is None:
+        print(f"[跳过] 数据版本未变，{args.out} 已是最新")
+    else:
+        print(f"[成功] 快照已写入 {args.out}（{result['built']}）")
@@ -13,10 +13,10 @@ A股量化研究工具 | A-Share Quantitative Research Tool
 try:
     import streamlit as st
     import pandas as pd
-    import plotly.graph_objects as go
     import streamlit.components.v1 as components
     import os
-    from datetime import datetime, timedelta
+    import uuid
+    from datetime import datetime
     STREAMLIT_AVAILABLE = True
 
     # 页面配置 | Page Config
@@ -32,19 +32,44 @@ except ImportError:
     print("pip install streamlit pandas plotly")
     exit(1)
 
-
-# ==================== 订阅配置 | Subscription Config ====================
-
-# Access Keys（生产环境建议使用环境变量）
-VALID_ACCESS_KEYS = [
-    "EIGEN-2026-PRO",
-    "EIGEN-RESEARCH-X1",
-    "EIGEN-VIP-2026",
-]
-
-def validate_access_key(key: str) -> bool:
-    """验证 Access Key"""
-    return key.strip() in VALID_ACCESS_KEYS
+from core import loader, telemetry, timing
+from core.access import validate_access_key
+from core.signal_store import SignalStore, current_version_dir, CURRENT_FILE
+from core import scoring
+from core.archive import SignalArchive
+from core.symbols import tradingview_symbol
+from core.security_master import load_master
+from core.search import index_for
+from core.trading_calendar import load_calendar
+from backtest.metrics import metrics_for
+from ui.charts import RANGE_OPTIONS, equity_figure
+from ui.signal_list import signal_list_html
+from ui.lazy_tabs import lazy_tabs, next_tab, prefetch
+from core.prices import PriceStore
+from ui.candles import INTERVALS, MA_WINDOWS, candle_figure
+
+
+# ==================== 数据路径 | Data Paths ====================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SIGNAL_PATH = os.path.join(BASE_DIR, 'trade_list_top10.csv')
+EQUITY_PATH = os.path.join(BASE_DIR, 'equity.csv')
+SIGNAL_STORE_DIR = os.path.join(BASE_DIR, 'signal_store')
+ARCHIVE_DIR = os.path.join(BASE_DIR, 'signal_archive')
+SWEEP_PATH = os.path.join(BASE_DIR, 'sweep_results.csv')
+PRICE_STORE_DIR = os.path.join(BASE_DIR, 'price_store')
+SECURITIES_PATH = os.path.join(BASE_DIR, 'securities.csv')
+HOLIDAYS_PATH = os.path.join(BASE_DIR, 'holidays.csv')
+SIGNAL_CUTOFF_HOUR = 16   # 收盘后生成的信号对应下一交易日
+
+LATEST_LABEL = "最新 | Latest"
+METRICS_PORT = os.environ.get('EIGENFLOW_METRICS_PORT')   # 与 EIGENFLOW_TIMING=1 同时设置时提供 /metrics
+PREFETCH_ENABLED = os.environ.get('EIGENFLOW_PREFETCH', '1') == '1'
+
+# 图表后端：本地 K 线（需 price_store）/ TradingView（离线部署时关闭）
+CHART_NATIVE = "本地 K 线 | Native"
+CHART_TRADINGVIEW = "TradingView"
+OFFLINE = os.environ.get('EIGENFLOW_OFFLINE') == '1'
 
 
 # ==================== 工具函数 | Utility Functions ====================
@@ -56,27 +81,130 @@ def format_stock_code(code):
 
 def get_tradingview_symbol(stock_code):
     """生成 TradingView 符号 | Generate TradingView symbol"""
-    code = format_stock_code(stock_code)
+    return tradingview_symbol(format_stock_code(stock_code))
+
+
+def security_master():
+    """证券主表（进程级缓存，文件更新后自动重建）"""
+    return load_master(SECURITIES_PATH)
+
+
+def trading_calendar():
+    """交易日历（进程级缓存，节假日文件更新后自动重建）"""
+    return load_calendar(HOLIDAYS_PATH)
 
-    if code.startswith(('600', '601', '603', '605', '688')):
-        return f"SSE:{code}"
-    elif code.startswith(('000', '001', '002', '003', '300', '301')):
-        return f"SZSE:{code}"
-    else:
-        return f"SSE:{code}"
+
+def signal_trading_day(now: datetime):
+    """
+    当前信号对应的交易日
+
+    交易日收盘前为当日；收盘后、周末与节假日为下一交易日
+
+    Returns:
+        (交易日 datetime64[D], 是否为当日)
+    """
+    calendar = trading_calendar()
+    if now.hour < SIGNAL_CUTOFF_HOUR and calendar.is_trading_day(now):
+        return calendar.next_trading_day(now, inclusive=True), True
+    return calendar.next_trading_day(now), False
+
+
+def master_version():
+    """证券主表版本（名称变化时使渲染缓存失效），不存在时为 None"""
+    if os.path.exists(SECURITIES_PATH):
+        return loader.file_version(SECURITIES_PATH)
+    return None
 
 
 def load_signal_data():
-    """加载信号数据"""
-    csv_path = os.path.join(os.path.dirname(__file__), 'trade_list_top10.csv')
-    if os.path.exists(csv_path):
-        return pd.read_csv(csv_path)
+    """加载信号数据（进程级版本缓存，跨会话共享，只读）"""
+    if os.path.exists(SIGNAL_PATH):
+        return loader.read_csv(SIGNAL_PATH)
+    return pd.DataFrame()
+
+
+def open_signal_store():
+    """打开全市场列式存储（按 CURRENT 版本缓存），不存在时返回 None"""
+    current = os.path.join(SIGNAL_STORE_DIR, CURRENT_FILE)
+    if not os.path.exists(current):
+        return None
+    store, _ = loader.load_cached(
+        current,
+        lambda data: SignalStore(current_version_dir(SIGNAL_STORE_DIR)),
+        'signal_store',
+    )
+    return store
+
+
+def signal_version():
+    """当前信号来源的版本（列式存储优先） | Version of the active signal source"""
+    current = os.path.join(SIGNAL_STORE_DIR, CURRENT_FILE)
+    if os.path.exists(current):
+        return loader.file_version(current)
+    return loader.file_version(SIGNAL_PATH)
+
+
+def has_signal_data() -> bool:
+    """是否存在任一信号来源 | Whether a signal store or CSV is present"""
+    return open_signal_store() is not None or os.path.exists(SIGNAL_PATH)
+
+
+def load_top_signals(n: int = 10, weights: dict = None) -> pd.DataFrame:
+    """
+    读取 Top-N 信号
+
+    优先使用列式存储（零拷贝，仅物化 n 行），否则回退到 CSV；
+    给定 weights 时按新权重对全市场重新打分
+    """
+    store = open_signal_store()
+    source = store if store is not None else load_signal_data()
+    if weights is not None:
+        return scoring.rank(source, weights, k=n)
+    if store is not None:
+        return store.top(n)
+    return source.head(n)
+
+
+def prepare_top10(df: pd.DataFrame):
+    """截取前 10 行并经证券主表补全代码 / 名称，返回 (df_top10, stock_names)"""
+    df_top10 = security_master().enrich(df.head(10))
+    stock_names = df_top10['name'].tolist()
+    return df_top10, stock_names
+
+
+def open_price_store():
+    """打开本地行情存储（按 CURRENT 版本缓存），不存在时返回 None"""
+    current = os.path.join(PRICE_STORE_DIR, CURRENT_FILE)
+    if not os.path.exists(current):
+        return None
+    store, _ = loader.load_cached(
+        current,
+        lambda data: PriceStore(current_version_dir(PRICE_STORE_DIR)),
+        'price_store',
+    )
+    return store
+
+
+def chart_backends() -> list:
+    """可用的图表后端（本地优先） | Available chart backends"""
+    backends = []
+    if open_price_store() is not None:
+        backends.append(CHART_NATIVE)
+    if not OFFLINE:
+        backends.append(CHART_TRADINGVIEW)
+    return backends
+
+
+def load_equity_data():
+    """加载净值数据（进程级版本缓存，跨会话共享，只读）"""
+    if os.path.exists(EQUITY_PATH):
+        return loader.read_csv(EQUITY_PATH, parse_dates=['date'])
     return pd.DataFrame()
 
 
 # ==================== 自定义 CSS | Custom CSS ====================
 
-st.markdown("""
+CUSTOM_CSS = """
 <style>
 /* 限制宽度 | Limit Width */
 .block-container {
@@ -233,7 +361,24 @@ st.markdown("""
 footer {visibility: hidden;}
 header {visibility: hidden;}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+with timing.span('page:css'):
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+
+# ==================== 使用记录 | Telemetry ====================
+
+def session_id() -> str:
+    """当前会话的匿名标识（首次调用时生成）"""
+    if 'telemetry_session' not in st.session_state:
+        st.session_state.telemetry_session = uuid.uuid4().hex[:12]
+    return st.session_state.telemetry_session
+
+
+def track(event: str, tab: str = None, symbol: str = None):
+    """记录使用事件（只入队，不阻塞重跑；写入由 core.telemetry 后台线程完成）"""
+    telemetry.emit(event, session_id(), st.session_state.get('verified_key_digest'), tab, symbol)
 
 
 # ==================== UI 组件 | UI Components ====================
@@ -272,19 +417,27 @@ def render_access_input() -> bool:
     # 初始化 session state
     if 'access_verified' not in st.session_state:
         st.session_state.access_verified = False
+    # 已验证的会话每次运行都复核：密钥到期或从密钥文件中移除后立即失效
+    elif st.session_state.access_verified and not validate_access_key(st.session_state.get('verified_key', '')):
+        st.session_state.access_verified = False
 
     # 点击确认按钮时验证
     if confirm_btn and access_key:
         if validate_access_key(access_key):
             st.session_state.access_verified = True
+            st.session_state.verified_key = access_key
+            st.session_state.verified_key_digest = telemetry.key_digest(access_key)
+            track("unlock")
             st.rerun()
         else:
             st.session_state.access_verified = False
+            telemetry.emit("unlock_failed", session_id(), telemetry.key_digest(access_key))
             st.error("❌ 无效的 Access Key")
 
     return st.session_state.access_verified
 
 
+@st.fragment
 def render_support_page():
     """渲染支持页面"""
     st.markdown("""
@@ -328,11 +481,359 @@ def render_support_page():
         st.markdown('</div>', unsafe_allow_html=True)
 
 
+# ==================== 页面片段 | Page Fragments ====================
+# 每个片段内的交互只重跑该片段，不再执行整页（CSS、验证、数据加载、其它标签页）
+
+@st.fragment
+@timing.timed('fragment:signal_list')
+def render_signal_tab(df_top10):
+    """Signal List 标签页（片段）"""
+    st.markdown("### 📊 Signal List")
+    st.caption("Rank 1–10 | 基于模型历史输出")
+
+    # 历史日期（通过归档索引加载）
+    df_list = df_top10
+    list_version = (signal_version(), master_version(), len(df_list))
+    archive = SignalArchive(ARCHIVE_DIR, trading_calendar())
+    archived_dates = archive.dates()
+    if archived_dates:
+        picked_date = st.selectbox(
+            "信号日期 | Signal Date",
+            [LATEST_LABEL] + archived_dates[::-1],
+            index=0,
+            key="signal_date"
+        )
+        if picked_date != LATEST_LABEL:
+            df_list, _ = prepare_top10(archive.load(picked_date))
+            list_version = (loader.file_version(archive.index_path), master_version(), picked_date, len(df_list))
+
+    # 单次渲染全部档位（按信号版本缓存，一个元素发送）
+    st.markdown(signal_list_html(df_list, list_version), unsafe_allow_html=True)
+
+
+def tradingview_html(symbol: str, container_id: str, height: int, notice: str) -> str:
+    """TradingView 小部件 HTML | TradingView widget embed"""
+    return f"""
+    <div class="tv-container">
+        <div id="{container_id}"></div>
+    </div>
+    <script type="text/javascript" src="https://s3.tradingview.com/tv.js"></script>
+    <script type="text/javascript">
+    new TradingView.widget({{
+        "width": "100%",
+        "height": {height},
+        "symbol": "{symbol}",
+        "interval": "D",
+        "timezone": "Asia/Shanghai",
+        "theme": "light",
+        "style": "1",
+        "locale": "zh_CN",
+        "toolbar_bg": "#f1f3f6",
+        "enable_publishing": false,
+        "allow_symbol_change": true,
+        "container_id": "{container_id}"
+    }});
+    </script>
+    <div style="font-size: 0.75em; color: #999; margin-top: 5px; text-align: center;">
+        {notice}
+    </div>
+    """
+
+
+def render_price_chart(code: str, name: str, key: str, tv_height: int, frame_height: int, tv_notice: str):
+    """
+    按所选后端渲染单只股票图表
+
+    本地后端：服务端聚合周期、均线 / 成交量叠加，Figure 按版本缓存；
+    TradingView 后端：嵌入第三方小部件
+    """
+    if st.session_state.get(f"{key}_tracked") != code:
+        st.session_state[f"{key}_tracked"] = code
+        track("chart", symbol=code)
+
+    backends = chart_backends()
+    if not backends:
+        st.info("暂无可用图表数据 | No chart source available")
+        return
+
+    backend = backends[0]
+    if len(backends) > 1:
+        backend = st.radio(
+            "图表来源 | Chart Source",
+            backends,
+            horizontal=True,
+            key=f"{key}_backend"
+        )
+
+    if backend == CHART_NATIVE:
+        col_interval, col_volume = st.columns([3, 1])
+        with col_interval:
+            interval = st.radio(
+                "周期 | Interval",
+                list(INTERVALS),
+                horizontal=True,
+                label_visibility="collapsed",
+                key=f"{key}_interval"
+            )
+        with col_volume:
+            show_volume = st.checkbox("成交量 | Vol", value=True, key=f"{key}_volume")
+        ma_windows = st.multiselect(
+            "均线 | MA",
+            list(MA_WINDOWS),
+            default=list(MA_WINDOWS),
+            format_func=lambda w: f"MA{w}",
+            key=f"{key}_ma"
+        )
+        with timing.span('chart:native'):
+            fig = candle_figure(open_price_store(), code, interval, sorted(ma_windows), show_volume,
+                                title=f"{code} · {name}")
+            if fig is None:
+                st.info("本地行情中无此代码 | Symbol not in local price store")
+            else:
+                st.plotly_chart(fig, use_container_width=True)
+    else:
+        with timing.span('chart:tradingview'):
+            tv_html = tradingview_html(get_tradingview_symbol(code), f"tradingview_{key}", tv_height, tv_notice)
+            components.html(tv_html, height=frame_height)
+
+
+@st.fragment
+@timing.timed('fragment:chart')
+def render_chart_tab(df_top10, stock_names):
+    """Chart 标签页（片段：切换股票 / 周期只重跑本区块）"""
+    st.markdown("""
+    ### 📈 Chart Reference
+    """)
+
+    if CHART_TRADINGVIEW in chart_backends():
+        st.caption("""
+        ⚠️ 第三方市场行情工具 | TradingView® 为 TradingView, Inc. 注册商标
+        """)
+
+    # 创建选择器
+    stock_options = [f"{code} - {name}" for code, name in zip(df_top10['symbol'], stock_names)]
+    selected = st.selectbox(
+        "选择股票 | Select Stock",
+        stock_options,
+        index=0,
+        label_visibility="visible"
+    )
+
+    if selected:
+        selected_code = selected.split(" - ")[0]
+        selected_name = selected.split(" - ")[1]
+        render_price_chart(
+            selected_code, selected_name, key="chart", tv_height=480, frame_height=550,
+            tv_notice="TradingView® 为 TradingView, Inc. 注册商标 | 本平台无关联"
+        )
+
+
+@st.fragment
+@timing.timed('fragment:backtest')
+def render_backtest_tab():
+    """Backtest 标签页（片段）"""
+    st.markdown("""
+    ### 📉 Backtest History
+    """)
+    st.caption("策略历史表现，仅供研究参考 | Historical strategy performance for reference only")
+
+    if os.path.exists(EQUITY_PATH):
+        try:
+            equity_df = load_equity_data()
+            metrics = metrics_for(EQUITY_PATH)
+            summary = metrics.summary()
+
+            initial = equity_df['equity'].iloc[0]
+            final = equity_df['equity'].iloc[-1]
+            total_return = summary['total_return'] * 100
+
+            # 指标卡片
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                st.metric(
+                    "初始净值 | Initial",
+                    f"{initial:.4f}"
+                )
+            with col2:
+                st.metric(
+                    "当前净值 | Current",
+                    f"{final:.4f}"
+                )
+            with col3:
+                delta_color = "normal" if total_return >= 0 else "inverse"
+                st.metric(
+                    "收益率 | Return",
+                    f"{total_return:.2f}%",
+                    delta=f"{total_return:.2f}%",
+                    delta_color=delta_color
+                )
+
+            col4, col5, col6, col7 = st.columns(4)
+            with col4:
+                st.metric("年化收益 | CAGR", f"{summary['annual_return'] * 100:.2f}%")
+            with col5:
+                st.metric("夏普 | Sharpe", f"{summary['sharpe']:.2f}")
+            with col6:
+                st.metric(
+                    "最大回撤 | Max DD",
+                    f"{summary['max_drawdown'] * 100:.2f}%",
+                    help=f"最长水下 {summary['max_drawdown_days']} 个交易日"
+                )
+            with col7:
+                st.metric("胜率 | Win Rate", f"{summary['win_rate'] * 100:.1f}%")
+
+            # 曲线图（服务端 LTTB 降采样，按版本缓存）
+            range_label = st.radio(
+                "区间 | Range",
+                list(RANGE_OPTIONS),
+                horizontal=True,
+                label_visibility="collapsed",
+                key="equity_range"
+            )
+            with timing.span('backtest:figure'):
+                fig = equity_figure(equity_df, loader.file_version(EQUITY_PATH), range_label)
+                st.plotly_chart(fig, use_container_width=True)
+
+            with st.expander("📅 月度收益 | Monthly Returns"):
+                monthly = metrics.monthly_returns()
+                # 逐列 Series.map（DataFrame.map 需 pandas >= 2.1），缺失月份留空
+                table = (monthly * 100).apply(lambda col: col.map('{:.2f}%'.format)).where(monthly.notna(), "")
+                st.dataframe(table, use_container_width=True)
+
+            st.caption("⚠️ 历史表现不代表未来收益 | Past performance ≠ future results")
+
+        except Exception as e:
+            st.warning(f"数据加载失败 | Data load failed: {e}")
+    else:
+        st.info("暂无历史数据 | No historical data available")
+
+    # 参数扫描结果（python -m backtest.sweep 生成）
+    if os.path.exists(SWEEP_PATH):
+        with st.expander("🔬 参数扫描 | Parameter Sweep"):
+            st.dataframe(loader.read_csv(SWEEP_PATH), use_container_width=True, hide_index=True)
+
+
+@st.fragment
+@timing.timed('fragment:trial_chart')
+def render_trial_chart():
+    """试用图表（片段：输入代码 / 名称 / 拼音只重跑本区块）"""
+    st.markdown("### 📊 图表试用 | Chart Trial")
+    st.caption("输入股票代码、名称或拼音首字母查看走势")
+
+    query = st.text_input(
+        "输入股票代码 / 名称 / 拼音",
+        placeholder="600519, 贵州, gzmt",
+        max_chars=20,
+        label_visibility="visible",
+        key="trial_symbol"
+    )
+    if not query:
+        return
+
+    master = security_master()
+    query = query.strip()
+    trial_symbol = None
+    # 6 位完整代码（或无主表时的任意数字）直接使用；较短数字按代码前缀检索（如 600 -> 600xxx）
+    if query.isdigit() and (len(query) == 6 or (len(master) == 0 and len(query) < 6)):
+        trial_symbol = query.zfill(6)
+    else:
+        matches = index_for(master).search(query)
+        if matches:
+            trial_symbol = st.selectbox(
+                "匹配结果 | Matches",
+                [code for code, _ in matches],
+                format_func=lambda code: f"{code} - {master.name_of(code)}",
+                key="trial_pick"
+            )
+        else:
+            st.caption("无匹配证券 | No matching security")
+
+    if trial_symbol:
+        render_price_chart(
+            trial_symbol, master.name_of(trial_symbol), key="trial", tv_height=400, frame_height=480,
+            tv_notice="TradingView® 为 TradingView, Inc. 注册商标"
+        )
+
+
+# ==================== 标签页预热 | Tab Warmers ====================
+# 只填充数据缓存，不调用 Streamlit API，可在后台线程执行
+
+def warm_signal_tab():
+    """预热 Signal List：Top-10 与渲染好的 HTML"""
+    df_top10, _ = prepare_top10(load_top_signals(10))
+    signal_list_html(df_top10, (signal_version(), master_version(), len(df_top10)))
+
+
+def warm_backtest_tab():
+    """预热 Backtest：净值、指标与默认区间图表"""
+    if os.path.exists(EQUITY_PATH):
+        equity_df = load_equity_data()
+        metrics_for(EQUITY_PATH)
+        equity_figure(equity_df, loader.file_version(EQUITY_PATH), next(iter(RANGE_OPTIONS)))
+
+
+def warm_chart_tab():
+    """预热 Chart：首个信号的默认周期本地 K 线"""
+    store = open_price_store()
+    if store is not None:
+        df_top10, stock_names = prepare_top10(load_top_signals(10))
+        if len(df_top10):
+            code = df_top10['symbol'].iloc[0]
+            candle_figure(store, code, next(iter(INTERVALS)), sorted(MA_WINDOWS), True,
+                          title=f"{code} · {stock_names[0]}")
+
+
+def price_store_version():
+    """本地行情存储版本（CURRENT 指针），不存在时为 None"""
+    current = os.path.join(PRICE_STORE_DIR, CURRENT_FILE)
+    return loader.file_version(current) if os.path.exists(current) else None
+
+
+def equity_version():
+    """净值文件版本，不存在时为 None"""
+    return loader.file_version(EQUITY_PATH) if os.path.exists(EQUITY_PATH) else None
+
+
+# 标签页 -> (预热函数, 数据版本)；版本进入预取去重键，数据更新后重新预热
+TAB_WARMERS = [
+    (warm_signal_tab, lambda: (signal_version(), master_version())),
+    (warm_chart_tab, lambda: (signal_version(), price_store_version())),
+    (warm_backtest_tab, equity_version),
+    None,
+]
+
+
+def render_timing_panel():
+    """各区块 / 整页 / 片段重跑的耗时分布（EIGENFLOW_TIMING=1 时显示）"""
+    with st.expander("⏱ 重跑耗时 | Rerun Latency"):
+        st.dataframe(pd.DataFrame(timing.summary()).T, use_container_width=True)
+        st.caption("rerun:full 为整页重跑；fragment:* 为片段内交互的单次重跑耗时；"
+                   "main:* / tab:* / chart:* 为整页内各区块耗时")
+
+        histograms = timing.histograms()
+        if histograms:
+            st.markdown("**累计分布 | Cumulative Histogram (≤ ms)**")
+            table = pd.DataFrame({
+                name: {('inf' if upper == float('inf') else f"{upper * 1000:g}"): count
+                       for upper, count in h['buckets']}
+                for name, h in histograms.items()
+            }).T
+            st.dataframe(table, use_container_width=True)
+            st.download_button("下载 Prometheus 指标 | metrics.prom", timing.prometheus_text(),
+                               file_name="metrics.prom", mime="text/plain")
+
+
 # ==================== 主程序 | Main ====================
 
+@timing.timed('rerun:full')
 def main():
+    if METRICS_PORT and timing.ENABLED:
+        timing.serve_metrics(int(METRICS_PORT))
+
     # ==================== 页面头部 | Header ====================
-    render_header()
+    with timing.span('main:header'):
+        render_header()
 
     # ==================== 核心免责声明 | Core Disclaimer ====================
     st.info("""
@@ -345,7 +846,8 @@ def main():
     st.markdown("---")
 
     # ==================== Access Key 验证 | Access Key Verification ====================
-    is_verified = render_access_input()
+    with timing.span('main:access'):
+        is_verified = render_access_input()
 
     # ==================== 验证失败显示支持页 | Show Support if Not Verified ====================
     if not is_verified:
@@ -365,77 +867,26 @@ def main():
             """, unsafe_allow_html=True)
 
             # 简化版图表（不显示具体信号）
-            st.markdown("### 📊 TradingView 试用")
-            st.caption("输入任意股票代码查看走势")
-
-            trial_symbol = st.text_input(
-                "输入股票代码",
-                placeholder="600519, 000001",
-                max_chars=6,
-                label_visibility="visible",
-                key="trial_symbol"
-            )
-
-            if trial_symbol:
-                trial_symbol = trial_symbol.strip().zfill(6)
-                if len(trial_symbol) == 6 and trial_symbol.isdigit():
-                    tv_symbol = get_tradingview_symbol(trial_symbol)
-
-                    tv_html = f"""
-                    <div class="tv-container">
-                        <div id="tradingview_trial"></div>
-                    </div>
-                    <script type="text/javascript" src="https://s3.tradingview.com/tv.js"></script>
-                    <script type="text/javascript">
-                    new TradingView.widget({{
-                        "width": "100%",
-                        "height": 400,
-                        "symbol": "{tv_symbol}",
-                        "interval": "D",
-                        "timezone": "Asia/Shanghai",
-                        "theme": "light",
-                        "style": "1",
-                        "locale": "zh_CN",
-                        "toolbar_bg": "#f1f3f6",
-                        "enable_publishing": false,
-                        "allow_symbol_change": true,
-                        "container_id": "tradingview_trial"
-                    }});
-                    </script>
-                    <div style="font-size: 0.75em; color: #999; margin-top: 5px; text-align: center;">
-                        TradingView® 为 TradingView, Inc. 注册商标
-                    </div>
-                    """
-                    components.html(tv_html, height=480)
+            render_trial_chart()
 
             st.stop()
 
     # ==================== 验证成功 - 加载数据 | Load Data ====================
     st.markdown('<div class="unlock-badge">✓ 已解锁 | Access Granted</div>', unsafe_allow_html=True)
 
-    csv_path = os.path.join(os.path.dirname(__file__), 'trade_list_top10.csv')
-
-    if not os.path.exists(csv_path):
+    if not has_signal_data():
         st.error("❌ 数据文件不存在 | Data file not found")
         st.info("请上传 trade_list_top10.csv 到项目目录")
         return
 
     try:
-        df = pd.read_csv(csv_path)
-
-        # 交易日判断
-        now = datetime.now()
-        current_hour = now.hour
-
-        if current_hour >= 16:
-            display_date = now + timedelta(days=1)
-            date_label = "下一个交易日"
-        else:
-            display_date = now
-            date_label = "今日"
+        with timing.span('main:data'):
+            df = load_top_signals(10)
 
-        date_display = display_date.strftime('%Y-%m-%d')
-        st.caption(f"📅 {date_label} | Trading Day: {date_display}")
+        # 交易日判断（交易日历：跳过周末与节假日）
+        display_date, is_today = signal_trading_day(datetime.now())
+        date_label = "今日" if is_today else "下一个交易日"
+        st.caption(f"📅 {date_label} | Trading Day: {display_date}")
 
     except Exception as e:
         st.error(f"❌ 读取数据失败 | Data read failed: {e}")
@@ -446,212 +897,64 @@ def main():
         st.error("❌ 数据格式错误 | Data format error")
         return
 
-    df_top10 = df.head(10).copy()
-    df_top10['symbol'] = df_top10['symbol'].apply(format_stock_code)
-    stock_names = df_top10.get('name', df_top10['symbol']).tolist()
+    with timing.span('main:prepare'):
+        df_top10, stock_names = prepare_top10(df)
 
     # ==================== 标签页 | Tabs ====================
 
-    tab1, tab2, tab3, tab4 = st.tabs([
+    # 只执行当前选中标签页的内容
+    tab_labels = [
         "📊 Signal List",
         "📈 Chart",
         "📉 Backtest",
         "☕ Support"
-    ])
+    ]
+    (tab1, tab2, tab3, tab4), opened = lazy_tabs(tab_labels, key="main_tabs")
+    active_tab = tab_labels[opened.index(True)]
+    if st.session_state.get("tracked_tab") != active_tab:
+        st.session_state.tracked_tab = active_tab
+        track("tab", tab=active_tab)
 
     with tab1:
         # ==================== 信号展示 | Signal Display ====================
-        st.markdown("### 📊 Signal List")
-        st.caption("Rank 1–10 | 基于模型历史输出")
-
-        # Rank 1 - Featured
-        if len(df_top10) > 0:
-            code = df_top10.iloc[0]['symbol']
-            name = stock_names[0]
-            score = df_top10.iloc[0].get('score', 0)
-
-            st.markdown(f"""
-            <div class="signal-card risk-on" style="border: 2px solid #f59e0b;">
-                <div class="signal-label" style="color: #b45309;">★ Featured Signal</div>
-                <div style="font-size: 1.2em; font-weight: 700; color: #1a1a2e;">
-                    {code} · {name}
-                </div>
-                <div style="font-size: 0.85em; color: #78350f; margin-top: 4px;">
-                    Score: {score:.2f}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-        # Rank 2-3 - Silver
-        if len(df_top10) >= 3:
-            st.markdown("#### ◆ Silver Tier")
-            for i in range(1, 3):
-                if i < len(df_top10):
-                    code = df_top10.iloc[i]['symbol']
-                    name = stock_names[i]
-                    score = df_top10.iloc[i].get('score', 0)
-                    st.markdown(f"""
-                    <div class="stock-item" style="border-left-color: #6b7280;">
-                        <div style="display: flex; justify-content: space-between; align-items: center;">
-                            <div>
-                                <strong>{code}</strong>
-                                <span style="color: #666; margin-left: 8px;">{name}</span>
-                            </div>
-                            <div style="color: #6b7280; font-weight: 500;">{score:.2f}</div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-        # Rank 4-10 - Other
-        if len(df_top10) >= 4:
-            st.markdown("#### ◇ Other Signals")
-            for i in range(3, min(10, len(df_top10))):
-                code = df_top10.iloc[i]['symbol']
-                name = stock_names[i]
-                score = df_top10.iloc[i].get('score', 0)
-                st.markdown(f"""
-                <div class="stock-item">
-                    <div style="display: flex; justify-content: space-between; align-items: center;">
-                        <div>
-                            <span style="color: #999; margin-right: 8px;">{i}.</span>
-                            <strong>{code}</strong>
-                            <span style="color: #666; margin-left: 8px;">{name}</span>
-                        </div>
-                        <div style="color: #9ca3af;">{score:.2f}</div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+        if opened[0]:
+            with timing.span('tab:signal_list'):
+                render_signal_tab(df_top10)
 
     with tab2:
-        # ==================== TradingView 图表 | Chart ====================
-        st.markdown("""
-        ### 📈 Chart Reference
-        """)
-
-        st.caption("""
-        ⚠️ 第三方市场行情工具 | TradingView® 为 TradingView, Inc. 注册商标
-        """)
-
-        # 创建选择器
-        stock_options = [f"{code} - {name}" for code, name in zip(df_top10['symbol'], stock_names)]
-        selected = st.selectbox(
-            "选择股票 | Select Stock",
-            stock_options,
-            index=0,
-            label_visibility="visible"
-        )
-
-        if selected:
-            selected_code = selected.split(" - ")[0]
-            selected_name = selected.split(" - ")[1]
-            symbol = get_tradingview_symbol(selected_code)
-
-            # TradingView Widget
-            tv_html = f"""
-            <div class="tv-container">
-                <div id="tradingview_widget"></div>
-            </div>
-            <script type="text/javascript" src="https://s3.tradingview.com/tv.js"></script>
-            <script type="text/javascript">
-            new TradingView.widget({{
-                "width": "100%",
-                "height": 480,
-                "symbol": "{symbol}",
-                "interval": "D",
-                "timezone": "Asia/Shanghai",
-                "theme": "light",
-                "style": "1",
-                "locale": "zh_CN",
-                "toolbar_bg": "#f1f3f6",
-                "enable_publishing": false,
-                "allow_symbol_change": true,
-                "container_id": "tradingview_widget"
-            }});
-            </script>
-            <div style="font-size: 0.75em; color: #999; margin-top: 5px; text-align: center;">
-                TradingView® 为 TradingView, Inc. 注册商标 | 本平台无关联
-            </div>
-            """
-            components.html(tv_html, height=550)
+        # ==================== 行情图表 | Chart ====================
+        if opened[1]:
+            with timing.span('tab:chart'):
+                render_chart_tab(df_top10, stock_names)
 
     with tab3:
         # ==================== 历史回测 | Backtest ====================
-        st.markdown("""
-        ### 📉 Backtest History
-        """)
-        st.caption("策略历史表现，仅供研究参考 | Historical strategy performance for reference only")
-
-        equity_path = 'equity.csv'
-
-        if os.path.exists(equity_path):
-            try:
-                equity_df = pd.read_csv(equity_path)
-                equity_df['date'] = pd.to_datetime(equity_df['date'])
-
-                initial = equity_df['equity'].iloc[0]
-                final = equity_df['equity'].iloc[-1]
-                total_return = (final - initial) / initial * 100
-
-                # 指标卡片
-                col1, col2, col3 = st.columns(3)
-
-                with col1:
-                    st.metric(
-                        "初始净值 | Initial",
-                        f"{initial:.4f}"
-                    )
-                with col2:
-                    st.metric(
-                        "当前净值 | Current",
-                        f"{final:.4f}"
-                    )
-                with col3:
-                    delta_color = "normal" if total_return >= 0 else "inverse"
-                    st.metric(
-                        "收益率 | Return",
-                        f"{total_return:.2f}%",
-                        delta=f"{total_return:.2f}%",
-                        delta_color=delta_color
-                    )
-
-                # 曲线图
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=equity_df['date'],
-                    y=equity_df['equity'],
-                    mode='lines',
-                    name='净值 | NAV',
-                    line=dict(color='#3498db', width=2),
-                    fill='tozeroy',
-                    fillcolor='rgba(52, 152, 219, 0.1)'
-                ))
-
-                fig.update_layout(
-                    title="策略净值曲线 | Strategy NAV Curve",
-                    xaxis_title="日期 | Date",
-                    yaxis_title="净值 | NAV",
-                    height=350,
-                    template="plotly_white",
-                    hovermode="x unified"
-                )
-
-                st.plotly_chart(fig, use_container_width=True)
-
-                st.caption("⚠️ 历史表现不代表未来收益 | Past performance ≠ future results")
-
-            except Exception as e:
-                st.warning(f"数据加载失败 | Data load failed: {e}")
-        else:
-            st.info("暂无历史数据 | No historical data available")
+        if opened[2]:
+            with timing.span('tab:backtest'):
+                render_backtest_tab()
 
     with tab4:
         # ==================== 支持作者 | Support ====================
-        render_support_page()
+        if opened[3]:
+            with timing.span('tab:support'):
+                render_support_page()
+
+    # 后台预热下一个可能打开的标签页
+    if PREFETCH_ENABLED:
+        warmer = TAB_WARMERS[next_tab(opened)]
+        if warmer is not None:
+            warm, version = warmer
+            prefetch((warm.__name__, version()), warm)
+
+    # ==================== 耗时统计 | Timing (EIGENFLOW_TIMING=1) ====================
+    if timing.ENABLED:
+        render_timing_panel()
 
     # ==================== 底部免责声明 | Footer Disclaimer ====================
-    st.markdown("---")
+    with timing.span('main:footer'):
+        st.markdown("---")
 
-    st.markdown(f"""
+        st.markdown(f"""
     <div class="disclaimer-box">
         <div class="disclaimer-title">⚠️ 法律声明 | Legal Disclaimer</div>
         <ul style="margin: 0; padding-left: 20px;">
@@ -668,7 +971,7 @@ def main():
             本平台与 TradingView, Inc. 不存在任何合作、授权或隶属关系 | No affiliation with TradingView, Inc.
         </div>
     </div>
-    """, unsafe_allow_html=True)
+        """, unsafe_allow_html=True)
 
 
 if __name__ == "__main__":
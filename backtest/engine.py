@@ -0,0 +1,260 @@
+"""
+================================================================================
+EigenFlow Backtest Engine | 向量化回测引擎
+
+输入历史每日 Top-N 清单 + 本地价格面板，输出 date,equity 净值曲线：
+- 在 日期 × 股票 矩阵上做数组运算，没有逐日 Python 循环
+- 持仓只在调仓日变化，调仓间按个股涨跌自然漂移（非每日再平衡）
+- 持仓表示为 (调仓次数 × top_n) 的列号矩阵，内存只随 top_n 增长
+
+约定：
+- 某日信号在该日收盘建仓（delay 可顺延），从下一交易日开始计收益
+- 价格缺失（停牌）期间收益为 0，复牌日计入停牌前后的价差；面板中不存在的代码直接剔除
+- 当日清单为空时持有现金
+================================================================================
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# ==================== 价格面板 | Price Panel ====================
+
+class PricePanel:
+    """
+    日期 × 股票 的收盘价面板
+
+    Attributes:
+        dates: datetime64[D] 有序日期
+        symbols: 6 位代码数组
+        close: (T, N) float64 收盘价，缺失为 NaN
+    """
+
+    def __init__(self, dates, symbols, close):
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.symbols = np.asarray([str(s).zfill(6) for s in symbols])
+        self.close = np.asarray(close, dtype=np.float64)
+        if self.close.shape != (len(self.dates), len(self.symbols)):
+            raise ValueError("close shape must be (len(dates), len(symbols))")
+        self._column = {s: i for i, s in enumerate(self.symbols)}
+        self._memo = {}
+
+    @classmethod
+    def from_wide(cls, df: pd.DataFrame) -> 'PricePanel':
+        """宽表：index 或首列为日期，其余列为代码"""
+        if not isinstance(df.index, pd.DatetimeIndex):
+            df = df.set_index(df.columns[0])
+        df = df.sort_index()
+        return cls(pd.to_datetime(df.index).values, df.columns, df.to_numpy(dtype=np.float64))
+
+    @classmethod
+    def from_long(cls, df: pd.DataFrame, value: str = 'close') -> 'PricePanel':
+        """长表：date,symbol,close"""
+        wide = df.pivot(index='date', columns='symbol', values=value)
+        wide.index = pd.to_datetime(wide.index)
+        return cls.from_wide(wide)
+
+    @classmethod
+    def read_csv(cls, path: str) -> 'PricePanel':
+        """读取宽表 CSV | Read a wide date × symbol close CSV"""
+        df = pd.read_csv(path, index_col=0, parse_dates=True)
+        df.columns = [str(c).zfill(6) for c in df.columns]
+        return cls.from_wide(df)
+
+    def columns_of(self, symbols) -> np.ndarray:
+        """代码 -> 列号，不存在为 -1 | Map codes to column ids"""
+        get = self._column.get
+        return np.fromiter((get(s, -1) for s in symbols), dtype=np.intp, count=len(symbols))
+
+    def returns(self) -> np.ndarray:
+        """
+        日收益率，收盘价先前向填充 | Daily simple returns on forward-filled close
+
+        停牌日收益为 0，复牌日收益相对停牌前最后收盘价计算，与 ashare 模式
+        的 backtest.rules.filled_close 一致；上市前的 NaN 仍记为 0
+        """
+        px = pd.DataFrame(self.close).ffill().to_numpy()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ret = px[1:] / px[:-1] - 1.0
+        ret = np.nan_to_num(ret, nan=0.0, posinf=0.0, neginf=0.0)
+        return np.vstack([np.zeros((1, self.close.shape[1])), ret])
+
+    def missing_days(self, calendar) -> np.ndarray:
+        """
+        面板日期范围内、交易日历中存在但面板缺失的交易日
+
+        缺失行会让跨缺口的收益被计为 0，回测前应补齐行情
+        """
+        if len(self.dates) == 0:
+            return np.array([], dtype='datetime64[D]')
+        expected = calendar.trading_days(self.dates[0], self.dates[-1])
+        return np.setdiff1d(expected, self.dates)
+
+    def memo(self, key, build):
+        """面板级派生数组缓存 | Cache a derived array on the panel"""
+        value = self._memo.get(key)
+        if value is None:
+            value = self._memo[key] = build()
+        return value
+
+    def growth(self) -> np.ndarray:
+        """累计增长因子 G[t] = Π(1+r)（缓存） | Cumulative growth, cached"""
+        return self.memo('growth', lambda: np.cumprod(1.0 + self.returns(), axis=0))
+
+
+# ==================== 信号 -> 持仓 | Signals -> Holdings ====================
+
+def build_holdings(signals: pd.DataFrame, panel: PricePanel, top_n: int = 10,
+                   rebalance_every: int = 1, delay: int = 0):
+    """
+    将长表信号转为调仓行号与持仓矩阵
+
+    Args:
+        signals: 含 date, symbol，可选 rank（缺省按日内顺序）
+        panel: 价格面板
+        top_n: 每期持仓数
+        rebalance_every: 每隔 k 个信号日调仓一次
+        delay: 建仓相对信号日顺延的交易日数
+
+    Returns:
+        (reb_rows, holdings)，holdings 为 (K, top_n) 列号矩阵，空位为 -1
+    """
+    sig = signals.loc[:, [c for c in ('date', 'symbol', 'rank') if c in signals.columns]]
+    sig = sig.assign(date=pd.to_datetime(sig['date']))
+    if 'rank' not in sig.columns:
+        sig['rank'] = sig.groupby('date').cumcount() + 1
+    sig = sig[sig['rank'] <= top_n].sort_values(['date', 'rank'], kind='stable')
+
+    rows = np.searchsorted(panel.dates, sig['date'].values.astype('datetime64[D]')) + delay
+    cols = panel.columns_of(sig['symbol'].astype(str).str.zfill(6).tolist())
+    keep = (rows < len(panel.dates)) & (cols >= 0)
+    rows, cols = rows[keep], cols[keep]
+
+    reb_rows = np.unique(rows)[::max(1, int(rebalance_every))]
+    in_reb = np.isin(rows, reb_rows)
+    rows, cols = rows[in_reb], cols[in_reb]
+
+    seg = np.searchsorted(reb_rows, rows)
+    # 段内序号：有序数组上 当前位置 - 段起点
+    starts = np.searchsorted(seg, np.arange(len(reb_rows)))
+    slot = np.arange(len(seg)) - starts[seg]
+    fits = slot < top_n
+
+    holdings = np.full((len(reb_rows), top_n), -1, dtype=np.intp)
+    holdings[seg[fits], slot[fits]] = cols[fits]
+    return reb_rows, holdings
+
+
+# ==================== 净值计算 | NAV ====================
+
+def segment_growth(panel: PricePanel, reb_rows: np.ndarray, holdings: np.ndarray,
+                   weights: np.ndarray = None):
+    """
+    计算每个交易日相对所属调仓期起点的组合增长
+
+    Args:
+        weights: (K, top_n) 持仓权重，缺省为等权；现金 = 1 - 行和
+
+    Returns:
+        (t, seg, g)：交易日行号、所属调仓期、组合增长 g(t)
+    """
+    G = panel.growth()
+    t = np.arange(reb_rows[0] + 1, len(panel.dates))
+    # 持仓在 s 收盘形成，作用于 (s, s_next] 的收益
+    seg = np.searchsorted(reb_rows, t, side='left') - 1
+
+    valid = holdings >= 0
+    if weights is None:
+        counts = valid.sum(axis=1)
+        weights = np.where(valid, 1.0 / np.maximum(counts, 1)[:, None], 0.0)
+    cash = 1.0 - weights.sum(axis=1)
+
+    cols = np.where(valid, holdings, 0)[seg]
+    base = G[reb_rows[seg][:, None], cols]
+    cur = G[t[:, None], cols]
+    rel = np.where(valid[seg], cur / base, 0.0)
+    g = cash[seg] + (weights[seg] * rel).sum(axis=1)
+    return t, seg, g
+
+
+def daily_returns_from_growth(seg: np.ndarray, g: np.ndarray) -> np.ndarray:
+    """段内增长 -> 组合日收益 | Chain segment growth into daily returns"""
+    prev = np.ones_like(g)
+    same = np.zeros(len(g), dtype=bool)
+    same[1:] = seg[1:] == seg[:-1]
+    prev[1:] = np.where(same[1:], g[:-1], 1.0)
+    return g / prev - 1.0
+
+
+def run_backtest(signals: pd.DataFrame, panel: PricePanel, top_n: int = 10,
+                 rebalance_every: int = 1, delay: int = 0, mode: str = 'ideal',
+                 **rule_kwargs) -> pd.DataFrame:
+    """
+    运行等权 Top-N 回测
+
+    Args:
+        mode: 'ideal' 无摩擦等权；'ashare' 按 A 股交易规则模拟（见 backtest.rules）
+        rule_kwargs: 透传给 backtest.rules.simulate（capital, costs, is_st）
+
+    Returns:
+        DataFrame[date, equity]，首个调仓日净值为 1.0
+    """
+    if mode == 'ashare':
+        from backtest.rules import simulate
+        return simulate(signals, panel, top_n, rebalance_every, delay, **rule_kwargs)
+    if mode != 'ideal':
+        raise ValueError(f"unknown backtest mode: {mode}")
+
+    reb_rows, holdings = build_holdings(signals, panel, top_n, rebalance_every, delay)
+    if len(reb_rows) == 0:
+        return pd.DataFrame({'date': pd.to_datetime([]), 'equity': []})
+
+    t, seg, g = segment_growth(panel, reb_rows, holdings)
+    ret = daily_returns_from_growth(seg, g)
+    equity = np.concatenate([[1.0], np.cumprod(1.0 + ret)])
+    dates = panel.dates[reb_rows[0]:]
+    return pd.DataFrame({'date': pd.to_datetime(dates), 'equity': equity})
+
+
+def write_equity_csv(result: pd.DataFrame, path: str):
+    """按 tab3 读取的 date,equity 格式写出 | Write the date,equity csv"""
+    out = pd.DataFrame({
+        'date': pd.to_datetime(result['date']).dt.strftime('%Y-%m-%d'),
+        'equity': result['equity'].round(6),
+    })
+    tmp = path + '.tmp'
+    out.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from core.archive import SignalArchive
+
+    parser = argparse.ArgumentParser(description='由归档信号回测并生成 equity.csv')
+    parser.add_argument('prices', help='宽表收盘价 CSV（date × symbol）')
+    parser.add_argument('--archive', default='signal_archive')
+    parser.add_argument('--start', default=None)
+    parser.add_argument('--end', default=None)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--rebalance', type=int, default=1, help='每隔 k 个信号日调仓')
+    parser.add_argument('--ashare', action='store_true', help='按 A 股交易规则模拟')
+    parser.add_argument('--out', default='equity.csv')
+    parser.add_argument('--holidays', default='holidays.csv', help='节假日文件（检查行情缺口）')
+    args = parser.parse_args()
+
+    from core.trading_calendar import load_calendar
+
+    signals = SignalArchive(args.archive).load_range(args.start, args.end)
+    panel = PricePanel.read_csv(args.prices)
+    gaps = panel.missing_days(load_calendar(args.holidays))
+    if len(gaps):
+        print(f"[警告] 行情缺失 {len(gaps)} 个交易日（首个 {gaps[0]}），跨缺口收益按 0 计")
+    result = run_backtest(signals, panel,
+                          top_n=args.top, rebalance_every=args.rebalance,
+                          mode='ashare' if args.ashare else 'ideal')
+    write_equity_csv(result, args.out)
+    print(f"[成功] 已写入 {args.out}（{len(result)} 行）")
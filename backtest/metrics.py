@@ -0,0 +1,183 @@
+"""
+================================================================================
+EigenFlow Metrics | 净值绩效指标
+
+对 NAV 数组做向量化统计：年化收益、波动率、Sharpe、最大回撤及持续期、
+回撤序列、月度收益表、胜率
+
+- EquityMetrics 保存可累加的运行状态（收益和 / 平方和、峰值、水下天数等），
+  新增交易日时只对新增部分做向量运算，不重算全部历史
+- metrics_for(path) 按 equity 文件版本缓存；文件仅在末尾追加时走增量更新
+================================================================================
+"""
+
+import copy
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core import loader
+
+
+TRADING_DAYS = 252
+
+
+# ==================== 指标状态 | Metrics State ====================
+
+class EquityMetrics:
+    """可增量更新的净值指标 | Incrementally updatable NAV metrics"""
+
+    def __init__(self, risk_free: float = 0.0):
+        self.risk_free = risk_free
+        self.dates = np.empty(0, dtype='datetime64[D]')
+        self.nav = np.empty(0, dtype=np.float64)
+        self.drawdown = np.empty(0, dtype=np.float64)
+        self.n_returns = 0
+        self.sum_ret = 0.0
+        self.sum_sq = 0.0
+        self.wins = 0
+        self.peak = -np.inf
+        self.max_drawdown = 0.0
+        self.underwater = 0          # 当前水下天数
+        self.max_underwater = 0      # 最长水下天数
+        self.month_end = {}          # 'YYYY-MM' -> 月末净值
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, **kwargs) -> 'EquityMetrics':
+        """由 date,equity 表构建 | Build from a date,equity frame"""
+        metrics = cls(**kwargs)
+        metrics.extend(df['date'].to_numpy(), df['equity'].to_numpy(dtype=np.float64))
+        return metrics
+
+    def copy(self) -> 'EquityMetrics':
+        """浅拷贝（数组追加时整体替换，无需深拷贝）"""
+        clone = copy.copy(self)
+        clone.month_end = dict(self.month_end)
+        return clone
+
+    def extend(self, dates, nav):
+        """追加新交易日，只处理新增部分 | Fold in appended rows"""
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        nav = np.asarray(nav, dtype=np.float64)
+        if len(nav) == 0:
+            return self
+
+        # 日收益（与上一批末值衔接）
+        chained = np.concatenate([self.nav[-1:], nav])
+        ret = np.diff(chained) / chained[:-1]
+        self.n_returns += len(ret)
+        self.sum_ret += ret.sum()
+        self.sum_sq += (ret * ret).sum()
+        self.wins += int((ret > 0).sum())
+
+        # 回撤
+        peaks = np.maximum.accumulate(np.maximum(nav, self.peak))
+        dd = nav / peaks - 1.0
+        self.peak = peaks[-1]
+        self.max_drawdown = min(self.max_drawdown, dd.min())
+
+        # 水下持续期：距最近一次创新高的天数
+        idx = np.arange(len(dd))
+        last_peak = np.maximum.accumulate(np.where(dd >= 0, idx, -1))
+        run = np.where(last_peak >= 0, idx - last_peak, self.underwater + idx + 1)
+        self.underwater = int(run[-1])
+        self.max_underwater = max(self.max_underwater, int(run.max()))
+
+        # 月末净值
+        months = dates.astype('datetime64[M]')
+        last_of_month = np.append(months[1:] != months[:-1], True)
+        for month, value in zip(months[last_of_month].astype(str), nav[last_of_month]):
+            self.month_end[month] = value
+
+        self.dates = np.concatenate([self.dates, dates])
+        self.nav = np.concatenate([self.nav, nav])
+        self.drawdown = np.concatenate([self.drawdown, dd])
+        return self
+
+    # ---------- 汇总 | Summary ----------
+
+    def summary(self) -> dict:
+        """汇总指标字典 | Headline metrics"""
+        n = self.n_returns
+        if len(self.nav) < 2 or n == 0:
+            return {'total_return': 0.0, 'annual_return': 0.0, 'annual_vol': 0.0,
+                    'sharpe': 0.0, 'max_drawdown': 0.0, 'max_drawdown_days': 0, 'win_rate': 0.0}
+
+        mean = self.sum_ret / n
+        var = (self.sum_sq - n * mean * mean) / (n - 1) if n > 1 else 0.0
+        std = np.sqrt(max(var, 0.0))
+        growth = self.nav[-1] / self.nav[0]
+        return {
+            'total_return': growth - 1.0,
+            'annual_return': growth ** (TRADING_DAYS / n) - 1.0 if growth > 0 else -1.0,
+            'annual_vol': std * np.sqrt(TRADING_DAYS),
+            'sharpe': (mean - self.risk_free / TRADING_DAYS) / std * np.sqrt(TRADING_DAYS) if std > 0 else 0.0,
+            'max_drawdown': self.max_drawdown,
+            'max_drawdown_days': self.max_underwater,
+            'win_rate': self.wins / n,
+        }
+
+    def drawdown_series(self) -> pd.Series:
+        """回撤序列 | Underwater curve"""
+        return pd.Series(self.drawdown, index=pd.to_datetime(self.dates), name='drawdown')
+
+    def rolling_max_drawdown(self, window: int = TRADING_DAYS) -> pd.Series:
+        """滚动窗口最大回撤 | Max drawdown within each trailing window"""
+        if len(self.nav) < window:
+            return pd.Series(dtype=np.float64, name='rolling_max_drawdown')
+        view = np.lib.stride_tricks.sliding_window_view(self.nav, window)
+        dd = (view / np.maximum.accumulate(view, axis=1) - 1.0).min(axis=1)
+        return pd.Series(dd, index=pd.to_datetime(self.dates[window - 1:]), name='rolling_max_drawdown')
+
+    def monthly_returns(self) -> pd.DataFrame:
+        """月度收益表（年 × 月） | Year x month return table"""
+        if not self.month_end:
+            return pd.DataFrame()
+        months = sorted(self.month_end)
+        ends = np.array([self.month_end[m] for m in months])
+        starts = np.concatenate([self.nav[:1], ends[:-1]])
+        table = pd.DataFrame({
+            'year': [int(m[:4]) for m in months],
+            'month': [int(m[5:7]) for m in months],
+            'return': ends / starts - 1.0,
+        })
+        return table.pivot(index='year', columns='month', values='return')
+
+
+# ==================== 按文件版本缓存 | Per-version Cache ====================
+
+_cache = {}       # abspath -> (FileVersion, EquityMetrics)
+_cache_lock = threading.Lock()
+
+
+def _is_append(metrics: EquityMetrics, df: pd.DataFrame) -> bool:
+    """新文件是否只是在旧文件末尾追加 | Prefix check on the last known row"""
+    n = len(metrics.nav)
+    if n == 0 or len(df) <= n:
+        return False
+    return (np.datetime64(df['date'].iloc[n - 1], 'D') == metrics.dates[-1]
+            and df['equity'].iloc[n - 1] == metrics.nav[-1])
+
+
+def metrics_for(path: str) -> EquityMetrics:
+    """
+    返回 equity 文件当前版本的指标
+
+    版本未变直接返回缓存；仅追加时增量更新；其它变化全量重算
+    """
+    df, version = loader.read_csv_versioned(path, parse_dates=['date'])
+    with _cache_lock:
+        cached = _cache.get(version.path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        if cached is not None and _is_append(cached[1], df):
+            n = len(cached[1].nav)
+            # 在副本上追加，其它会话仍可安全读取旧对象
+            metrics = cached[1].copy()
+            metrics.extend(df['date'].to_numpy()[n:], df['equity'].to_numpy(dtype=np.float64)[n:])
+        else:
+            metrics = EquityMetrics.from_frame(df)
+        _cache[version.path] = (version, metrics)
+        return metrics
@@ -0,0 +1,173 @@
+"""
+================================================================================
+EigenFlow A-Share Rules | A股交易规则模拟
+
+批量模拟模式：交易约束先在整张面板上计算为布尔掩码，再按调仓事件批量撮合
+- 涨跌停：主板 ±10%，科创板 / 创业板 ±20%，北交所 ±30%，ST ±5%（板块规则见 core.symbols）
+  收盘封涨停不可买入，封跌停不可卖出；停牌（价格缺失）不可交易
+- T+1：当日买入的持仓不可当日卖出
+- 100 股整手买入，零头资金留作现金
+- 佣金（双边，含最低 5 元）、过户费（双边）、印花税（卖出单边）
+
+循环只发生在调仓事件层面（每次最多 2 × top_n 笔委托，全部向量化撮合），
+逐日净值仍由 (日期 × 持仓) 的数组 gather 一次算出
+================================================================================
+"""
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import PricePanel, build_holdings
+from core.symbols import limit_pcts
+
+
+# ==================== 费率 | Costs ====================
+
+DEFAULT_COSTS = {
+    'commission': 0.00025,     # 佣金 万2.5（双边）
+    'min_commission': 5.0,     # 单笔最低佣金（元）
+    'transfer_fee': 0.00001,   # 过户费 十万分之一（双边）
+    'stamp_duty': 0.0005,      # 印花税 万5（卖出单边）
+}
+
+LOT_SIZE = 100
+
+
+def _order_fees(amount: np.ndarray, costs: dict, sell: bool) -> np.ndarray:
+    """逐笔费用 | Per-order fees for an array of trade amounts"""
+    commission = np.maximum(amount * costs['commission'], costs['min_commission'])
+    fees = commission + amount * costs['transfer_fee']
+    if sell:
+        fees = fees + amount * costs['stamp_duty']
+    return np.where(amount > 0, fees, 0.0)
+
+
+# ==================== 面板掩码 | Panel Masks ====================
+
+def filled_close(panel: PricePanel) -> np.ndarray:
+    """停牌日沿用最近收盘价 | Forward-filled close"""
+    return pd.DataFrame(panel.close).ffill().to_numpy()
+
+
+def trading_masks(panel: PricePanel, is_st=None, px: np.ndarray = None):
+    """
+    在整张面板上计算可买 / 可卖掩码
+
+    Args:
+        panel: 价格面板
+        is_st: 可选 ST 标记，(N,) 或 (T, N) 布尔数组
+        px: 已计算的前向填充收盘价（可复用）
+
+    Returns:
+        (can_buy, can_sell)，均为 (T, N) 布尔矩阵
+    """
+    close = panel.close
+    px = filled_close(panel) if px is None else px
+    prev = np.vstack([np.full((1, close.shape[1]), np.nan), px[:-1]])
+
+    pct = limit_pcts(panel.symbols, is_st)
+    up = np.round(prev * (1.0 + pct), 2)
+    down = np.round(prev * (1.0 - pct), 2)
+
+    tradable = ~np.isnan(close)
+    with np.errstate(invalid='ignore'):
+        limit_up = tradable & (close >= up - 0.005)
+        limit_down = tradable & (close <= down + 0.005)
+    return tradable & ~limit_up, tradable & ~limit_down
+
+
+# ==================== 模拟 | Simulation ====================
+
+def simulate(signals: pd.DataFrame, panel: PricePanel, top_n: int = 10,
+             rebalance_every: int = 1, delay: int = 0, capital: float = 1_000_000.0,
+             costs: dict = None, is_st=None) -> pd.DataFrame:
+    """
+    按 A 股规则回测 Top-N 策略
+
+    调仓时：先卖出移出清单且可卖的持仓，再用现金等额买入新进清单且可买的股票；
+    仍在清单中的持仓不做调整，减少换手
+
+    Returns:
+        DataFrame[date, equity]（equity 以初始资金归一），
+        attrs 中附带费用、受阻委托数等统计
+    """
+    costs = {**DEFAULT_COSTS, **(costs or {})}
+    reb_rows, targets = build_holdings(signals, panel, top_n, rebalance_every, delay)
+    if len(reb_rows) == 0:
+        return pd.DataFrame({'date': pd.to_datetime([]), 'equity': []})
+
+    px = panel.memo('filled_close', lambda: filled_close(panel))
+    if is_st is None:
+        can_buy, can_sell = panel.memo('trading_masks', lambda: trading_masks(panel, None, px))
+    else:
+        can_buy, can_sell = trading_masks(panel, is_st, px)
+
+    cash = float(capital)
+    pos_cols = np.empty(0, dtype=np.intp)
+    pos_shares = np.empty(0, dtype=np.float64)
+    pos_entry = np.empty(0, dtype=np.intp)
+    seg_cols, seg_shares, seg_cash = [], [], []
+    stats = {'fees': 0.0, 'buys': 0, 'sells': 0, 'blocked_buys': 0, 'blocked_sells': 0}
+
+    for k, row in enumerate(reb_rows):
+        target = targets[k][targets[k] >= 0]
+        price = px[row]
+
+        # ---------- 卖出 | Sells ----------
+        leaving = ~np.isin(pos_cols, target)
+        sellable = can_sell[row, pos_cols] & (pos_entry < row)   # T+1
+        sell = leaving & sellable
+        amount = pos_shares[sell] * price[pos_cols[sell]]
+        fees = _order_fees(amount, costs, sell=True)
+        cash += amount.sum() - fees.sum()
+        stats['fees'] += float(fees.sum())
+        stats['sells'] += int(sell.sum())
+        stats['blocked_sells'] += int((leaving & ~sellable).sum())
+        pos_cols, pos_shares, pos_entry = pos_cols[~sell], pos_shares[~sell], pos_entry[~sell]
+
+        # ---------- 买入 | Buys ----------
+        new = target[~np.isin(target, pos_cols)]
+        ok = can_buy[row, new]
+        stats['blocked_buys'] += int((~ok).sum())
+        new = new[ok]
+        if len(new):
+            value = cash + (pos_shares * price[pos_cols]).sum()
+            alloc = min(cash / len(new), value / max(len(target), 1))
+            p = price[new]
+            unit = p * LOT_SIZE * (1.0 + costs['commission'] + costs['transfer_fee'])
+            lots = np.floor(alloc / unit)
+            # 最低佣金可能使总额超出分配额，退一手
+            over = lots * p * LOT_SIZE + _order_fees(lots * p * LOT_SIZE, costs, sell=False) > alloc
+            lots = np.maximum(lots - over, 0)
+            shares = lots * LOT_SIZE
+            amount = shares * p
+            fees = _order_fees(amount, costs, sell=False)
+            bought = shares > 0
+            cash -= (amount + fees)[bought].sum()
+            stats['fees'] += float(fees[bought].sum())
+            stats['buys'] += int(bought.sum())
+            pos_cols = np.concatenate([pos_cols, new[bought]])
+            pos_shares = np.concatenate([pos_shares, shares[bought]])
+            pos_entry = np.concatenate([pos_entry, np.full(int(bought.sum()), row, dtype=np.intp)])
+
+        seg_cols.append(pos_cols)
+        seg_shares.append(pos_shares)
+        seg_cash.append(cash)
+
+    # ---------- 逐日净值 | Daily NAV ----------
+    width = max(1, max(len(c) for c in seg_cols))
+    cols = np.zeros((len(reb_rows), width), dtype=np.intp)
+    shares = np.zeros((len(reb_rows), width), dtype=np.float64)
+    for k, (c, s) in enumerate(zip(seg_cols, seg_shares)):
+        cols[k, :len(c)] = c
+        shares[k, :len(s)] = s
+    cash_arr = np.array(seg_cash)
+
+    t = np.arange(reb_rows[0], len(panel.dates))
+    seg = np.searchsorted(reb_rows, t, side='right') - 1
+    held = np.nan_to_num(px[t[:, None], cols[seg]], nan=0.0)
+    nav = cash_arr[seg] + (shares[seg] * held).sum(axis=1)
+
+    result = pd.DataFrame({'date': pd.to_datetime(panel.dates[t]), 'equity': nav / capital})
+    result.attrs.update(stats)
+    return result
@@ -0,0 +1,190 @@
+"""
+================================================================================
+EigenFlow Parameter Sweep | 并行参数扫描
+
+对 trade_list_top10 策略的参数网格（top_n / 调仓频率 / 因子权重 / 模式）并行回测：
+- ProcessPoolExecutor 分发，每个组合一个任务，互不依赖，随核数近线性扩展
+- 价格面板及其派生数组（累计增长、前向填充价、涨跌停掩码）放入共享内存，
+  worker 只按名称挂载视图，不逐个 pickle
+- 每个组合的指标汇总为一张结果表，写出 CSV 供 Backtest 标签页浏览
+================================================================================
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import PricePanel, run_backtest
+from backtest.metrics import EquityMetrics
+from core import scoring
+
+
+# ==================== 参数网格 | Parameter Grid ====================
+
+DEFAULT_GRID = {
+    'top_n': [5, 10, 20],
+    'rebalance_every': [1, 5, 20],
+    'weights': ['default'],
+    'mode': ['ideal'],
+}
+
+
+def expand_grid(grid: dict) -> list:
+    """参数网格 -> 组合列表 | Cartesian product of the grid"""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def rescore(signals: pd.DataFrame, weights: dict) -> pd.DataFrame:
+    """按新权重对每日清单重新打分并重排 rank（需含因子列）"""
+    scores = scoring.compute_scores(scoring.factor_matrix(signals), weights)
+    out = signals.assign(score=scores)
+    out['rank'] = out.groupby('date')['score'].rank(ascending=False, method='first').astype(int)
+    return out
+
+
+def summarize(equity: pd.DataFrame) -> dict:
+    """单次回测的汇总指标 | Headline metrics for one run"""
+    return EquityMetrics.from_frame(equity).summary()
+
+
+# ==================== 共享内存 | Shared Memory ====================
+
+def _share(arrays: dict):
+    """将数组复制进共享内存，返回 (specs, handles)"""
+    specs, handles = {}, []
+    for name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+        specs[name] = (shm.name, arr.shape, arr.dtype.str)
+        handles.append(shm)
+    return specs, handles
+
+
+def _attach(specs: dict):
+    """按名称挂载共享数组（零拷贝） | Attach shared arrays by name"""
+    arrays, handles = {}, []
+    for name, (shm_name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        handles.append(shm)
+    return arrays, handles
+
+
+def _panel_arrays(panel: PricePanel, modes) -> dict:
+    """父进程预先算好、要共享给 worker 的数组"""
+    arrays = {'close': panel.close, 'growth': panel.growth()}
+    if 'ashare' in modes:
+        from backtest.rules import filled_close, trading_masks
+        px = panel.memo('filled_close', lambda: filled_close(panel))
+        can_buy, can_sell = panel.memo('trading_masks', lambda: trading_masks(panel, None, px))
+        arrays.update(filled_close=px, can_buy=can_buy, can_sell=can_sell)
+    return arrays
+
+
+# ==================== Worker ====================
+
+_PANEL = None
+_SIGNALS = None
+_VARIANTS = None
+_HANDLES = []
+
+
+def _init_worker(specs, dates, symbols, signals, variants):
+    global _PANEL, _SIGNALS, _VARIANTS, _HANDLES
+    arrays, _HANDLES = _attach(specs)
+    _PANEL = PricePanel(dates, symbols, arrays['close'])
+    _PANEL._memo['growth'] = arrays['growth']
+    if 'filled_close' in arrays:
+        _PANEL._memo['filled_close'] = arrays['filled_close']
+        _PANEL._memo['trading_masks'] = (arrays['can_buy'], arrays['can_sell'])
+    _SIGNALS = signals
+    _VARIANTS = variants
+
+
+def _run_one(params: dict) -> dict:
+    weights = _VARIANTS.get(params.get('weights', 'default'))
+    signals = _SIGNALS if weights is None else rescore(_SIGNALS, weights)
+    equity = run_backtest(
+        signals, _PANEL,
+        top_n=params.get('top_n', 10),
+        rebalance_every=params.get('rebalance_every', 1),
+        mode=params.get('mode', 'ideal'),
+    )
+    return {**params, **summarize(equity)}
+
+
+# ==================== 入口 | Entry ====================
+
+def run_sweep(signals: pd.DataFrame, panel: PricePanel, grid: dict = None,
+              weight_variants: dict = None, workers: int = None) -> pd.DataFrame:
+    """
+    并行运行参数网格
+
+    Args:
+        signals: 长表信号（date, symbol, rank；权重变体需含因子列）
+        panel: 价格面板
+        grid: 参数网格，默认 DEFAULT_GRID
+        weight_variants: 权重变体名 -> 因子权重；'default' 表示使用原始 rank
+        workers: 进程数，默认 CPU 核数
+
+    Returns:
+        每个组合一行的结果表
+    """
+    grid = grid or DEFAULT_GRID
+    variants = {'default': None, **(weight_variants or {})}
+    combos = expand_grid(grid)
+    workers = min(workers or os.cpu_count() or 1, len(combos))
+
+    specs, handles = _share(_panel_arrays(panel, grid.get('mode', ['ideal'])))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(specs, panel.dates, panel.symbols, signals, variants),
+        ) as pool:
+            rows = list(pool.map(_run_one, combos))
+    finally:
+        for shm in handles:
+            shm.close()
+            shm.unlink()
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+
+    from core.archive import SignalArchive
+
+    parser = argparse.ArgumentParser(description='并行参数扫描回测')
+    parser.add_argument('prices', help='宽表收盘价 CSV（date × symbol）')
+    parser.add_argument('--archive', default='signal_archive')
+    parser.add_argument('--top', type=int, nargs='+', default=DEFAULT_GRID['top_n'])
+    parser.add_argument('--rebalance', type=int, nargs='+', default=DEFAULT_GRID['rebalance_every'])
+    parser.add_argument('--weights', default=None, help='权重变体 JSON：{名称: {因子: 权重}}')
+    parser.add_argument('--ashare', action='store_true', help='同时运行 A 股规则模式')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', default='sweep_results.csv')
+    args = parser.parse_args()
+
+    variants = {}
+    if args.weights:
+        with open(args.weights, encoding='utf-8') as f:
+            variants = json.load(f)
+
+    grid = {
+        'top_n': args.top,
+        'rebalance_every': args.rebalance,
+        'weights': ['default'] + list(variants),
+        'mode': ['ideal', 'ashare'] if args.ashare else ['ideal'],
+    }
+    results = run_sweep(SignalArchive(args.archive).load_range(), PricePanel.read_csv(args.prices),
+                        grid, variants, args.workers)
+    results.to_csv(args.out, index=False)
+    print(f"[成功] {len(results)} 组参数 -> {args.out}")
@@ -0,0 +1,339 @@
+"""
+================================================================================
+EigenFlow Load Test | 多会话并发压测
+
+在同一进程内用 Streamlit AppTest 模拟 N 个并发订阅会话（与 Streamlit 服务端一样
+共享进程级缓存），每个会话执行真实流程并记录每次重跑耗时：
+    load            打开页面（未解锁）
+    unlock          输入 Access Key 并确认
+    tab:chart       切换到 Chart
+    chart:symbol    切换图表股票
+    tab:backtest    切换到 Backtest
+    backtest:range  切换净值区间
+    tab:support     切换到 Support
+    tab:signals     回到 Signal List
+（解锁后的标签页流程重复 --iterations 次）
+
+报告：吞吐（重跑次数 / 秒）、p50 / p95 / p99 重跑延迟、每会话 RSS 增量，
+以及各步骤的分位数；--save 保存结果，--baseline 与已保存结果对比，
+任一指标劣化超过 --threshold 时标记并以退出码 1 结束
+
+用法：
+    python -m bench.load --sessions 1,4,8 --iterations 3 --save bench/load_baseline.json
+    python -m bench.load --sessions 1,4,8 --baseline bench/load_baseline.json
+================================================================================
+"""
+
+import contextlib
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+# 压测时不写使用记录（可用 --telemetry 保留）
+os.environ.setdefault('EIGENFLOW_TELEMETRY', '0')
+
+
+# ==================== 常量 | Constants ====================
+
+APP_PATH = os.path.join(BASE_DIR, 'app_v3.py')
+DEFAULT_KEY = 'EIGEN-2026-PRO'
+DEFAULT_THRESHOLD = 0.20
+TAB_KEY = 'main_tabs'
+TABS = {
+    'signals': "📊 Signal List",
+    'chart': "📈 Chart",
+    'backtest': "📉 Backtest",
+    'support': "☕ Support",
+}
+# (指标, 越大越差)
+COMPARED = (('p50_ms', True), ('p95_ms', True), ('p99_ms', True),
+            ('throughput_rps', False), ('rss_per_session_mb', True))
+
+
+def rss_mb() -> float:
+    """当前进程常驻内存（MB） | Current resident set size"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+
+@contextlib.contextmanager
+def concurrent_apptest():
+    """
+    允许多个 AppTest 在线程中并发运行
+
+    AppTest 每次 run() 都会设置、再清空进程全局的 Runtime._instance，并临时替换
+    config.get_option；并发时先结束的会话会清掉其它会话正在使用的 Runtime。
+    这里让 Runtime.instance / exists 在被清空时回退到最近一次的实例；
+    另外 AppTest 每次 run() 都新建 ScriptCache 重新编译脚本，并发 ast.parse 在
+    CPython 3.11 上不安全，这里与真实服务端一样在会话间共享编译结果。结束后恢复原状
+    """
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    original_get_option = config.get_option
+    original_instance, original_exists = Runtime.__dict__['instance'], Runtime.__dict__['exists']
+    original_bytecode = ScriptCache.__dict__['get_bytecode']
+    latest = [None]
+    compiled = {}
+    compile_lock = threading.Lock()
+
+    def get_bytecode(self, script_path):
+        with compile_lock:
+            code = compiled.get(script_path)
+            if code is None:
+                code = compiled[script_path] = original_bytecode(self, script_path)
+            return code
+
+    def instance(cls):
+        current = cls._instance
+        if current is not None:
+            latest[0] = current
+            return current
+        if latest[0] is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        return latest[0]
+
+    def exists(cls):
+        return cls._instance is not None or latest[0] is not None
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(exists)
+    ScriptCache.get_bytecode = get_bytecode
+    try:
+        yield
+    finally:
+        Runtime.instance = original_instance
+        Runtime.exists = original_exists
+        ScriptCache.get_bytecode = original_bytecode
+        config.get_option = original_get_option
+
+
+# ==================== 会话流程 | Session Flow ====================
+
+class Session:
+    """一个模拟订阅会话（AppTest 实例）与其重跑耗时 | One simulated session"""
+
+    def __init__(self, key: str, timeout: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.key = key
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.samples = []      # (step, 秒)
+        self.errors = 0
+        self.tab = None
+
+    def _run(self, step: str):
+        if self.tab is not None:
+            # AppTest 在控件交互后不保留标签页选中状态，每次重跑前重新设置
+            self.at.session_state[TAB_KEY] = self.tab
+        start = time.perf_counter()
+        self.at.run()
+        self.samples.append((step, time.perf_counter() - start))
+        if len(self.at.exception):
+            self.errors += 1
+
+    def open_tab(self, name: str):
+        self.tab = TABS[name]
+        self._run(f'tab:{name}')
+
+    def run_flow(self, iterations: int):
+        self._run('load')
+        if not any(t.key == 'access_key_input' for t in self.at.text_input):
+            return
+        self.at.text_input(key='access_key_input').input(self.key)
+        self.at.button[0].click()
+        self._run('unlock')
+
+        for i in range(iterations):
+            self.open_tab('chart')
+            if len(self.at.selectbox):
+                box = self.at.selectbox[0]
+                box.select_index((i + 1) % max(1, len(box.options)))
+                self._run('chart:symbol')
+
+            self.open_tab('backtest')
+            radios = [r for r in self.at.radio if r.key == 'equity_range']
+            if radios:
+                options = radios[0].options
+                radios[0].set_value(options[i % len(options)])
+                self._run('backtest:range')
+
+            self.open_tab('support')
+            self.open_tab('signals')
+
+
+# ==================== 压测 | Load Run ====================
+
+def _quantiles(seconds) -> dict:
+    ms = np.asarray(seconds, dtype=np.float64) * 1000.0
+    if len(ms) == 0:
+        return {'count': 0, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None}
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {'count': int(len(ms)), 'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99)}
+
+
+def run_load(sessions: int, iterations: int = 3, key: str = DEFAULT_KEY, timeout: float = 120) -> dict:
+    """
+    运行一轮并发压测
+
+    Args:
+        sessions: 并发会话数
+        iterations: 解锁后标签页流程的重复次数
+
+    Returns:
+        汇总 dict（吞吐、分位数、RSS、各步骤分位数、错误数）
+    """
+    rss_before = rss_mb()
+    barrier = threading.Barrier(sessions)
+    created = [Session(key, timeout) for _ in range(sessions)]
+
+    def drive(session: Session):
+        barrier.wait()
+        session.run_flow(iterations)
+
+    start = time.perf_counter()
+    with concurrent_apptest(), \
+            ThreadPoolExecutor(max_workers=sessions, thread_name_prefix='eigenflow-load') as pool:
+        for future in [pool.submit(drive, s) for s in created]:
+            future.result()
+    wall = time.perf_counter() - start
+    rss_after = rss_mb()     # 会话仍被引用，session_state 尚未释放
+
+    samples = [sample for s in created for sample in s.samples]
+    by_step = {}
+    for step, seconds in samples:
+        by_step.setdefault(step, []).append(seconds)
+
+    result = {
+        'sessions': sessions,
+        'iterations': iterations,
+        'reruns': len(samples),
+        'errors': sum(s.errors for s in created),
+        'wall_s': wall,
+        'throughput_rps': len(samples) / wall if wall > 0 else None,
+        'rss_mb': rss_after,
+        'rss_per_session_mb': max(0.0, rss_after - rss_before) / sessions,
+        'steps': {step: _quantiles(values) for step, values in sorted(by_step.items())},
+    }
+    result.update({k: v for k, v in _quantiles([s for _, s in samples]).items() if k != 'count'})
+    return result
+
+
+def warm_up(key: str = DEFAULT_KEY, timeout: float = 120):
+    """先跑一个会话，使模块导入与进程级缓存就绪，不计入结果"""
+    Session(key, timeout).run_flow(1)
+
+
+# ==================== 对比 | Baseline Comparison ====================
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    与基线对比
+
+    Returns:
+        [(会话数, 指标, 基线值, 当前值, 变化比例, 是否劣化)]
+    """
+    rows = []
+    for sessions, run in current['runs'].items():
+        base = baseline.get('runs', {}).get(sessions)
+        if base is None:
+            continue
+        for metric, higher_is_worse in COMPARED:
+            old, new = base.get(metric), run.get(metric)
+            if not old or new is None:
+                continue
+            change = new / old - 1.0
+            worse = change > threshold if higher_is_worse else change < -threshold
+            rows.append((sessions, metric, old, new, change, worse))
+    return rows
+
+
+def _print_run(run: dict):
+    print(f"\n[图表] {run['sessions']} 个并发会话：{run['reruns']} 次重跑 / {run['wall_s']:.1f}s，"
+          f"吞吐 {run['throughput_rps']:.2f} 次/秒，错误 {run['errors']}")
+    print(f"  重跑延迟 p50 {run['p50_ms']:.1f} ms · p95 {run['p95_ms']:.1f} ms · p99 {run['p99_ms']:.1f} ms")
+    print(f"  RSS {run['rss_mb']:.0f} MB，每会话 +{run['rss_per_session_mb']:.2f} MB")
+    for step, q in run['steps'].items():
+        print(f"    {step:<16} n={q['count']:<4} p50 {q['p50_ms']:8.1f}  p95 {q['p95_ms']:8.1f}  p99 {q['p99_ms']:8.1f} ms")
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Streamlit 多会话并发压测')
+    parser.add_argument('--sessions', default='1,4,8', help='并发会话数，逗号分隔')
+    parser.add_argument('--iterations', type=int, default=3, help='每个会话的标签页流程重复次数')
+    parser.add_argument('--key', default=DEFAULT_KEY, help='用于解锁的 Access Key')
+    parser.add_argument('--timeout', type=float, default=120, help='单次重跑超时（秒）')
+    parser.add_argument('--save', metavar='PATH', help='保存结果为基线')
+    parser.add_argument('--baseline', metavar='PATH', help='与已保存的基线对比')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='劣化阈值（比例）')
+    parser.add_argument('--spans', action='store_true', help='同时输出页面各区块耗时（core.timing）')
+    parser.add_argument('--telemetry', action='store_true', help='保留使用记录写入')
+    args = parser.parse_args()
+
+    if args.telemetry:
+        os.environ['EIGENFLOW_TELEMETRY'] = '1'
+    from core import timing
+
+    print("[火箭] 预热 ...")
+    warm_up(args.key, args.timeout)
+    timing.reset()
+    timing.enable(args.spans)
+
+    report = {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                    'cpus': os.cpu_count()},
+        'runs': {},
+    }
+    for n in [int(v) for v in args.sessions.split(',') if v.strip()]:
+        run = run_load(n, args.iterations, args.key, args.timeout)
+        report['runs'][str(n)] = run
+        _print_run(run)
+
+    if args.spans:
+        print("\n[图表] 页面区块耗时 | Spans (ms)")
+        for name, stats in timing.summary().items():
+            print(f"    {name:<20} n={stats['count']:<5} p50 {stats['p50_ms']:8.1f}  p95 {stats['p95_ms']:8.1f}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[成功] 结果已保存: {args.save}")
+
+    regressed = False
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\n[图表] 对比基线 {args.baseline}（{baseline.get('created', '?')}，阈值 {args.threshold:.0%}）")
+        rows = compare(report, baseline, args.threshold)
+        for sessions, metric, old, new, change, worse in rows:
+            flag = "[劣化]" if worse else "      "
+            print(f"  {flag} N={sessions:<3} {metric:<20} {old:10.2f} -> {new:10.2f} ({change:+.1%})")
+            regressed |= worse
+        if not rows:
+            print("[警告] 基线中没有相同会话数的结果，未做对比")
+        elif not regressed:
+            print("[成功] 未发现超过阈值的劣化")
+
+    sys.exit(1 if regressed else 0)
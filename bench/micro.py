@@ -0,0 +1,386 @@
+"""
+================================================================================
+EigenFlow Micro Benchmarks | 数据路径微基准
+
+对页面各构件做可重复的微基准，在合成数据上按多个规模运行（默认 10 / 1k / 5k / 50k 行）：
+    signals_csv:parse     经 core.loader 冷读取信号 CSV（读文件 + 内容哈希 + 解析）
+    signals_csv:cached    同一文件版本的缓存命中
+    codes:scalar          逐行 format_stock_code + get_tradingview_symbol（app_v3 的写法）
+    codes:vectorized      core.symbols.normalize_codes + exchanges_of 整列处理
+    master:enrich         证券主表补全名称 / 交易所 / 板块
+    equity:metrics        EquityMetrics 全量计算 + summary()
+    equity:figure         净值图构建（LTTB 降采样 + Plotly Figure），不经缓存
+    candles:figure        K 线图构建（均线 + 成交量子图），不经缓存
+    signal_list:html      信号清单 HTML 渲染
+
+每个规模先自动确定循环次数（单批不少于 MIN_BATCH 秒），重复 --repeat 批，
+记录单次调用耗时的中位数与最小值；结果追加到历史文件（JSON Lines，
+默认 bench/micro_history.jsonl，属本机数据，已列入 .gitignore）。
+基线：同一机器上最近一次 --pin 固定的结果；没有时取最近 BASELINE_WINDOW 次结果的逐项中位数。
+中位数劣化超过 --threshold 时标记并以退出码 1 结束，且该次结果不写入历史
+（确认属预期变化时加 --accept 写入，或 --pin 作为新基线），避免基线随劣化漂移
+
+用法：
+    python -m bench.micro
+    python -m bench.micro --sizes 10,1000 --filter codes --no-save
+    python -m bench.micro --pin          固定本次结果为本机基线
+================================================================================
+"""
+
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from core import loader
+from core.symbols import exchanges_of, normalize_codes, tradingview_symbol
+from core.security_master import SecurityMaster
+from backtest.metrics import EquityMetrics
+from ui.candles import build_candle_figure
+from ui.charts import equity_figure
+from ui.signal_list import render_signal_html
+
+
+# ==================== 常量 | Constants ====================
+
+SIZES = (10, 1000, 5000, 50000)
+HISTORY_PATH = os.path.join(BASE_DIR, 'bench', 'micro_history.jsonl')
+DEFAULT_THRESHOLD = 0.25     # 微基准噪声较大，默认 25%
+DEFAULT_REPEAT = 5
+BASELINE_WINDOW = 5          # 无固定基线时，取最近几次结果的中位数
+MIN_BATCH = 0.05             # 秒
+FACTORS = ('small', 'lowturn', 'lowvol', 'BL', 'MV', 'MS')
+CODE_PREFIXES = ('60', '68', '00', '30', '83', '92')
+
+
+# ==================== 合成数据 | Synthetic Data ====================
+
+def synthetic_codes(n: int) -> np.ndarray:
+    """n 个不重复的 6 位代码（沪 / 深 / 北交所各板块前缀轮流，最多 60k 个）"""
+    serial = np.arange(n)
+    prefixes = np.array(CODE_PREFIXES)[serial % len(CODE_PREFIXES)]
+    return np.array([f"{p}{s:04d}" for p, s in zip(prefixes, serial // len(CODE_PREFIXES))])
+
+
+def synthetic_signals(n: int, seed: int = 0) -> pd.DataFrame:
+    """与 trade_list_top10.csv 同列的信号表（symbol 为整数，与 CSV 读入后一致）"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({'symbol': synthetic_codes(n).astype(np.int64)})
+    for factor in FACTORS:
+        df[factor] = rng.normal(size=n)
+    df['score'] = np.sort(rng.normal(size=n))[::-1]
+    return df
+
+
+def synthetic_equity(n: int, seed: int = 0) -> pd.DataFrame:
+    """n 个交易日的 date,equity 表"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2000-01-03', periods=n)
+    return pd.DataFrame({'date': dates, 'equity': np.cumprod(1 + rng.normal(0.0004, 0.01, n))})
+
+
+def synthetic_bars(n: int, seed: int = 0) -> pd.DataFrame:
+    """n 根日线 date,OHLCV（与 PriceStore.history 输出同列）"""
+    rng = np.random.default_rng(seed)
+    close = 10 * np.cumprod(1 + rng.normal(0.0003, 0.02, n))
+    open_ = close * (1 + rng.normal(0, 0.005, n))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    return pd.DataFrame({
+        'date': pd.bdate_range('2000-01-03', periods=n),
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.integers(10_000, 5_000_000, n).astype(np.float64),
+    })
+
+
+# ==================== 基准定义 | Benchmarks ====================
+
+BENCHMARKS = {}      # name -> setup(n) -> 无参可调用对象
+
+
+def benchmark(name: str):
+    """注册一个基准：被装饰函数接收规模 n，返回待计时的无参函数"""
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+# 合成 CSV（最大规模约数 MB）放在临时目录，进程退出时随 TemporaryDirectory 一并删除
+_tmp = tempfile.TemporaryDirectory(prefix='eigenflow-bench-')
+_tmpdir = _tmp.name
+
+
+def _signals_file(n: int) -> str:
+    path = os.path.join(_tmpdir, f'signals_{n}.csv')
+    if not os.path.exists(path):
+        synthetic_signals(n).to_csv(path, index=False)
+    return path
+
+
+@benchmark('signals_csv:parse')
+def bench_signals_parse(n):
+    path = _signals_file(n)
+
+    def run():
+        loader.clear_cache()
+        return loader.read_csv(path)
+    return run
+
+
+@benchmark('signals_csv:cached')
+def bench_signals_cached(n):
+    path = _signals_file(n)
+    loader.read_csv(path)
+    return lambda: loader.read_csv(path)
+
+
+@benchmark('codes:scalar')
+def bench_codes_scalar(n):
+    column = synthetic_signals(n)['symbol']
+    # app_v3.format_stock_code / get_tradingview_symbol 的逐行写法
+    return lambda: [tradingview_symbol(str(code).strip().zfill(6)) for code in column]
+
+
+@benchmark('codes:vectorized')
+def bench_codes_vectorized(n):
+    column = synthetic_signals(n)['symbol']
+    return lambda: exchanges_of(normalize_codes(column))
+
+
+@benchmark('master:enrich')
+def bench_master_enrich(n):
+    codes = synthetic_codes(n)
+    master = SecurityMaster(pd.DataFrame({
+        'symbol': codes,
+        'name': [f"股票{i}" for i in range(n)],
+        'industry': '制造',
+        'list_date': '2010-01-01',
+    }))
+    signals = synthetic_signals(n)
+    return lambda: master.enrich(signals)
+
+
+@benchmark('equity:metrics')
+def bench_equity_metrics(n):
+    df = synthetic_equity(n)
+    return lambda: EquityMetrics.from_frame(df).summary()
+
+
+@benchmark('equity:figure')
+def bench_equity_figure(n):
+    df = synthetic_equity(n)
+    versions = itertools.count()
+    # 每次使用新的版本键，绕过图表缓存
+    return lambda: equity_figure(df, ('bench', n, next(versions)))
+
+
+@benchmark('candles:figure')
+def bench_candles_figure(n):
+    bars = synthetic_bars(n)
+    return lambda: build_candle_figure(bars, title='bench')
+
+
+@benchmark('signal_list:html')
+def bench_signal_list(n):
+    df = synthetic_signals(n)
+    symbols = normalize_codes(df['symbol'])
+    names = [f"股票{i}" for i in range(n)]
+    scores = df['score'].to_numpy()
+    return lambda: render_signal_html(symbols, names, scores)
+
+
+# ==================== 计时 | Measurement ====================
+
+def measure(func, repeat: int = DEFAULT_REPEAT, min_batch: float = MIN_BATCH) -> dict:
+    """
+    计时一个无参函数
+
+    Returns:
+        {median_us, min_us, loops, repeat}：单次调用耗时（微秒）
+    """
+    func()   # 预热
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_batch or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_batch / 10 else 2
+    batches = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        batches.append((time.perf_counter() - start) / loops)
+    per_call = np.array(batches) * 1e6
+    return {'median_us': float(np.median(per_call)), 'min_us': float(per_call.min()),
+            'loops': loops, 'repeat': repeat}
+
+
+def run_all(sizes=SIZES, name_filter: str = None, repeat: int = DEFAULT_REPEAT) -> dict:
+    """运行全部（或名称包含 name_filter 的）基准，返回 'name@size' -> 结果"""
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        for n in sizes:
+            results[f"{name}@{n}"] = measure(setup(n), repeat)
+            _print_result(f"{name}@{n}", results[f"{name}@{n}"])
+    return results
+
+
+# ==================== 历史与对比 | History ====================
+
+def machine() -> dict:
+    """机器指纹（只与同一指纹的历史结果对比）"""
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(), 'cpus': os.cpu_count()}
+
+
+def git_revision():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def load_history(path: str = HISTORY_PATH) -> list:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def pinned_run(history: list, fingerprint: dict):
+    """同一机器上最近一次固定（--pin）的结果 | Latest pinned run on this machine"""
+    for entry in reversed(history):
+        if entry.get('machine') == fingerprint and entry.get('pinned'):
+            return entry
+    return None
+
+
+def rolling_baseline(history: list, fingerprint: dict, window: int = BASELINE_WINDOW):
+    """
+    同一机器上最近 window 次结果的逐项中位数
+
+    单次偏慢的运行不会成为基线；历史中只保存未劣化或经 --accept 确认的结果
+    """
+    runs = [e for e in history if e.get('machine') == fingerprint][-window:]
+    if not runs:
+        return None
+    keys = {key for run in runs for key in run.get('results', {})}
+    results = {}
+    for key in keys:
+        values = [run['results'][key]['median_us'] for run in runs if key in run.get('results', {})]
+        results[key] = {'median_us': float(np.median(values))}
+    return {'created': f"{runs[0].get('created', '?')} ~ {runs[-1].get('created', '?')}",
+            'revision': f"最近 {len(runs)} 次中位数", 'results': results}
+
+
+def default_baseline(history: list, fingerprint: dict):
+    """固定基线优先，否则为最近几次结果的中位数"""
+    return pinned_run(history, fingerprint) or rolling_baseline(history, fingerprint)
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    与基线的中位数对比
+
+    Returns:
+        [(基准@规模, 基线微秒, 当前微秒, 变化比例, 是否劣化)]
+    """
+    rows = []
+    for key, current in results.items():
+        base = baseline.get('results', {}).get(key)
+        if base is None:
+            continue
+        change = current['median_us'] / base['median_us'] - 1.0
+        rows.append((key, base['median_us'], current['median_us'], change, change > threshold))
+    return rows
+
+
+def _format_us(us: float) -> str:
+    if us >= 1000:
+        return f"{us / 1000:9.2f} ms"
+    return f"{us:9.2f} us"
+
+
+def _print_result(key: str, result: dict):
+    print(f"  {key:<28} median {_format_us(result['median_us'])}   "
+          f"min {_format_us(result['min_us'])}   ×{result['loops']}")
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='数据路径微基准')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in SIZES), help='规模，逗号分隔')
+    parser.add_argument('--filter', default=None, help='只运行名称包含该字符串的基准')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='劣化阈值（比例）')
+    parser.add_argument('--history', default=HISTORY_PATH, help='历史结果文件（JSON Lines）')
+    parser.add_argument('--baseline', default=None,
+                        help='指定基线文件（取其最后一条），默认同机固定基线或最近几次的中位数')
+    parser.add_argument('--no-save', action='store_true', help='不写入历史')
+    parser.add_argument('--accept', action='store_true', help='即使劣化也写入历史（确认为预期变化）')
+    parser.add_argument('--pin', action='store_true', help='写入历史并固定为本机基线（隐含 --accept）')
+    args = parser.parse_args()
+
+    print("[图表] 微基准 | Micro Benchmarks")
+    results = run_all([int(v) for v in args.sizes.split(',') if v.strip()], args.filter, args.repeat)
+
+    fingerprint = machine()
+    if args.baseline:
+        baseline_entries = load_history(args.baseline)
+        baseline = baseline_entries[-1] if baseline_entries else None
+    else:
+        baseline = default_baseline(load_history(args.history), fingerprint)
+
+    regressed = False
+    if baseline is None:
+        print("\n[提示] 没有可对比的历史结果（首次运行或更换了机器）")
+    else:
+        print(f"\n[图表] 对比 {baseline.get('created', '?')}（{baseline.get('revision') or '?'}），"
+              f"阈值 {args.threshold:.0%}")
+        rows = compare(results, baseline, args.threshold)
+        for key, old, new, change, worse in rows:
+            flag = "[劣化]" if worse else "      "
+            print(f"  {flag} {key:<28} {_format_us(old)} -> {_format_us(new)} ({change:+.1%})")
+            regressed |= worse
+        if not rows:
+            print("[警告] 基线中没有相同基准与规模的结果，未做对比")
+        elif not regressed:
+            print("[成功] 未发现超过阈值的劣化")
+
+    save = not args.no_save
+    if save and regressed and not (args.accept or args.pin):
+        save = False
+        print(f"\n[警告] 存在劣化，结果未写入 {args.history}（确认为预期变化时加 --accept 或 --pin）")
+    if save:
+        entry = {'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'revision': git_revision(),
+                 'machine': fingerprint, 'results': results}
+        if args.pin:
+            entry['pinned'] = True
+        with open(args.history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        print(f"\n[成功] 结果已追加到 {args.history}{'（已固定为基线）' if args.pin else ''}")
+
+    sys.exit(1 if regressed else 0)
@@ -0,0 +1,258 @@
+"""
+================================================================================
+EigenFlow Access | 访问密钥
+
+Streamlit 页面与只读 API 共用的 Access Key 校验：
+- 密钥来源：keys.json（{"keys": {key: {"name", "days", "issued", "expires"}}}）
+  或 SQLite 表 access_keys（同名列）；环境变量 EIGENFLOW_KEYS 可指定其他路径，
+  后缀为 .db / .sqlite / .sqlite3 时按 SQLite 读取
+- 有效期：expires（最后有效日，含当日）优先；否则 issued + days；两者都没有则长期有效；
+  只有 days 而缺少 issued 的条目无法确定起始日，加载时拒绝并告警
+- 密钥以 blake2b 摘要为字典键，校验为 O(1)，内存中不保留明文；
+  密钥文件中也可直接写摘要（"blake2b:<hex>"，见 --hash）
+- 到期索引按到期日排序，过期密钥按批清除（sweep），不逐个扫描全表
+- 经 core.loader 按文件版本缓存：密钥文件变化后下一次校验自动重载，无需重启
+
+命令行：
+    python -m core.access --hash EF-XXXX-XXXX        输出可写入密钥文件的摘要
+    python -m core.access --check EF-XXXX-XXXX       校验并显示名称与到期日
+    python -m core.access --to-sqlite keys.db        把 keys.json 导入 SQLite
+================================================================================
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from collections import namedtuple
+from datetime import date, timedelta
+
+from core import loader
+
+
+# ==================== 常量 | Constants ====================
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KEYS_PATH = os.environ.get('EIGENFLOW_KEYS', os.path.join(BASE_DIR, 'keys.json'))
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+HASH_PREFIX = 'blake2b:'
+RELOAD_INTERVAL = 1.0    # 秒，两次检查密钥文件版本的最小间隔
+
+_MISSING = object()
+
+KeyRecord = namedtuple('KeyRecord', ['name', 'expires'])   # expires: 失效日序数（当日起无效），None 为长期
+
+
+def hash_key(key: str) -> bytes:
+    """密钥摘要（字典键） | Digest used as the lookup key"""
+    return hashlib.blake2b(key.strip().encode('utf-8'), digest_size=16).digest()
+
+
+def _digest_of(key: str) -> bytes:
+    """密钥文件中的键：明文或 blake2b:<hex> 摘要"""
+    key = key.strip()
+    if key.startswith(HASH_PREFIX):
+        return bytes.fromhex(key[len(HASH_PREFIX):])
+    return hash_key(key)
+
+
+def _expiry_of(spec: dict):
+    """
+    条目 -> 失效日序数（None 为长期有效）
+
+    Raises:
+        ValueError: 日期格式错误，或有 days 而无 issued
+    """
+    expires = spec.get('expires')
+    if expires:
+        return date.fromisoformat(str(expires)[:10]).toordinal() + 1
+    issued, days = spec.get('issued'), spec.get('days')
+    if days is not None and not issued:
+        raise ValueError("'days' without 'issued' has no start date")
+    if issued and days is not None:
+        return (date.fromisoformat(str(issued)[:10]) + timedelta(days=int(days))).toordinal()
+    return None
+
+
+# ==================== 密钥库 | Key Store ====================
+
+class KeyStore:
+    """
+    摘要索引的密钥库 | Hash-indexed key store with an expiry index
+
+    Args:
+        entries: 可迭代的 (key 或 blake2b:<hex>, spec dict)；
+            有效期无法解析的条目被拒绝（不可用）并发出告警
+    """
+
+    def __init__(self, entries=()):
+        self._keys = {}
+        self._expiring = {}      # 失效日序数 -> [摘要]
+        expiry_memo = {}         # (issued, days, expires) -> 失效日序数，同批密钥通常共用少数几个日期
+        for key, spec in entries:
+            digest = _digest_of(key)
+            terms = (spec.get('issued'), spec.get('days'), spec.get('expires'))
+            expires = expiry_memo.get(terms, _MISSING)
+            if expires is _MISSING:
+                try:
+                    expires = expiry_memo[terms] = _expiry_of(spec)
+                except ValueError as exc:
+                    name = spec.get('name') or digest.hex()[:8]
+                    warnings.warn(f"access key {name!r} rejected: {exc}", stacklevel=2)
+                    continue
+            self._keys[digest] = KeyRecord(str(spec.get('name') or ''), expires)
+            if expires is not None:
+                self._expiring.setdefault(expires, []).append(digest)
+        self._expiry_days = sorted(self._expiring)
+        self._swept = 0          # _expiry_days[:_swept] 已清除
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key: str):
+        return self.lookup(key) is not None
+
+    def sweep(self, today: date = None) -> int:
+        """
+        批量清除已过期密钥
+
+        到期索引按失效日分组并排序，只处理从上次清除位置到今天之间的几组
+        """
+        day = (today or date.today()).toordinal()
+        removed = 0
+        with self._lock:
+            end = bisect.bisect_right(self._expiry_days, day, self._swept)
+            for expires in self._expiry_days[self._swept:end]:
+                for digest in self._expiring.pop(expires):
+                    # 重复出现的密钥以最后一条为准，可能已不在此组
+                    record = self._keys.get(digest)
+                    if record is not None and record.expires == expires:
+                        del self._keys[digest]
+                        removed += 1
+            self._swept = end
+        return removed
+
+    def lookup(self, key: str, today: date = None):
+        """
+        校验密钥
+
+        Returns:
+            KeyRecord；无效或已过期时为 None
+        """
+        if not key or not key.strip():
+            return None
+        record = self._keys.get(hash_key(key))
+        if record is None:
+            return None
+        if record.expires is not None and record.expires <= (today or date.today()).toordinal():
+            self.sweep(today)
+            return None
+        return record
+
+    def expires_on(self, key: str):
+        """最后有效日（长期有效为 None）"""
+        record = self._keys.get(hash_key(key))
+        if record is None or record.expires is None:
+            return None
+        return date.fromordinal(record.expires - 1)
+
+
+# ==================== 加载 | Loading ====================
+
+def parse_json(data: bytes) -> KeyStore:
+    """keys.json 字节 -> KeyStore"""
+    keys = json.loads(data.decode('utf-8')).get('keys', {})
+    return KeyStore(keys.items())
+
+
+def read_sqlite(path: str) -> KeyStore:
+    """SQLite access_keys 表 -> KeyStore（只读打开）"""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute("SELECT * FROM access_keys").fetchall()
+    finally:
+        conn.close()
+    return KeyStore((row['key'], dict(row)) for row in rows)
+
+
+_current = {'store': None, 'checked': 0.0, 'path': None}
+_current_lock = threading.Lock()
+
+
+def load_keys(path: str = None) -> KeyStore:
+    """
+    当前密钥库（按文件版本缓存，文件变化后自动重载）
+
+    两次版本检查间隔至少 RELOAD_INTERVAL 秒；文件不存在时为空库
+    """
+    path = path or KEYS_PATH
+    now = time.monotonic()
+    current = _current
+    if current['path'] == path and now - current['checked'] < RELOAD_INTERVAL:
+        return current['store']
+
+    with _current_lock:
+        if not os.path.exists(path):
+            store = KeyStore()
+        elif path.endswith(SQLITE_SUFFIXES):
+            store, _ = loader.load_cached(path, lambda data: read_sqlite(path), 'access_keys')
+        else:
+            store, _ = loader.load_cached(path, parse_json, 'access_keys')
+        _current.update(store=store, checked=now, path=path)
+    return store
+
+
+def validate_access_key(key: str) -> bool:
+    """验证 Access Key"""
+    return load_keys().lookup(key) is not None
+
+
+# ==================== 导出 | Export ====================
+
+def write_sqlite(json_path: str, db_path: str) -> int:
+    """把 keys.json 导入 SQLite access_keys 表（替换原表），返回条数"""
+    with open(json_path, 'rb') as f:
+        keys = json.loads(f.read().decode('utf-8')).get('keys', {})
+    rows = [(k, spec.get('name'), spec.get('issued'), spec.get('days'), spec.get('expires'))
+            for k, spec in keys.items()]
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS access_keys")
+            conn.execute("CREATE TABLE access_keys (key TEXT PRIMARY KEY, name TEXT, "
+                         "issued TEXT, days INTEGER, expires TEXT)")
+            conn.executemany("INSERT INTO access_keys VALUES (?, ?, ?, ?, ?)", rows)
+    finally:
+        conn.close()
+    return len(rows)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Access Key 工具')
+    parser.add_argument('--keys', default=None, help='密钥文件，默认 keys.json 或 $EIGENFLOW_KEYS')
+    parser.add_argument('--hash', metavar='KEY', help='输出密钥摘要')
+    parser.add_argument('--check', metavar='KEY', help='校验密钥')
+    parser.add_argument('--to-sqlite', metavar='DB', help='把 JSON 密钥文件导入 SQLite')
+    args = parser.parse_args()
+
+    if args.hash:
+        print(HASH_PREFIX + hash_key(args.hash).hex())
+    if args.check:
+        store = load_keys(args.keys)
+        record = store.lookup(args.check)
+        if record is None:
+            print("[错误] 无效或已过期")
+        else:
+            until = store.expires_on(args.check)
+            print(f"[成功] {record.name or '—'}，有效期至 {until or '长期'}")
+    if args.to_sqlite:
+        count = write_sqlite(args.keys or KEYS_PATH, args.to_sqlite)
+        print(f"[成功] 已导入 {count} 个密钥到 {args.to_sqlite}")
@@ -0,0 +1,212 @@
+"""
+================================================================================
+EigenFlow Signal Archive | 历史信号归档
+
+按交易日分区保存每日信号清单：
+- 每日一个分区文件 signal_archive/<YYYY>/<YYYY-MM-DD>.csv，原子写入
+- index.csv 为仅追加的日期索引（date,rows,file），同日重复写入以最后一条为准
+- 区间读取先在有序日期索引上二分，只打开区间内的分区，不扫描目录；
+  分区不进入 core.loader 的进程级缓存（该缓存不淘汰）：单日读取使用有上限的
+  最近分区缓存，区间读取直接读文件，API 按任意日期访问时内存不会无限增长
+- 可选传入交易日历（core.trading_calendar）：写入时拒绝非交易日，并可列出缺失的交易日
+================================================================================
+"""
+
+import bisect
+import io
+import os
+import threading
+from datetime import date, datetime
+
+import pandas as pd
+
+from core import loader
+from core.trading_calendar import load_calendar
+
+
+# ==================== 常量 | Constants ====================
+
+INDEX_FILE = 'index.csv'
+INDEX_HEADER = 'date,rows,file\n'
+MAX_CACHED_DAYS = 64         # 单日分区缓存上限（超出时整体清空）
+
+
+def normalize_date(value) -> str:
+    """统一为 YYYY-MM-DD | Normalize str/date/datetime/Timestamp"""
+    if isinstance(value, str) and len(value) == 10 and value[4] == '-' and value[7] == '-':
+        return value
+    if isinstance(value, (date, datetime)):
+        return value.strftime('%Y-%m-%d')
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+def _parse_index(data: bytes):
+    """解析索引为 (有序日期列表, 日期 -> (rows, file))"""
+    entries = {}
+    for line in io.StringIO(data.decode('utf-8')):
+        line = line.strip()
+        if not line or line == INDEX_HEADER.strip():
+            continue
+        day, rows, rel = line.split(',', 2)
+        entries[day] = (int(rows), rel)
+    return sorted(entries), entries
+
+
+_days = {}                   # (路径, mtime_ns, size) -> DataFrame
+_days_lock = threading.Lock()
+
+
+def _read_partition(path: str) -> pd.DataFrame:
+    """读取单日分区（按 stat 缓存最近 MAX_CACHED_DAYS 个；分区以 os.replace 原子替换）"""
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _days_lock:
+        df = _days.get(key)
+    if df is not None:
+        return df
+    df = pd.read_csv(path, dtype={'symbol': str})
+    with _days_lock:
+        if len(_days) >= MAX_CACHED_DAYS:
+            _days.clear()
+        _days[key] = df
+    return df
+
+
+# ==================== 归档 | Archive ====================
+
+class SignalArchive:
+    """按日期分区的信号归档 | Date-partitioned signal archive"""
+
+    def __init__(self, root: str, calendar=None):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self.calendar = calendar
+
+    # ---------- 写入 | Write ----------
+
+    def append(self, day, df: pd.DataFrame, top_n: int = None) -> str:
+        """
+        写入某交易日的信号清单
+
+        Args:
+            day: 交易日
+            df: 信号 DataFrame（需含 symbol）
+            top_n: 仅保留前 n 行，默认全部
+
+        Returns:
+            分区文件路径
+        """
+        if 'symbol' not in df.columns:
+            raise ValueError("signal frame must contain a 'symbol' column")
+
+        day = normalize_date(day)
+        if self.calendar is not None and not self.calendar.is_trading_day(day):
+            raise ValueError(f"{day} is not a trading day")
+        frame = df.head(top_n) if top_n else df
+        frame = frame.assign(symbol=frame['symbol'].astype(str).str.strip().str.zfill(6))
+
+        rel = os.path.join(day[:4], day + '.csv')
+        path = os.path.join(self.root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        frame.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+
+        new_index = not os.path.exists(self.index_path)
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            if new_index:
+                f.write(INDEX_HEADER)
+            f.write(f"{day},{len(frame)},{rel.replace(os.sep, '/')}\n")
+        return path
+
+    def ingest_csv(self, csv_path: str, day, top_n: int = None) -> str:
+        """导入每日 CSV | Ingest one day's trade_list csv"""
+        return self.append(day, pd.read_csv(csv_path, dtype={'symbol': str}), top_n=top_n)
+
+    # ---------- 索引 | Index ----------
+
+    def _index(self):
+        if not os.path.exists(self.index_path):
+            return [], {}
+        index, _ = loader.load_cached(self.index_path, _parse_index, 'archive_index')
+        return index
+
+    def dates(self, start=None, end=None) -> list:
+        """返回区间内（闭区间）的归档日期 | Archived dates within [start, end]"""
+        days, _ = self._index()
+        lo = bisect.bisect_left(days, normalize_date(start)) if start is not None else 0
+        hi = bisect.bisect_right(days, normalize_date(end)) if end is not None else len(days)
+        return days[lo:hi]
+
+    def latest(self):
+        """最近一个归档日期，无归档时为 None"""
+        days, _ = self._index()
+        return days[-1] if days else None
+
+    def __contains__(self, day):
+        _, entries = self._index()
+        return normalize_date(day) in entries
+
+    def missing_days(self, start=None, end=None) -> list:
+        """
+        区间内没有归档的交易日（需要交易日历）
+
+        默认区间为首个归档日至最近归档日
+        """
+        if self.calendar is None:
+            raise ValueError("missing_days needs a trading calendar")
+        days, entries = self._index()
+        start = start if start is not None else (days[0] if days else None)
+        end = end if end is not None else (days[-1] if days else None)
+        if start is None:
+            return []
+        expected = self.calendar.trading_days(normalize_date(start), normalize_date(end))
+        return [d for d in expected.astype(str).tolist() if d not in entries]
+
+    # ---------- 读取 | Read ----------
+
+    def load(self, day) -> pd.DataFrame:
+        """读取某日清单（只读，缓存最近 MAX_CACHED_DAYS 个分区） | Load one day"""
+        day = normalize_date(day)
+        _, entries = self._index()
+        if day not in entries:
+            raise KeyError(day)
+        return _read_partition(os.path.join(self.root, entries[day][1]))
+
+    def load_range(self, start=None, end=None) -> pd.DataFrame:
+        """
+        读取区间内所有交易日清单，附加 date 与 rank 列
+
+        分区不经 core.loader 缓存：该缓存不淘汰，长区间读取会让所有分区常驻进程内存
+
+        例: archive.load_range('2025-01-01', '2025-12-31')
+        """
+        _, entries = self._index()
+        frames = []
+        for day in self.dates(start, end):
+            frame = pd.read_csv(os.path.join(self.root, entries[day][1]), dtype={'symbol': str})
+            frames.append(frame.assign(date=day, rank=range(1, len(frame) + 1)))
+        if not frames:
+            return pd.DataFrame(columns=['date', 'rank', 'symbol'])
+        return pd.concat(frames, ignore_index=True)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='归档每日信号清单')
+    parser.add_argument('csv_path')
+    parser.add_argument('--root', default='signal_archive')
+    parser.add_argument('--date', default=None, help='交易日，默认今天')
+    parser.add_argument('--top', type=int, default=None, help='仅保留前 N 行')
+    parser.add_argument('--holidays', default='holidays.csv', help='节假日文件（校验交易日）')
+    args = parser.parse_args()
+
+    calendar = load_calendar(args.holidays)
+    day = args.date or calendar.previous_trading_day(date.today(), inclusive=True).astype(str)
+    archive = SignalArchive(args.root, calendar)
+    out = archive.ingest_csv(args.csv_path, day, top_n=args.top)
+    print(f"[成功] 已归档 {out}")
+    gaps = archive.missing_days()
+    if gaps:
+        print(f"[提示] 缺失 {len(gaps)} 个交易日: {', '.join(gaps[:10])}{' ...' if len(gaps) > 10 else ''}")
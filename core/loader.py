@@ -0,0 +1,180 @@
+"""
+================================================================================
+EigenFlow Loader | 共享数据加载层
+
+按 (路径, mtime, size, 内容哈希) 对文件版本做进程级缓存：
+- 同一文件版本在进程内只解析一次，所有 Streamlit 会话共享同一个 DataFrame
+- 文件在磁盘上变化后自动失效（stat 变化时再比对内容哈希）
+- 记录命中 / 未命中次数，便于在高并发下观察缓存效果
+
+注意：返回的 DataFrame 在会话间共享，调用方只能读取；
+需要修改时请先 .copy()（或 head()/切片后再改，pandas CoW 会自动复制）
+================================================================================
+"""
+
+import hashlib
+import io
+import os
+import threading
+from collections import namedtuple
+
+import pandas as pd
+
+
+# ==================== 兼容 | pandas Compatibility ====================
+
+# 同一列内日期格式不一致时逐个解析：pandas 2.0 起需显式 format='mixed'，
+# 更早版本不识别该参数（默认即逐个推断）。用法：pd.to_datetime(s, **MIXED_DATES)
+MIXED_DATES = {'format': 'mixed'} if int(pd.__version__.split('.')[0]) >= 2 else {}
+
+
+# ==================== 版本标识 | File Version ====================
+
+FileVersion = namedtuple('FileVersion', ['path', 'mtime_ns', 'size', 'digest'])
+
+
+class _Entry:
+    """单个缓存条目 | One cached (path, parser) slot"""
+
+    __slots__ = ('stat_key', 'version', 'value')
+
+    def __init__(self, stat_key, version, value):
+        self.stat_key = stat_key
+        self.version = version
+        self.value = value
+
+
+# ==================== 缓存状态 | Cache State ====================
+
+_entries = {}            # (abspath, parser_key) -> _Entry
+_versions = {}           # abspath -> (stat_key, FileVersion)
+_path_locks = {}         # abspath -> Lock，保证同一文件只被一个线程解析
+_registry_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def _lock_for(path: str) -> threading.Lock:
+    with _registry_lock:
+        lock = _path_locks.get(path)
+        if lock is None:
+            lock = _path_locks[path] = threading.Lock()
+        return lock
+
+
+def _count(name: str):
+    with _registry_lock:
+        _stats[name] += 1
+
+
+def _stat_key(path: str):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_version(path: str, stat_key):
+    """读取文件内容并计算版本 | Read bytes and build FileVersion"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    return data, FileVersion(path, stat_key[0], stat_key[1], digest)
+
+
+# ==================== 公共接口 | Public API ====================
+
+def file_version(path: str) -> FileVersion:
+    """
+    返回文件当前版本（stat 未变时不重新读取内容）
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        FileVersion，可作为下游缓存（指标、图表、HTML）的键
+    """
+    path = os.path.abspath(path)
+    stat_key = _stat_key(path)
+    with _lock_for(path):
+        cached = _versions.get(path)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+        _, version = _read_version(path, stat_key)
+        _versions[path] = (stat_key, version)
+        return version
+
+
+def load_cached(path: str, parser, parser_key: str = None):
+    """
+    按文件版本缓存解析结果
+
+    Args:
+        path: 文件路径
+        parser: bytes -> 解析结果 的函数
+        parser_key: 区分同一文件的不同解析方式，默认使用 parser 的限定名
+
+    Returns:
+        (value, FileVersion)
+    """
+    path = os.path.abspath(path)
+    key = (path, parser_key or getattr(parser, '__qualname__', repr(parser)))
+    stat_key = _stat_key(path)
+
+    with _lock_for(path):
+        entry = _entries.get(key)
+        if entry is not None and entry.stat_key == stat_key:
+            _count('hits')
+            return entry.value, entry.version
+
+        data, version = _read_version(path, stat_key)
+        _versions[path] = (stat_key, version)
+
+        # 仅 touch 而内容未变：沿用已解析的对象
+        if entry is not None and entry.version.digest == version.digest:
+            entry.stat_key = stat_key
+            entry.version = version
+            _count('hits')
+            return entry.value, version
+
+        if entry is not None:
+            _count('invalidations')
+        _count('misses')
+        value = parser(data)
+        _entries[key] = _Entry(stat_key, version, value)
+        return value, version
+
+
+def read_csv(path: str, **kwargs) -> pd.DataFrame:
+    """
+    带版本缓存的 pd.read_csv | Version-cached pd.read_csv
+
+    kwargs 会原样传给 pd.read_csv，并参与缓存键
+    """
+    frame, _ = read_csv_versioned(path, **kwargs)
+    return frame
+
+
+def read_csv_versioned(path: str, **kwargs):
+    """同 read_csv，额外返回 FileVersion | Same as read_csv, plus its version"""
+    def parse(data):
+        return pd.read_csv(io.BytesIO(data), **kwargs)
+
+    parser_key = 'read_csv:' + repr(sorted(kwargs.items()))
+    return load_cached(path, parse, parser_key)
+
+
+def cache_stats() -> dict:
+    """返回命中统计 | Return hit/miss counters"""
+    with _registry_lock:
+        stats = dict(_stats)
+        stats['entries'] = len(_entries)
+    total = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / total if total else 0.0
+    return stats
+
+
+def clear_cache():
+    """清空缓存与计数 | Drop all entries and reset counters"""
+    with _registry_lock:
+        _entries.clear()
+        _versions.clear()
+        for k in _stats:
+            _stats[k] = 0
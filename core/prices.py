@@ -0,0 +1,238 @@
+"""
+================================================================================
+EigenFlow Price Store | 本地日线行情存储
+
+全市场日线 OHLCV 的内存映射存储：
+- 每个字段一个 (股票数 × 交易日数) 的 float32 .npy，按股票行连续存放，
+  单只股票任意区间的切片是一段连续内存
+- 代码 -> 行号为字典查找；日期 -> 列号通过“自然日 -> 交易日”偏移表，均为 O(1)
+- float32 存储：全市场 5,300 只 × 10 年约 270MB（五个字段），可整体常驻页缓存
+- 与信号存储相同的版本目录 + CURRENT 指针，重建时原子切换
+
+目录结构:
+    price_store/
+        CURRENT
+        v<时间戳>/
+            meta.json
+            dates.npy        datetime64[D] 交易日
+            symbols.npy      6 位代码
+            day_index.npy    自然日偏移 -> 首个 >= 该日的交易日行号
+            open.npy high.npy low.npy close.npy volume.npy
+================================================================================
+"""
+
+import glob
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.loader import MIXED_DATES
+from core.signal_store import CURRENT_FILE, META_FILE, current_version_dir
+
+
+# ==================== 常量 | Constants ====================
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+# 常见行情导出格式的列名映射（tushare / akshare / 通达信导出等）
+COLUMN_ALIASES = {
+    'trade_date': 'date', '日期': 'date', '交易日期': 'date',
+    'ts_code': 'symbol', 'code': 'symbol', '股票代码': 'symbol', '代码': 'symbol',
+    '开盘': 'open', '最高': 'high', '最低': 'low', '收盘': 'close',
+    'vol': 'volume', '成交量': 'volume',
+}
+
+
+# ==================== 导入 | Ingestion ====================
+
+def normalize_frame(df: pd.DataFrame, symbol: str = None) -> pd.DataFrame:
+    """
+    统一列名与代码格式，返回 date,symbol + OHLCV 长表
+
+    Args:
+        df: 原始导出数据
+        symbol: 文件内无代码列时使用（如按股票拆分的导出文件）
+    """
+    df = df.rename(columns={c: COLUMN_ALIASES.get(c, c) for c in df.columns})
+    if 'symbol' not in df.columns:
+        if symbol is None:
+            raise ValueError("price frame needs a symbol column or an explicit symbol")
+        df = df.assign(symbol=symbol)
+    # 600519.SH / sh600519 -> 600519
+    codes = df['symbol'].astype(str).str.extract(r'(\d{1,6})', expand=False).str.zfill(6)
+    dates = pd.to_datetime(df['date'].astype(str), **MIXED_DATES)
+    out = pd.DataFrame({'date': dates.values.astype('datetime64[D]'), 'symbol': codes.values})
+    for field in FIELDS:
+        out[field] = pd.to_numeric(df[field], errors='coerce') if field in df.columns else np.nan
+    return out.dropna(subset=['symbol'])
+
+
+def read_dumps(paths) -> pd.DataFrame:
+    """读取一批 CSV 导出（文件内无代码列时以文件名为代码）"""
+    frames = []
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        frames.append(normalize_frame(pd.read_csv(path, dtype={'symbol': str, 'ts_code': str, 'code': str}),
+                                      symbol=stem))
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_store(long_df: pd.DataFrame, root: str) -> str:
+    """
+    由 date,symbol,OHLCV 长表构建新版本并切换 CURRENT
+
+    同一 (date, symbol) 重复出现时保留最后一条
+    """
+    long_df = long_df.drop_duplicates(['date', 'symbol'], keep='last')
+    dates = np.unique(long_df['date'].to_numpy().astype('datetime64[D]'))
+    symbols = np.unique(long_df['symbol'].to_numpy().astype('U6'))
+    rows = np.searchsorted(symbols, long_df['symbol'].to_numpy().astype('U6'))
+    cols = np.searchsorted(dates, long_df['date'].to_numpy().astype('datetime64[D]'))
+
+    version = 'v%d' % time.time_ns()
+    version_dir = os.path.join(root, version)
+    os.makedirs(version_dir)
+
+    for field in FIELDS:
+        arr = np.full((len(symbols), len(dates)), np.nan, dtype=np.float32)
+        arr[rows, cols] = long_df[field].to_numpy(dtype=np.float32)
+        np.save(os.path.join(version_dir, field + '.npy'), arr)
+
+    # 自然日 -> 首个不早于该日的交易日行号
+    span = np.arange(dates[0], dates[-1] + 1, dtype='datetime64[D]')
+    day_index = np.searchsorted(dates, span).astype(np.int32)
+
+    np.save(os.path.join(version_dir, 'dates.npy'), dates)
+    np.save(os.path.join(version_dir, 'symbols.npy'), symbols)
+    np.save(os.path.join(version_dir, 'day_index.npy'), day_index)
+
+    meta = {
+        'symbols': int(len(symbols)),
+        'dates': int(len(dates)),
+        'start': str(dates[0]),
+        'end': str(dates[-1]),
+        'fields': list(FIELDS),
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    with open(os.path.join(version_dir, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    tmp = os.path.join(root, CURRENT_FILE + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(root, CURRENT_FILE))
+    return version_dir
+
+
+# ==================== 读取 | Read ====================
+
+class PriceStore:
+    """只读的内存映射日线存储 | Read-only memory-mapped OHLCV store"""
+
+    def __init__(self, version_dir: str):
+        self.version_dir = version_dir
+        with open(os.path.join(version_dir, META_FILE), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.dates = np.load(os.path.join(version_dir, 'dates.npy'))
+        self.symbols = np.load(os.path.join(version_dir, 'symbols.npy'))
+        self._day_index = np.load(os.path.join(version_dir, 'day_index.npy'))
+        self._row = {s: i for i, s in enumerate(self.symbols.tolist())}
+        self._fields = {}
+
+    @classmethod
+    def open(cls, root: str) -> 'PriceStore':
+        """打开当前版本 | Open the active version"""
+        return cls(current_version_dir(root))
+
+    def __contains__(self, symbol):
+        return str(symbol).zfill(6) in self._row
+
+    def field(self, name: str) -> np.ndarray:
+        """(股票 × 交易日) 字段的只读内存映射 | Zero-copy field matrix"""
+        arr = self._fields.get(name)
+        if arr is None:
+            if name not in FIELDS:
+                raise KeyError(name)
+            arr = np.load(os.path.join(self.version_dir, name + '.npy'), mmap_mode='r')
+            self._fields[name] = arr
+        return arr
+
+    def row_of(self, symbol) -> int:
+        """代码 -> 行号（O(1)），不存在抛 KeyError"""
+        return self._row[str(symbol).zfill(6)]
+
+    def date_slice(self, start=None, end=None) -> slice:
+        """
+        日期区间（闭区间）-> 交易日列切片，O(1)
+
+        区间超出存储范围时自动截断
+        """
+        first = self.dates[0]
+        n = len(self.dates)
+        lo = 0
+        if start is not None:
+            offset = int((np.datetime64(pd.Timestamp(start).date(), 'D') - first).astype(int))
+            lo = 0 if offset < 0 else (n if offset >= len(self._day_index) else int(self._day_index[offset]))
+        hi = n
+        if end is not None:
+            offset = int((np.datetime64(pd.Timestamp(end).date(), 'D') - first).astype(int)) + 1
+            hi = 0 if offset <= 0 else (n if offset >= len(self._day_index) else int(self._day_index[offset]))
+        return slice(lo, max(lo, hi))
+
+    def history(self, symbol, start=None, end=None, fields=FIELDS) -> pd.DataFrame:
+        """
+        单只股票的日线（去除未上市 / 停牌的空行）
+
+        Returns:
+            DataFrame[date, open, high, low, close, volume]
+        """
+        row = self.row_of(symbol)
+        cols = self.date_slice(start, end)
+        data = {'date': pd.to_datetime(self.dates[cols])}
+        for name in fields:
+            data[name] = np.asarray(self.field(name)[row, cols], dtype=np.float64)
+        df = pd.DataFrame(data)
+        if 'close' in df.columns:
+            df = df[df['close'].notna()].reset_index(drop=True)
+        return df
+
+    def panel(self, start=None, end=None, symbols=None, field: str = 'close'):
+        """
+        取出回测用价格面板 | Build a backtest.engine.PricePanel
+
+        Args:
+            symbols: 代码子集，默认全部
+        """
+        from backtest.engine import PricePanel
+
+        cols = self.date_slice(start, end)
+        matrix = self.field(field)
+        if symbols is None:
+            rows = np.arange(len(self.symbols))
+        else:
+            rows = np.array([self._row[s] for s in (str(x).zfill(6) for x in symbols) if s in self._row],
+                            dtype=np.intp)
+        values = np.asarray(matrix[rows, cols], dtype=np.float64).T
+        return PricePanel(self.dates[cols], self.symbols[rows], values)
+
+    def nbytes(self) -> int:
+        """存储总字节数 | On-disk footprint of the active version"""
+        return sum(os.path.getsize(p) for p in glob.glob(os.path.join(self.version_dir, '*.npy')))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='批量 CSV 日线 -> 内存映射行情存储')
+    parser.add_argument('paths', nargs='+', help='CSV 文件或通配符（如 dumps/*.csv）')
+    parser.add_argument('--root', default='price_store')
+    args = parser.parse_args()
+
+    files = sorted({p for pattern in args.paths for p in glob.glob(pattern)})
+    out = build_store(read_dumps(files), args.root)
+    store = PriceStore(out)
+    print(f"[成功] {store.meta['symbols']} 只 × {store.meta['dates']} 日 -> {out} "
+          f"({store.nbytes() / 1e6:.1f} MB)")
@@ -0,0 +1,106 @@
+"""
+================================================================================
+EigenFlow Scoring | 因子打分引擎
+
+由因子列重建 score，并选出 Top-K：
+- 全市场一次矩阵-向量乘法 (n × 6) @ (6,)
+- argpartition 选 Top-K，只对 K 个元素排序，不做全量排序
+- 权重可配置，改权重后毫秒级重排 5,000+ 只股票
+================================================================================
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# ==================== 因子与默认权重 | Factors & Default Weights ====================
+
+FACTOR_NAMES = ('small', 'lowturn', 'lowvol', 'BL', 'MV', 'MS')
+
+# 由 trade_list_top10.csv 线性回归还原的上游权重（残差 < 1e-9）
+DEFAULT_WEIGHTS = {
+    'small': 0.5546099828,
+    'lowturn': 0.2825952973,
+    'lowvol': -0.0880836982,
+    'BL': -0.0242459129,
+    'MV': 0.0003827598,
+    'MS': 0.0500823489,
+}
+
+
+# ==================== 基础运算 | Primitives ====================
+
+def weight_vector(weights: dict = None) -> np.ndarray:
+    """
+    将权重字典转为按 FACTOR_NAMES 排列的向量
+
+    未给出的因子权重为 0；未知因子名抛 ValueError
+    """
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    unknown = set(weights) - set(FACTOR_NAMES)
+    if unknown:
+        raise ValueError(f"unknown factors: {sorted(unknown)}")
+    return np.array([weights.get(name, 0.0) for name in FACTOR_NAMES], dtype=np.float64)
+
+
+def factor_matrix(source) -> np.ndarray:
+    """
+    取出 (n, 6) 因子矩阵
+
+    Args:
+        source: DataFrame 或 SignalStore（任何支持 source[col] / column(col) 的对象）
+    """
+    if isinstance(source, pd.DataFrame):
+        return source.loc[:, list(FACTOR_NAMES)].to_numpy(dtype=np.float64)
+    return np.column_stack([np.asarray(source.column(name), dtype=np.float64)
+                            for name in FACTOR_NAMES])
+
+
+def compute_scores(matrix: np.ndarray, weights: dict = None) -> np.ndarray:
+    """全市场打分 | One mat-vec product over the whole universe"""
+    return matrix @ weight_vector(weights)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    返回分数最高的 k 个行号（降序）
+
+    argpartition 为 O(n)，之后只对 k 个元素排序；NaN 视为最低分
+    """
+    n = len(scores)
+    if n == 0 or k <= 0:
+        return np.empty(0, dtype=np.intp)
+    keys = -np.nan_to_num(scores, nan=-np.inf, posinf=np.inf, neginf=-np.inf)
+    if k < n:
+        idx = np.argpartition(keys, k - 1)[:k]
+    else:
+        idx = np.arange(n)
+    return idx[np.argsort(keys[idx], kind='stable')]
+
+
+# ==================== 高层接口 | High-level API ====================
+
+def rank(source, weights: dict = None, k: int = 10, matrix: np.ndarray = None) -> pd.DataFrame:
+    """
+    按给定权重重新打分并返回 Top-K
+
+    Args:
+        source: DataFrame 或 SignalStore
+        weights: 因子权重，默认 DEFAULT_WEIGHTS
+        k: 返回条数
+        matrix: 已取出的因子矩阵（多次调权重时复用，避免重复取列）
+
+    Returns:
+        Top-K DataFrame，score 列为重算后的分数
+    """
+    if matrix is None:
+        matrix = factor_matrix(source)
+    scores = compute_scores(matrix, weights)
+    rows = top_k(scores, k)
+
+    if isinstance(source, pd.DataFrame):
+        result = source.iloc[rows].reset_index(drop=True)
+    else:
+        result = source.take(rows)
+    result['score'] = scores[rows]
+    return result
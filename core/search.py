@@ -0,0 +1,126 @@
+"""
+================================================================================
+EigenFlow Symbol Search | 代码 / 名称 / 拼音前缀检索
+
+证券主表上的前缀索引，供代码输入框联想：
+- 四组有序键数组：代码、拼音首字母、名称、名称后缀（支持“茅台”命中“贵州茅台”），
+  每组查询为两次 bisect + 切片，单次查询为微秒级
+- 各组按优先级依次取结果，凑满 limit 即停止，不扫描整个区间
+- 每个主表版本只构建一次（主表随文件版本重建时索引随之重建）
+- 拼音首字母优先取 securities.csv 的 pinyin 列；缺失时若安装了 pypinyin 则自动生成
+================================================================================
+"""
+
+import bisect
+import threading
+import weakref
+
+try:
+    from pypinyin import Style, lazy_pinyin
+    PYPINYIN_AVAILABLE = True
+except ImportError:
+    PYPINYIN_AVAILABLE = False
+
+
+# ==================== 常量 | Constants ====================
+
+DEFAULT_LIMIT = 8
+_UPPER = '\uffff'
+
+
+def initials_of(name: str) -> str:
+    """名称 -> 拼音首字母（如 贵州茅台 -> gzmt），无 pypinyin 时返回空串"""
+    if not PYPINYIN_AVAILABLE or not name:
+        return ''
+    return ''.join(lazy_pinyin(name, style=Style.FIRST_LETTER)).lower()
+
+
+# ==================== 索引 | Index ====================
+
+class _SortedKeys:
+    """有序键数组 + 对应的证券下标"""
+
+    def __init__(self, pairs):
+        pairs = sorted(pairs)
+        self.keys = [k for k, _ in pairs]
+        self.rows = [r for _, r in pairs]
+
+    def prefix(self, query: str):
+        """前缀区间 [lo, hi) | Range of keys starting with query"""
+        lo = bisect.bisect_left(self.keys, query)
+        hi = bisect.bisect_left(self.keys, query + _UPPER, lo)
+        return lo, hi
+
+
+class SymbolIndex:
+    """证券前缀检索索引 | Prefix search over code, pinyin and name"""
+
+    def __init__(self, symbols, names, pinyins=None):
+        self.symbols = list(symbols)
+        self.names = [str(n) if n == n and n is not None else s for s, n in zip(self.symbols, names)]
+        if pinyins is None:
+            pinyins = [None] * len(self.symbols)
+        self.pinyins = [
+            (str(p).lower() if p == p and p else initials_of(n))
+            for p, n in zip(pinyins, self.names)
+        ]
+
+        rows = range(len(self.symbols))
+        self._groups = [
+            _SortedKeys((s, i) for s, i in zip(self.symbols, rows)),
+            _SortedKeys((p, i) for p, i in zip(self.pinyins, rows) if p),
+            _SortedKeys((n.lower(), i) for n, i in zip(self.names, rows)),
+            _SortedKeys((n[k:].lower(), i) for n, i in zip(self.names, rows) for k in range(1, len(n))),
+        ]
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> list:
+        """
+        前缀检索
+
+        Args:
+            query: 代码前缀（6005）、拼音首字母（gzmt）或名称片段（贵州 / 茅台）
+            limit: 最多返回条数
+
+        Returns:
+            [(symbol, name), ...]，按 代码 > 拼音 > 名称 > 名称片段 的优先级排列
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+        seen = set()
+        result = []
+        for group in self._groups:
+            lo, hi = group.prefix(query)
+            for j in range(lo, hi):
+                row = group.rows[j]
+                if row in seen:
+                    continue
+                seen.add(row)
+                result.append((self.symbols[row], self.names[row]))
+                if len(result) >= limit:
+                    return result
+        return result
+
+
+_indexes = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def index_for(master) -> SymbolIndex:
+    """
+    主表对应的检索索引（每个主表对象只构建一次）
+
+    Args:
+        master: core.security_master.SecurityMaster
+    """
+    with _indexes_lock:
+        index = _indexes.get(master)
+        if index is None:
+            table = master.table
+            pinyins = table['pinyin'].tolist() if 'pinyin' in table.columns else None
+            index = SymbolIndex(table.index.tolist(), table['name'].tolist(), pinyins)
+            _indexes[master] = index
+    return index
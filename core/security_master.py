@@ -0,0 +1,125 @@
+"""
+================================================================================
+EigenFlow Security Master | 证券主表
+
+代码 -> 名称 / 行业 / 上市日期的进程级内存表：
+- 来源为本地 securities.csv（symbol,name,industry,list_date，可选 pinyin 首字母列），
+  经 core.loader 按文件版本缓存，进程内只解析一次，文件更新后自动重建
+- 交易所 / 板块由 core.symbols 的整列分类器计算，不逐行判断
+- enrich 对任意信号表做一次 join 完成补全；主表中没有的代码以代码本身作为名称
+================================================================================
+"""
+
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from core import loader
+from core.symbols import boards_of, exchanges_of, normalize_codes
+
+
+# ==================== 常量 | Constants ====================
+
+MASTER_COLUMNS = ('name', 'industry', 'list_date')
+
+# 常见证券列表导出的列名映射
+COLUMN_ALIASES = {
+    'code': 'symbol', 'ts_code': 'symbol', '代码': 'symbol', '证券代码': 'symbol', '股票代码': 'symbol',
+    '名称': 'name', '证券简称': 'name', '股票简称': 'name',
+    '行业': 'industry', '所属行业': 'industry',
+    '上市日期': 'list_date', '上市时间': 'list_date',
+    '拼音': 'pinyin', '拼音缩写': 'pinyin',
+}
+
+
+# ==================== 主表 | Master Table ====================
+
+class SecurityMaster:
+    """证券主表（只读） | In-memory security master"""
+
+    def __init__(self, df: pd.DataFrame = None):
+        if df is None or df.empty:
+            df = pd.DataFrame(columns=['symbol', *MASTER_COLUMNS])
+        df = df.rename(columns={c: COLUMN_ALIASES.get(c, c) for c in df.columns})
+        codes = normalize_codes(df['symbol'])
+        table = pd.DataFrame({'symbol': codes})
+        for column in MASTER_COLUMNS:
+            table[column] = df[column].to_numpy() if column in df.columns else None
+        if 'pinyin' in df.columns:
+            table['pinyin'] = df['pinyin'].to_numpy()
+        table['list_date'] = pd.to_datetime(table['list_date'].astype(str), errors='coerce', **loader.MIXED_DATES)
+        self.table = table.drop_duplicates('symbol', keep='last').set_index('symbol')
+
+    def __len__(self):
+        return len(self.table)
+
+    def __contains__(self, code):
+        return str(code).strip().zfill(6) in self.table.index
+
+    def name_of(self, code) -> str:
+        """代码 -> 名称（未知时返回代码） | Name lookup"""
+        code = str(code).strip().zfill(6)
+        name = self.table['name'].get(code)
+        return code if name is None or pd.isna(name) else str(name)
+
+    def enrich(self, df: pd.DataFrame, column: str = 'symbol') -> pd.DataFrame:
+        """
+        为信号表补全代码格式、名称、行业、上市日期、交易所与板块
+
+        Args:
+            df: 含代码列的任意表
+            column: 代码列名
+
+        Returns:
+            新表；已有的 name 列优先保留，缺失值用主表名称、再用代码补齐
+        """
+        codes = normalize_codes(df[column]) if len(df) else np.array([], dtype='U6')
+        out = df.assign(**{column: codes, 'exchange': exchanges_of(codes), 'board': boards_of(codes)})
+        joined = out.join(self.table[list(MASTER_COLUMNS)], on=column, rsuffix='_master')
+        if 'name_master' in joined.columns:
+            joined['name'] = joined['name'].fillna(joined.pop('name_master'))
+        for column_name in ('industry', 'list_date'):
+            extra = column_name + '_master'
+            if extra in joined.columns:
+                joined = joined.drop(columns=extra)
+        joined['name'] = joined['name'].fillna(pd.Series(codes, index=joined.index))
+        return joined
+
+
+def parse_master(data: bytes) -> SecurityMaster:
+    """由 CSV 字节解析主表 | Parse raw CSV bytes"""
+    return SecurityMaster(pd.read_csv(io.BytesIO(data), dtype=str))
+
+
+_empty = SecurityMaster()
+
+
+def load_master(path: str) -> SecurityMaster:
+    """
+    读取证券主表（按文件版本缓存，跨会话共享）
+
+    文件不存在时返回空主表：分类照常进行，名称回退为代码
+    """
+    if not os.path.exists(path):
+        return _empty
+    master, _ = loader.load_cached(path, parse_master, 'security_master')
+    return master
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='证券列表导出 -> securities.csv')
+    parser.add_argument('source', help='证券列表 CSV（tushare / akshare 等导出）')
+    parser.add_argument('--out', default='securities.csv')
+    args = parser.parse_args()
+
+    master = SecurityMaster(pd.read_csv(args.source, dtype=str))
+    table = master.table.reset_index()
+    table['list_date'] = table['list_date'].dt.strftime('%Y-%m-%d')
+    tmp = args.out + '.tmp'
+    table.to_csv(tmp, index=False, encoding='utf-8')
+    os.replace(tmp, args.out)
+    print(f"[成功] {len(table)} 只证券 -> {args.out}")
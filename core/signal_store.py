@@ -0,0 +1,177 @@
+"""
+================================================================================
+EigenFlow Signal Store | 列式信号存储
+
+全市场（~5,300 只）模型输出的二进制列式存储，基于内存映射 NumPy 数组：
+- 每列一个 .npy 文件，np.load(mmap_mode='r') 零拷贝打开
+- 可选 float32 模式，体积减半
+- 写入时预计算按 score 降序的排序索引，读取 Top-N 无需解析/排序全市场
+
+目录结构:
+    signal_store/
+        CURRENT              当前版本目录名（原子替换）
+        v<时间戳>/
+            meta.json        行数、列名、dtype
+            symbol.npy       6 位代码（定长字符串）
+            score.npy ...    因子列
+            order.npy        按 score 降序的行号
+================================================================================
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+
+# ==================== 常量 | Constants ====================
+
+FACTOR_COLUMNS = ['small', 'lowturn', 'lowvol', 'BL', 'MV', 'MS', 'score']
+CURRENT_FILE = 'CURRENT'
+META_FILE = 'meta.json'
+ORDER_FILE = 'order.npy'
+SORT_COLUMN = 'score'
+
+
+# ==================== 写入 | Write ====================
+
+def write_store(df: pd.DataFrame, store_dir: str, float32: bool = False) -> str:
+    """
+    将信号 DataFrame 写为新的存储版本，并原子切换 CURRENT
+
+    旧版本目录保留不删，已打开的内存映射继续有效
+
+    Args:
+        df: 含 symbol 与因子列的 DataFrame
+        store_dir: 存储根目录
+        float32: 数值列是否以 float32 保存
+
+    Returns:
+        新版本目录路径
+    """
+    if 'symbol' not in df.columns:
+        raise ValueError("signal frame must contain a 'symbol' column")
+
+    float_dtype = np.float32 if float32 else np.float64
+    version = 'v%d' % time.time_ns()
+    version_dir = os.path.join(store_dir, version)
+    os.makedirs(version_dir)
+
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if col == 'symbol':
+            arr = series.astype(str).str.strip().str.zfill(6).to_numpy(dtype='U6')
+        elif pd.api.types.is_numeric_dtype(series):
+            arr = series.to_numpy(dtype=float_dtype)
+        else:
+            arr = series.astype(str).to_numpy(dtype=str)
+        np.save(os.path.join(version_dir, col + '.npy'), arr)
+        columns[col] = arr.dtype.str
+
+    if SORT_COLUMN in df.columns:
+        score = df[SORT_COLUMN].to_numpy(dtype=np.float64)
+        # NaN 排到最后；stable 保证同分时保持原始顺序
+        order = np.argsort(-np.nan_to_num(score, nan=-np.inf), kind='stable')
+        np.save(os.path.join(version_dir, ORDER_FILE), order.astype(np.int32))
+
+    meta = {
+        'rows': int(len(df)),
+        'columns': columns,
+        'float32': bool(float32),
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    with open(os.path.join(version_dir, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    tmp = os.path.join(store_dir, CURRENT_FILE + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(store_dir, CURRENT_FILE))
+    return version_dir
+
+
+def csv_to_store(csv_path: str, store_dir: str, float32: bool = False) -> str:
+    """从 CSV 导入 | Convert a signal CSV into a new store version"""
+    df = pd.read_csv(csv_path, dtype={'symbol': str})
+    return write_store(df, store_dir, float32=float32)
+
+
+# ==================== 读取 | Read ====================
+
+def current_version_dir(store_dir: str) -> str:
+    """返回 CURRENT 指向的版本目录 | Resolve the active version directory"""
+    with open(os.path.join(store_dir, CURRENT_FILE), encoding='utf-8') as f:
+        return os.path.join(store_dir, f.read().strip())
+
+
+class SignalStore:
+    """
+    只读的内存映射信号存储
+
+    列在首次访问时以 mmap 打开，之后复用；top(n) 只物化 n 行
+    """
+
+    def __init__(self, version_dir: str):
+        self.version_dir = version_dir
+        with open(os.path.join(version_dir, META_FILE), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.columns = list(self.meta['columns'])
+        self._arrays = {}
+        self._order = None
+
+    @classmethod
+    def open(cls, store_dir: str) -> 'SignalStore':
+        """打开当前版本 | Open the active version"""
+        return cls(current_version_dir(store_dir))
+
+    def __len__(self):
+        return self.meta['rows']
+
+    def column(self, name: str) -> np.ndarray:
+        """返回列的只读内存映射 | Zero-copy read-only view of one column"""
+        arr = self._arrays.get(name)
+        if arr is None:
+            if name not in self.meta['columns']:
+                raise KeyError(name)
+            arr = np.load(os.path.join(self.version_dir, name + '.npy'), mmap_mode='r')
+            self._arrays[name] = arr
+        return arr
+
+    def order(self) -> np.ndarray:
+        """按 score 降序的行号 | Row ids sorted by score, descending"""
+        if self._order is None:
+            path = os.path.join(self.version_dir, ORDER_FILE)
+            if not os.path.exists(path):
+                raise KeyError(SORT_COLUMN)
+            self._order = np.load(path, mmap_mode='r')
+        return self._order
+
+    def take(self, rows, columns=None) -> pd.DataFrame:
+        """按行号物化为 DataFrame | Materialize selected rows"""
+        rows = np.asarray(rows)
+        columns = columns or self.columns
+        return pd.DataFrame({c: self.column(c)[rows] for c in columns})
+
+    def top(self, n: int = 10, columns=None) -> pd.DataFrame:
+        """读取 score 最高的 n 行 | Top-n rows by score"""
+        return self.take(self.order()[:n], columns)
+
+    def to_frame(self) -> pd.DataFrame:
+        """物化全部行（调试/导出用） | Materialize the whole universe"""
+        return self.take(np.arange(len(self)))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='信号 CSV -> 列式存储')
+    parser.add_argument('csv_path')
+    parser.add_argument('store_dir')
+    parser.add_argument('--float32', action='store_true', help='数值列以 float32 保存')
+    args = parser.parse_args()
+
+    out = csv_to_store(args.csv_path, args.store_dir, float32=args.float32)
+    print(f"[成功] 已写入 {out}")
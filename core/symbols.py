@@ -0,0 +1,125 @@
+"""
+================================================================================
+EigenFlow Symbols | 代码前缀规则
+
+交易所 / 板块按代码前缀划分，供 TradingView 符号生成、证券主表与回测涨跌停规则共用；
+逐代码函数（exchange_of / board_of）是规则的唯一来源，整列分类先按 3 位前缀去重，
+再把去重后的结果广播回整列
+================================================================================
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# ==================== 前缀表 | Prefix Tables ====================
+
+SSE_PREFIXES = ('600', '601', '603', '605', '688')
+SZSE_PREFIXES = ('000', '001', '002', '003', '300', '301')
+BSE_PREFIXES = ('920', '4', '8')   # 北交所：920 新代码段及 4xx / 8xx 存量代码
+
+BOARD_PREFIXES = {
+    'star': ('688',),                 # 科创板
+    'chinext': ('300', '301'),        # 创业板
+    'bse': BSE_PREFIXES,              # 北交所
+    'main': ('600', '601', '603', '605', '000', '001', '002', '003'),
+}
+
+# TradingView 交易所前缀
+TRADINGVIEW_EXCHANGES = {
+    'SSE': 'SSE',
+    'SZSE': 'SZSE',
+    'BSE': 'BJSE',
+}
+
+# 涨跌幅限制（ST 仅对主板生效：创业板 / 科创板 / 北交所的 ST 股沿用板块限制）
+PRICE_LIMITS = {
+    'main': 0.10,
+    'star': 0.20,
+    'chinext': 0.20,
+    'bse': 0.30,
+    'st': 0.05,
+}
+
+
+# ==================== 分类 | Classification ====================
+
+def exchange_of(code: str) -> str:
+    """代码 -> 交易所（未知前缀按 SSE 处理） | Exchange by prefix"""
+    if code.startswith(SSE_PREFIXES):
+        return 'SSE'
+    elif code.startswith(SZSE_PREFIXES):
+        return 'SZSE'
+    elif code.startswith(BSE_PREFIXES):
+        return 'BSE'
+    return 'SSE'
+
+
+def tradingview_symbol(code: str) -> str:
+    """6 位代码 -> TradingView 符号（如 SSE:600519） | TradingView ticker"""
+    return f"{TRADINGVIEW_EXCHANGES[exchange_of(code)]}:{code}"
+
+
+def board_of(code: str) -> str:
+    """代码 -> 板块（未知前缀按主板处理） | Board by prefix"""
+    for board, prefixes in BOARD_PREFIXES.items():
+        if code.startswith(prefixes):
+            return board
+    return 'main'
+
+
+# ==================== 整列处理 | Vectorized ====================
+
+def normalize_codes(values) -> np.ndarray:
+    """
+    整列代码标准化为 6 位字符串
+
+    支持整数、去掉前导 0 的字符串以及 600519.SH / sh600519 等带后缀写法
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in 'iu':
+        return np.char.zfill(arr.astype('U6'), 6)
+    if arr.dtype.kind == 'U' or arr.dtype == object:
+        text = np.char.strip(arr.astype('U'))
+        if text.size and np.char.isdigit(text).all() and np.char.str_len(text).max() <= 6:
+            return np.char.zfill(text, 6).astype('U6')
+    series = pd.Series(arr).astype(str).str.strip()
+    digits = series.str.extract(r'(\d{1,6})', expand=False).fillna(series)
+    return digits.str.zfill(6).to_numpy(dtype='U6')
+
+
+def _by_prefix(codes, classify) -> np.ndarray:
+    """按 3 位前缀去重后分类，再广播回整列"""
+    codes = np.asarray(codes, dtype='U6')
+    prefixes, inverse = np.unique(codes.astype('U3'), return_inverse=True)
+    labels = np.array([classify(p) for p in prefixes.tolist()], dtype=object)
+    return labels[inverse.reshape(-1)]
+
+
+def exchanges_of(codes) -> np.ndarray:
+    """整列代码 -> 交易所 | Vectorized exchange_of"""
+    return _by_prefix(codes, exchange_of)
+
+
+def boards_of(codes) -> np.ndarray:
+    """整列代码 -> 板块 | Vectorized board_of"""
+    return _by_prefix(codes, board_of)
+
+
+def limit_pcts(symbols, is_st=None) -> np.ndarray:
+    """
+    逐列涨跌幅限制
+
+    Args:
+        symbols: 6 位代码序列
+        is_st: 可选，与 symbols 等长的布尔数组，或可广播到 (T, N) 的布尔矩阵；
+            只有主板代码的 ST 标记会改为 ±5%
+
+    Returns:
+        (N,) 或 (T, N) 的限制比例数组
+    """
+    pct = _by_prefix(symbols, lambda p: PRICE_LIMITS[board_of(p)]).astype(np.float64)
+    if is_st is not None:
+        st_main = np.asarray(is_st, dtype=bool) & (boards_of(symbols) == 'main')
+        pct = np.where(st_main, PRICE_LIMITS['st'], pct)
+    return pct
@@ -0,0 +1,273 @@
+"""
+================================================================================
+EigenFlow Telemetry | 访问与使用记录
+
+进程内非阻塞事件队列 + 后台批量写入 SQLite：
+- emit() 只向有界 deque 追加一条元组（O(1)，不做 I/O），队列满时丢弃最旧事件并计数
+- 后台线程每 FLUSH_INTERVAL 秒或攒够 BATCH_SIZE 条时用一个事务批量写入
+- 数据库为 WAL 模式，多 worker 进程（start.py）可写同一文件
+- Access Key 只记录摘要（core.access.hash_key），不落明文
+- 聚合查询：每日活跃密钥数、标签页使用次数、图表代码次数
+
+事件字段：ts, day, session, key, event, tab, symbol
+    unlock / unlock_failed    Access Key 验证
+    tab                       切换到某标签页
+    chart                     查看某只股票图表
+
+环境变量：EIGENFLOW_TELEMETRY=0 关闭；EIGENFLOW_TELEMETRY_DB 指定数据库路径
+
+查询：python -m core.telemetry --days 7
+================================================================================
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import date, timedelta
+
+import pandas as pd
+
+from core.access import hash_key
+
+
+# ==================== 常量 | Constants ====================
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 默认写在项目根目录（含 WAL 模式的 -wal / -shm 文件），已列入 .gitignore
+TELEMETRY_PATH = os.environ.get('EIGENFLOW_TELEMETRY_DB', os.path.join(BASE_DIR, 'telemetry.db'))
+ENABLED = os.environ.get('EIGENFLOW_TELEMETRY', '1') == '1'
+
+MAX_QUEUE = 10000        # 队列上限（约 1–2 MB），超出时丢弃最旧事件
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 2.0     # 秒
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    session TEXT,
+    key TEXT,
+    event TEXT NOT NULL,
+    tab TEXT,
+    symbol TEXT
+);
+CREATE INDEX IF NOT EXISTS events_day_event ON events (day, event);
+"""
+
+
+def key_digest(key: str):
+    """Access Key -> 记录用摘要（空值为 None）"""
+    if not key or not key.strip():
+        return None
+    return hash_key(key).hex()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# ==================== 写入 | Writer ====================
+
+class TelemetryWriter:
+    """
+    有界事件队列与后台批量写入线程 | Bounded queue with a batching writer thread
+
+    Args:
+        path: SQLite 数据库路径
+        max_queue: 队列上限，满时丢弃最旧事件
+    """
+
+    def __init__(self, path: str = TELEMETRY_PATH, max_queue: int = MAX_QUEUE,
+                 batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = deque(maxlen=max_queue)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.stats = {'queued': 0, 'written': 0, 'dropped': 0, 'errors': 0}
+
+    def emit(self, event: str, session: str = None, key: str = None, tab: str = None, symbol: str = None):
+        """追加一条事件（不阻塞；key 为已摘要的值）"""
+        if self._thread is None:
+            self._start()
+        queue = self._queue
+        if len(queue) == queue.maxlen:
+            self.stats['dropped'] += 1
+        queue.append((time.time(), session, key, event, tab, symbol))
+        self.stats['queued'] += 1
+        if len(queue) >= self.batch_size:
+            self._wake.set()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='eigenflow-telemetry', daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _drain(self) -> list:
+        batch = []
+        queue = self._queue
+        while queue and len(batch) < self.batch_size:
+            ts, *fields = queue.popleft()
+            batch.append((ts, time.strftime('%Y-%m-%d', time.localtime(ts)), *fields))
+        return batch
+
+    def flush(self, conn: sqlite3.Connection = None):
+        """把队列中的事件全部写入数据库"""
+        own = conn is None
+        if own:
+            conn = _connect(self.path)
+        try:
+            while True:
+                batch = self._drain()
+                if not batch:
+                    break
+                try:
+                    with conn:
+                        conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+                    self.stats['written'] += len(batch)
+                except sqlite3.Error:
+                    self.stats['errors'] += 1
+                    break
+        finally:
+            if own:
+                conn.close()
+
+    def _run(self):
+        conn = None
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if not self._queue:
+                continue
+            try:
+                if conn is None:
+                    conn = _connect(self.path)
+                self.flush(conn)
+            except sqlite3.Error:
+                self.stats['errors'] += 1
+                conn = None
+        if conn is not None:
+            conn.close()
+
+    def close(self):
+        """停止后台线程并写入剩余事件"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self._queue:
+            try:
+                self.flush()
+            except sqlite3.Error:
+                self.stats['errors'] += 1
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> TelemetryWriter:
+    """进程级写入器（跨会话共享） | Process-wide writer"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = TelemetryWriter()
+    return _writer
+
+
+def emit(event: str, session: str = None, key: str = None, tab: str = None, symbol: str = None):
+    """记录一条事件；关闭时为空操作 | Enqueue one event (no-op when disabled)"""
+    if ENABLED:
+        get_writer().emit(event, session, key, tab, symbol)
+
+
+# ==================== 查询 | Queries ====================
+
+def _query(path: str, sql: str, params) -> pd.DataFrame:
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+
+def _range(start, end):
+    end = pd.Timestamp(end or date.today()).strftime('%Y-%m-%d')
+    start = pd.Timestamp(start or (pd.Timestamp(end) - timedelta(days=29))).strftime('%Y-%m-%d')
+    return start, end
+
+
+def daily_active_keys(start=None, end=None, path: str = TELEMETRY_PATH) -> pd.DataFrame:
+    """
+    每日活跃密钥数（当日有任何事件的不同有效密钥）
+
+    Returns:
+        DataFrame[day, active_keys, sessions]，默认最近 30 天
+    """
+    return _query(path, """
+        SELECT day, COUNT(DISTINCT key) AS active_keys, COUNT(DISTINCT session) AS sessions
+        FROM events
+        WHERE day BETWEEN ? AND ? AND key IS NOT NULL AND event != 'unlock_failed'
+        GROUP BY day ORDER BY day
+    """, _range(start, end))
+
+
+def tab_usage(start=None, end=None, path: str = TELEMETRY_PATH) -> pd.DataFrame:
+    """
+    每日各标签页打开次数
+
+    Returns:
+        DataFrame[day, tab, opens, sessions]
+    """
+    return _query(path, """
+        SELECT day, tab, COUNT(*) AS opens, COUNT(DISTINCT session) AS sessions
+        FROM events
+        WHERE event = 'tab' AND day BETWEEN ? AND ?
+        GROUP BY day, tab ORDER BY day, opens DESC
+    """, _range(start, end))
+
+
+def symbol_usage(start=None, end=None, limit: int = 20, path: str = TELEMETRY_PATH) -> pd.DataFrame:
+    """
+    区间内查看次数最多的图表代码
+
+    Returns:
+        DataFrame[symbol, views, sessions]
+    """
+    return _query(path, """
+        SELECT symbol, COUNT(*) AS views, COUNT(DISTINCT session) AS sessions
+        FROM events
+        WHERE event = 'chart' AND day BETWEEN ? AND ?
+        GROUP BY symbol ORDER BY views DESC LIMIT ?
+    """, (*_range(start, end), int(limit)))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='访问与使用记录汇总')
+    parser.add_argument('--db', default=TELEMETRY_PATH)
+    parser.add_argument('--days', type=int, default=7)
+    args = parser.parse_args()
+
+    start = date.today() - timedelta(days=args.days - 1)
+    for title, frame in (("每日活跃密钥 | Daily Active Keys", daily_active_keys(start, path=args.db)),
+                         ("标签页 | Tab Usage", tab_usage(start, path=args.db)),
+                         ("图表代码 | Charted Symbols", symbol_usage(start, path=args.db))):
+        print(f"\n{title}")
+        print(frame.to_string(index=False) if len(frame) else "（无记录）")
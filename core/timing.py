@@ -0,0 +1,216 @@
+"""
+================================================================================
+EigenFlow Timing | 耗时记录
+
+记录每次全量重跑、各片段（fragment）重跑以及页面各区块（span）的耗时，进程内跨会话汇总：
+- span(name)：with 语句计时一个区块（页头、验证、数据加载、各标签页、页脚、图表构建……）
+- timed(name)：装饰器形式，用于整页 / 片段重跑
+- 每个名称保留最近 MAX_SAMPLES 个样本（分位数）与固定分桶直方图（Prometheus 格式）
+- prometheus_text() 输出文本格式指标；serve_metrics(port) 在后台线程提供 /metrics
+
+默认关闭（EIGENFLOW_TIMING=1 开启）：关闭时 span() 返回共享的空上下文，
+timed 只多一次全局变量判断，不取时间、不加锁
+================================================================================
+"""
+
+import bisect
+import contextlib
+import functools
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+MAX_SAMPLES = 1000
+ENABLED = os.environ.get('EIGENFLOW_TIMING') == '1'
+METRIC_NAME = 'eigenflow_span_seconds'
+# 直方图上界（秒），末尾隐含 +Inf
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_samples = {}       # name -> deque[秒]
+_histograms = {}    # name -> [各分桶计数（非累计）, 总耗时]
+_lock = threading.Lock()
+
+
+def enable(flag: bool = True):
+    """运行时开启 / 关闭记录 | Toggle recording at runtime"""
+    global ENABLED
+    ENABLED = flag
+
+
+def record(name: str, seconds: float):
+    """记录一次耗时 | Record one duration sample"""
+    with _lock:
+        bucket = _samples.get(name)
+        if bucket is None:
+            bucket = _samples[name] = deque(maxlen=MAX_SAMPLES)
+            _histograms[name] = [[0] * (len(BUCKETS) + 1), 0.0]
+        bucket.append(seconds)
+        histogram = _histograms[name]
+        histogram[0][bisect.bisect_left(BUCKETS, seconds)] += 1
+        histogram[1] += seconds
+
+
+class _Span:
+    """计时上下文 | Timing context manager"""
+
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def span(name: str):
+    """
+    计时一个区块（关闭时为空操作）
+
+    st.stop() / st.rerun() 以异常形式退出时同样记录
+    """
+    return _Span(name) if ENABLED else _NULL_SPAN
+
+
+def timed(name: str):
+    """
+    装饰器：记录函数每次执行的耗时
+
+    st.stop() / st.rerun() 以异常形式退出时同样记录
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+# ==================== 汇总 | Summary ====================
+
+def summary() -> dict:
+    """
+    各名称的耗时统计（毫秒）
+
+    Returns:
+        name -> {count, mean_ms, p50_ms, p95_ms, p99_ms, total}
+        count 为最近样本数，total 为进程启动以来的累计次数
+    """
+    with _lock:
+        snapshot = {name: np.array(bucket) for name, bucket in _samples.items()}
+        totals = {name: sum(h[0]) for name, h in _histograms.items()}
+    result = {}
+    for name, values in sorted(snapshot.items()):
+        if len(values) == 0:
+            continue
+        ms = values * 1000.0
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        result[name] = {
+            'count': len(ms),
+            'mean_ms': float(ms.mean()),
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'total': totals[name],
+        }
+    return result
+
+
+def histograms() -> dict:
+    """
+    各名称的累计直方图
+
+    Returns:
+        name -> {'buckets': [(上界秒, 累计次数), ..., (inf, 总次数)], 'sum': 总秒数}
+    """
+    with _lock:
+        snapshot = {name: (list(h[0]), h[1]) for name, h in _histograms.items()}
+    result = {}
+    for name, (counts, total) in sorted(snapshot.items()):
+        cumulative = np.cumsum(counts).tolist()
+        result[name] = {'buckets': list(zip(BUCKETS + (float('inf'),), cumulative)), 'sum': total}
+    return result
+
+
+def prometheus_text() -> str:
+    """Prometheus 文本格式（histogram） | Prometheus exposition format"""
+    lines = [
+        f"# HELP {METRIC_NAME} EigenFlow page section latency.",
+        f"# TYPE {METRIC_NAME} histogram",
+    ]
+    for name, histogram in histograms().items():
+        label = name.replace('\\', '\\\\').replace('"', '\\"')
+        for upper, count in histogram['buckets']:
+            le = '+Inf' if upper == float('inf') else repr(upper)
+            lines.append(f'{METRIC_NAME}_bucket{{span="{label}",le="{le}"}} {count}')
+        lines.append(f'{METRIC_NAME}_sum{{span="{label}"}} {histogram["sum"]:.6f}')
+        lines.append(f'{METRIC_NAME}_count{{span="{label}"}} {histogram["buckets"][-1][1]}')
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    """清空记录 | Drop all samples"""
+    with _lock:
+        _samples.clear()
+        _histograms.clear()
+
+
+# ==================== 指标端点 | Metrics Endpoint ====================
+
+_metrics_server = None     # 启动失败后为 False，不再重试
+_metrics_lock = threading.Lock()
+
+
+def serve_metrics(port: int, host: str = '127.0.0.1'):
+    """
+    在后台线程提供 GET /metrics（每个进程只启动一次）
+
+    Streamlit 不便挂载自定义路由，因此单独监听一个端口；端口被占用时静默跳过
+    """
+    global _metrics_server
+    with _metrics_lock:
+        if _metrics_server is not None:
+            return _metrics_server or None
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError:
+            _metrics_server = False
+            return None
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='eigenflow-metrics', daemon=True).start()
+        _metrics_server = server
+        return server
@@ -0,0 +1,181 @@
+"""
+================================================================================
+EigenFlow Trading Calendar | 沪深交易日历
+
+由本地节假日文件预计算的交易日历：
+- 交易日 = 周一至周五且不在休市日列表中（沪深两市休市安排一致）
+- 预先计算“自然日 -> 此前交易日数”前缀表，
+  是否交易日 / 下一交易日 / 上一交易日 / 区间交易日数均为 O(1) 数组下标
+- 节假日文件 holidays.csv（date[,name]），每年交易所公告后追加；
+  覆盖范围为文件中最早至最晚年份，范围外的查询按仅排除周末处理并发出
+  HolidayCoverageWarning（strict=True 时直接报错）
+- 经 core.loader 按文件版本缓存，日期标题、信号归档与回测共用同一实例
+================================================================================
+"""
+
+import io
+import os
+import warnings
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from core import loader
+
+
+# ==================== 常量 | Constants ====================
+
+CALENDAR_START = '2000-01-01'
+YEARS_AHEAD = 2          # 日历覆盖到 max(最后节假日年份, 今年) + YEARS_AHEAD 年末
+
+
+def _day(value) -> np.datetime64:
+    """str / date / datetime / Timestamp / datetime64 -> datetime64[D]"""
+    if isinstance(value, np.datetime64):
+        return value.astype('datetime64[D]')
+    if isinstance(value, str) and len(value) == 10:
+        return np.datetime64(value, 'D')
+    if isinstance(value, date):
+        return np.datetime64(value.strftime('%Y-%m-%d'), 'D')
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+
+# ==================== 日历 | Calendar ====================
+
+class HolidayCoverageWarning(UserWarning):
+    """查询日期超出节假日数据覆盖范围 | Date outside the holiday data's years"""
+
+
+class TradingCalendar:
+    """
+    沪深交易日历（只读） | Precomputed SSE/SZSE trading calendar
+
+    Attributes:
+        covered: (首日, 末日) 节假日数据覆盖的整年范围，无节假日数据时为 None
+        strict: 为 True 时覆盖范围外的查询抛 ValueError，否则发出告警
+    """
+
+    def __init__(self, holidays=(), start=CALENDAR_START, end=None, strict: bool = False):
+        self.holidays = np.unique(np.asarray([_day(h) for h in holidays], dtype='datetime64[D]'))
+        self.strict = strict
+        self.covered = None
+        if len(self.holidays):
+            self.covered = (np.datetime64(f"{str(self.holidays[0])[:4]}-01-01", 'D'),
+                            np.datetime64(f"{str(self.holidays[-1])[:4]}-12-31", 'D'))
+        if end is None:
+            last_year = max([date.today().year] + [int(str(h)[:4]) for h in self.holidays[-1:]])
+            end = f"{last_year + YEARS_AHEAD}-12-31"
+        self.start = _day(start)
+        self.end = _day(end)
+
+        span = np.arange(self.start, self.end + 1, dtype='datetime64[D]')
+        is_open = np.is_busday(span, holidays=self.holidays)
+        self.days = span[is_open]
+        self._is_open = is_open
+        # _before[k]：自然日偏移 k 之前（不含）的交易日个数
+        self._before = np.concatenate([[0], np.cumsum(is_open)]).astype(np.int64)
+
+    def __len__(self):
+        return len(self.days)
+
+    def is_covered(self, value) -> bool:
+        """日期是否在节假日数据覆盖的年份内 | Whether holidays are known for this date"""
+        day = _day(value)
+        return self.covered is not None and self.covered[0] <= day <= self.covered[1]
+
+    def _check_covered(self, day, stacklevel: int = 3):
+        if self.is_covered(day):
+            return
+        span = 'no holiday data' if self.covered is None else \
+            f"holiday data covers {self.covered[0]}..{self.covered[1]}"
+        message = f"date {day} not covered ({span}); weekdays are treated as trading days"
+        if self.strict:
+            raise ValueError(message)
+        warnings.warn(message, HolidayCoverageWarning, stacklevel=stacklevel)
+
+    def _offset(self, value) -> int:
+        day = _day(value)
+        offset = int((day - self.start).astype(np.int64))
+        if offset < 0 or offset >= len(self._is_open):
+            raise ValueError(f"date {value} outside calendar range {self.start}..{self.end}")
+        self._check_covered(day, stacklevel=4)
+        return offset
+
+    def is_trading_day(self, value) -> bool:
+        """是否交易日 | Whether the exchange is open on this date"""
+        return bool(self._is_open[self._offset(value)])
+
+    def next_trading_day(self, value, inclusive: bool = False) -> np.datetime64:
+        """
+        下一交易日
+
+        Args:
+            inclusive: 为 True 且当日为交易日时返回当日
+        """
+        offset = self._offset(value)
+        idx = self._before[offset] if inclusive else self._before[offset + 1]
+        if idx >= len(self.days):
+            raise ValueError(f"no trading day after {value} within calendar range")
+        self._check_covered(self.days[idx])
+        return self.days[idx]
+
+    def previous_trading_day(self, value, inclusive: bool = False) -> np.datetime64:
+        """
+        上一交易日
+
+        Args:
+            inclusive: 为 True 且当日为交易日时返回当日
+        """
+        offset = self._offset(value)
+        idx = (self._before[offset + 1] if inclusive else self._before[offset]) - 1
+        if idx < 0:
+            raise ValueError(f"no trading day before {value} within calendar range")
+        self._check_covered(self.days[idx])
+        return self.days[idx]
+
+    def trading_days_between(self, start, end) -> int:
+        """闭区间 [start, end] 内的交易日数（start > end 时为 0）"""
+        lo = self._before[self._offset(start)]
+        hi = self._before[self._offset(end) + 1]
+        return max(0, int(hi - lo))
+
+    def trading_days(self, start=None, end=None) -> np.ndarray:
+        """闭区间内的交易日数组 | Trading days within [start, end]"""
+        lo = self._before[self._offset(start)] if start is not None else 0
+        hi = self._before[self._offset(end) + 1] if end is not None else len(self.days)
+        return self.days[lo:hi]
+
+    def shift(self, value, n: int) -> np.datetime64:
+        """
+        偏移 n 个交易日：以当日为基准（非交易日先顺延至下一交易日）
+        """
+        idx = self._before[self._offset(value)] + n
+        if idx < 0 or idx >= len(self.days):
+            raise ValueError(f"shift {n} from {value} leaves calendar range")
+        self._check_covered(self.days[idx])
+        return self.days[idx]
+
+
+def parse_holidays(data: bytes) -> TradingCalendar:
+    """由节假日 CSV 字节构建日历 | Build a calendar from raw holiday CSV bytes"""
+    df = pd.read_csv(io.BytesIO(data), dtype=str, comment='#')
+    return TradingCalendar(df['date'].str.strip().tolist())
+
+
+_weekdays_only = None
+
+
+def load_calendar(path: str) -> TradingCalendar:
+    """
+    读取交易日历（按节假日文件版本缓存，跨会话共享）
+
+    文件不存在时返回仅排除周末的日历（无节假日数据，所有查询均告警）
+    """
+    global _weekdays_only
+    if not os.path.exists(path):
+        if _weekdays_only is None:
+            _weekdays_only = TradingCalendar()
+        return _weekdays_only
+    calendar, _ = loader.load_cached(path, parse_holidays, 'trading_calendar')
+    return calendar
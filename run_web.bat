@@ -19,7 +19,7 @@ echo [退出] 关闭此窗口可停止网站
 echo.
 
 REM 启动streamlit
-python -m streamlit run app.py --server.address localhost --server.port 8501
+python -m streamlit run app_v3.py --server.address localhost --server.port 8501
 
 echo.
 echo [再见] 网站已停止
@@ -2,18 +2,52 @@
 # -*- coding: utf-8 -*-
 """
 A股量化推荐网站 - 一键启动脚本
+
+多进程模式（默认按 CPU 核数启动 worker）：
+- 每个 worker 是独立的 Streamlit 进程，监听 --worker-base-port 起的连续端口；
+  启动时先预热进程级数据缓存，再开始监听，因此健康检查通过即代表已预热
+- 主进程作为监督者：定期访问 /_stcore/health，进程退出或连续失败则重启（指数退避）
+- 对外端口由内置 TCP 代理提供，按客户端做会话粘滞（rendezvous 哈希，
+  某个 worker 下线时只迁移该 worker 上的会话），WebSocket 原样转发；
+  请求带 X-Forwarded-For 时按其中的原始客户端 IP 路由，否则按连接的对端 IP
+- 限制：同一 NAT 出口后的用户、或上游代理未传 X-Forwarded-For 时，
+  所有会话共用一个键，会集中到同一个 worker
+- 也可用 --proxy nginx 生成等价的 Nginx 配置（按同一路由键一致性哈希），由 Nginx 负责对外端口
+
+单进程：python start.py --workers 1（与旧版一致，直接监听 8501）
 """
 
 import os
 import sys
 import subprocess
 import io
+import asyncio
+import hashlib
+import re
+import signal
+import threading
+import time
+import urllib.request
 
 # 修复Windows中文编码问题
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_FILE = os.path.join(BASE_DIR, 'app_v3.py')
+
+DEFAULT_PORT = 8501
+DEFAULT_WORKER_BASE_PORT = 8511
+HEALTH_PATH = '/_stcore/health'
+HEALTH_INTERVAL = 5          # 秒，已就绪 worker 的检查间隔
+HEALTH_TIMEOUT = 2
+HEALTH_FAILURES = 3          # 连续失败次数达到后重启
+STARTUP_TIMEOUT = 120        # 秒，启动（含预热）超时
+MAX_BACKOFF = 60
+HEAD_TIMEOUT = 5             # 秒，代理等待首个请求头（取 X-Forwarded-For）的上限
+
+
 def check_dependencies():
     """检查依赖是否安装"""
     try:
@@ -27,11 +61,313 @@ def check_dependencies():
         print("请运行: pip install streamlit pandas plotly")
         return False
 
-def start_app():
-    """启动Streamlit应用"""
+
+# ==================== Worker 进程 | Worker Process ====================
+
+def warm_caches():
+    """
+    预热进程级数据缓存
+
+    页面与 API 共用 core / backtest 模块内的缓存（同一进程内为同一模块对象），
+    在此读取信号、证券主表、检索索引、交易日历、归档索引与净值指标
+    """
+    from api import payloads
+    from core.search import index_for
+    from core.security_master import load_master
+    from core.trading_calendar import load_calendar
+
+    root = payloads.DataRoot(BASE_DIR)
+    start = time.perf_counter()
+    for warm in (lambda: payloads.latest_signals(root, 10),
+                 lambda: payloads.archive_dates(root),
+                 lambda: payloads.equity_series(root),
+                 lambda: index_for(load_master(root.securities_path)),
+                 lambda: load_calendar(root.holidays_path)):
+        try:
+            warm()
+        except Exception as e:
+            print(f"[警告] 预热失败: {e}")
+    print(f"[成功] 缓存预热完成（{(time.perf_counter() - start) * 1000:.0f} ms）")
+
+
+def run_worker(port, address='127.0.0.1'):
+    """预热后在当前进程内启动 Streamlit（等价于 streamlit run app_v3.py）"""
+    warm_caches()
+    from streamlit.web import cli as stcli
+
+    sys.argv = [
+        "streamlit", "run", APP_FILE,
+        "--server.headless", "true",
+        "--server.address", address,
+        "--server.port", str(port),
+    ]
+    stcli.main(prog_name="streamlit")
+
+
+class Worker:
+    """单个 worker 进程的状态与健康检查"""
+
+    def __init__(self, port, index=0):
+        self.port = port
+        self.index = index
+        self.proc = None
+        self.healthy = False
+        self.failures = 0
+        self.restarts = 0
+        self.started_at = 0.0
+        self.next_start = 0.0
+
+    def start(self):
+        env = dict(os.environ)
+        if env.get('EIGENFLOW_METRICS_PORT'):
+            # 每个 worker 的 /metrics 端口依次递增
+            env['EIGENFLOW_METRICS_PORT'] = str(int(env['EIGENFLOW_METRICS_PORT']) + self.index)
+        self.proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--worker", "--port", str(self.port)],
+            cwd=BASE_DIR,
+            env=env,
+        )
+        self.healthy = False
+        self.failures = 0
+        self.started_at = time.monotonic()
+
+    def stop(self, timeout=10):
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        self.healthy = False
+
+    def probe(self) -> bool:
+        """访问 Streamlit 健康检查端点"""
+        try:
+            url = f"http://127.0.0.1:{self.port}{HEALTH_PATH}"
+            with urllib.request.urlopen(url, timeout=HEALTH_TIMEOUT) as resp:
+                return resp.status == 200
+        except Exception:
+            return False
+
+    def schedule_restart(self, reason):
+        self.stop()
+        self.restarts += 1
+        delay = min(MAX_BACKOFF, 2 ** min(self.restarts, 6))
+        self.next_start = time.monotonic() + delay
+        self.proc = None
+        print(f"[警告] worker :{self.port} {reason}，{delay}s 后重启（第 {self.restarts} 次）")
+
+
+class Supervisor:
+    """启动、健康检查并重启 worker | Start, health-check and restart workers"""
+
+    def __init__(self, ports):
+        self.workers = [Worker(p, i) for i, p in enumerate(ports)]
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._healthy = ()       # 健康端口快照（整体替换），代理读取时不加锁
+
+    def healthy_ports(self):
+        """健康 worker 端口（无锁读取快照，供 asyncio 代理在事件循环内调用）"""
+        return self._healthy
+
+    def _publish(self):
+        """在 _lock 内调用：重建健康端口快照"""
+        self._healthy = tuple(w.port for w in self.workers if w.healthy)
+
+    def route(self, client_key: str):
+        """
+        会话粘滞路由：在健康 worker 中按 rendezvous 哈希选择
+
+        同一客户端总是落到同一 worker；某个 worker 下线时只有它的客户端迁移
+        """
+        ports = self.healthy_ports()
+        if not ports:
+            return None
+        return max(ports, key=lambda p: hashlib.blake2b(f"{client_key}|{p}".encode(), digest_size=8).digest())
+
+    def _check(self, worker):
+        now = time.monotonic()
+        if worker.proc is None:
+            if now >= worker.next_start:
+                worker.start()
+            return
+        reason = None
+        if worker.proc.poll() is not None:
+            reason = f"进程退出（code {worker.proc.returncode}）"
+        else:
+            ok = worker.probe()
+            with self._lock:
+                if ok:
+                    if not worker.healthy:
+                        print(f"[成功] worker :{worker.port} 已就绪（{now - worker.started_at:.1f}s）")
+                    worker.healthy = True
+                    worker.failures = 0
+                    worker.restarts = 0
+                elif worker.healthy:
+                    worker.failures += 1
+                    if worker.failures >= HEALTH_FAILURES:
+                        reason = "健康检查连续失败"
+                elif now - worker.started_at > STARTUP_TIMEOUT:
+                    reason = "启动超时"
+        if reason is None:
+            with self._lock:
+                self._publish()
+            return
+
+        # 锁内只摘除路由；stop() 可能阻塞到进程超时退出，必须在锁外执行
+        with self._lock:
+            worker.healthy = False
+            self._publish()
+        worker.schedule_restart(reason)
+
+    def run(self):
+        """监督循环（阻塞，直到 stop()） | Supervision loop"""
+        for worker in self.workers:
+            worker.start()
+        while not self._stop.is_set():
+            for worker in self.workers:
+                self._check(worker)
+            # 有 worker 尚未就绪时加快检查
+            starting = any(not w.healthy for w in self.workers)
+            self._stop.wait(1 if starting else HEALTH_INTERVAL)
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            for worker in self.workers:
+                worker.healthy = False
+            self._publish()
+        for worker in self.workers:
+            worker.stop()
+
+
+# ==================== 粘滞代理 | Sticky Proxy ====================
+
+SERVICE_UNAVAILABLE = (b"HTTP/1.1 503 Service Unavailable\r\n"
+                       b"Content-Type: text/plain; charset=utf-8\r\n"
+                       b"Content-Length: 19\r\nConnection: close\r\n\r\n"
+                       b"workers starting...")
+
+
+async def _pipe(reader, writer):
+    try:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        try:
+            writer.close()
+        except Exception:
+            pass
+
+
+FORWARDED_FOR = re.compile(rb'^x-forwarded-for:[ \t]*([^\r\n]*)', re.IGNORECASE | re.MULTILINE)
+
+
+async def _read_head(reader) -> bytes:
+    """读取首个 HTTP 请求头（不完整或超时时返回已读部分），之后原样转发"""
+    try:
+        return await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), HEAD_TIMEOUT)
+    except asyncio.IncompleteReadError as e:
+        return e.partial
+    except asyncio.LimitOverrunError as e:
+        return await reader.readexactly(e.consumed)
+    except asyncio.TimeoutError:
+        return b''
+
+
+def client_key(head: bytes, peer_ip: str) -> str:
+    """
+    粘滞路由键：X-Forwarded-For 中最左侧（原始客户端）地址，没有时为对端 IP
+
+    上游反向代理把所有请求汇聚到同一对端 IP，只按对端 IP 哈希会让全部会话落到一个 worker
+    """
+    match = FORWARDED_FOR.search(head)
+    if match:
+        first = match.group(1).split(b',')[0].strip()
+        if first:
+            return first.decode('latin-1')
+    return peer_ip
+
+
+async def _serve_proxy(supervisor, address, port):
+    async def handle(client_reader, client_writer):
+        peer = client_writer.get_extra_info('peername') or ('', 0)
+        head = await _read_head(client_reader)
+        target = supervisor.route(client_key(head, peer[0]))
+        if target is None:
+            client_writer.write(SERVICE_UNAVAILABLE)
+            await client_writer.drain()
+            client_writer.close()
+            return
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection('127.0.0.1', target)
+        except OSError:
+            client_writer.write(SERVICE_UNAVAILABLE)
+            await client_writer.drain()
+            client_writer.close()
+            return
+        upstream_writer.write(head)
+        await asyncio.gather(_pipe(client_reader, upstream_writer), _pipe(upstream_reader, client_writer))
+
+    server = await asyncio.start_server(handle, address, port)
+    async with server:
+        await server.serve_forever()
+
+
+def write_nginx_config(path, port, worker_ports):
+    """生成 Nginx 反向代理配置（X-Forwarded-For / 客户端 IP 粘滞 + WebSocket 升级）"""
+    servers = "\n".join(f"    server 127.0.0.1:{p} max_fails=3 fail_timeout=10s;" for p in worker_ports)
+    conf = f"""# 由 start.py 生成 | Generated by start.py
+map $http_upgrade $connection_upgrade {{
+    default upgrade;
+    ''      close;
+}}
+
+map $http_x_forwarded_for $eigenflow_client {{
+    ''      $remote_addr;
+    default $http_x_forwarded_for;
+}}
+
+upstream eigenflow_workers {{
+    hash $eigenflow_client consistent;
+{servers}
+}}
+
+server {{
+    listen {port};
+
+    location / {{
+        proxy_pass http://eigenflow_workers;
+        proxy_http_version 1.1;
+        proxy_set_header Upgrade $http_upgrade;
+        proxy_set_header Connection $connection_upgrade;
+        proxy_set_header Host $host;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+        proxy_read_timeout 86400;
+    }}
+}}
+"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(conf)
+
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def start_app(workers=1, port=DEFAULT_PORT, worker_base_port=DEFAULT_WORKER_BASE_PORT,
+              address="localhost", proxy="builtin", nginx_conf="nginx_eigenflow.conf"):
+    """启动Streamlit应用（单进程或多 worker + 代理）"""
     try:
         print("[火箭] 启动A股推荐网站...")
-        print("[手机] 浏览器将自动打开: http://localhost:8501")
+        print(f"[手机] 浏览器将自动打开: http://{address}:{port}")
         print("[叉号] 如需停止，按 Ctrl+C")
 
         # 检查是否安装了streamlit
@@ -42,21 +378,56 @@ def start_app():
             print("pip install streamlit pandas plotly")
             return
 
-        # 启动streamlit
-        print("\n正在启动浏览器...")
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", "app.py",
-            "--server.headless", "true",
-            "--server.address", "localhost",
-            "--server.port", "8501"
-        ])
+        if workers <= 1:
+            print("\n正在启动浏览器...")
+            run_worker(port, address)
+            return
+
+        ports = list(range(worker_base_port, worker_base_port + workers))
+        print(f"\n[图表] 启动 {workers} 个 worker（端口 {ports[0]}–{ports[-1]}）")
+        supervisor = Supervisor(ports)
+        if hasattr(signal, 'SIGTERM'):
+            # 被 kill 时与 Ctrl+C 一样先停止全部 worker
+            signal.signal(signal.SIGTERM, _raise_interrupt)
+        monitor = threading.Thread(target=supervisor.run, name="eigenflow-supervisor", daemon=True)
+        monitor.start()
+        try:
+            if proxy == "nginx":
+                write_nginx_config(nginx_conf, port, ports)
+                print(f"[成功] 已生成 Nginx 配置: {nginx_conf}（由 Nginx 监听 {port}）")
+                monitor.join()
+            else:
+                print(f"[成功] 内置粘滞代理监听 {address}:{port}")
+                asyncio.run(_serve_proxy(supervisor, address, port))
+        finally:
+            supervisor.stop()
     except KeyboardInterrupt:
         print("\n[再见] 网站已停止")
     except Exception as e:
         print(f"[错误] 启动失败: {e}")
-        print("请尝试手动运行：streamlit run app.py")
+        print("请尝试手动运行：streamlit run app_v3.py")
 
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="A股量化推荐网站启动器")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker 进程数，默认 CPU 核数；1 为单进程。会话按 X-Forwarded-For "
+                             "或客户端 IP 粘滞，同一 NAT / 未传 X-Forwarded-For 的上游代理后的用户会集中到一个 worker")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="对外端口")
+    parser.add_argument("--worker-base-port", type=int, default=DEFAULT_WORKER_BASE_PORT,
+                        help="worker 起始端口（连续占用 workers 个）")
+    parser.add_argument("--address", default="localhost", help="对外监听地址")
+    parser.add_argument("--proxy", choices=["builtin", "nginx"], default="builtin",
+                        help="builtin：内置粘滞代理；nginx：生成 Nginx 配置")
+    parser.add_argument("--nginx-conf", default="nginx_eigenflow.conf")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.port)
+        return
+
     print("=" * 50)
     print("[图表] A股量化推荐网站启动器")
     print("=" * 50)
@@ -75,7 +446,7 @@ def main():
 
     print("\n" + "=" * 50)
 
-    start_app()
+    start_app(args.workers, args.port, args.worker_base_port, args.address, args.proxy, args.nginx_conf)
 
 if __name__ == "__main__":
     main()
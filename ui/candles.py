@@ -0,0 +1,162 @@
+"""
+================================================================================
+EigenFlow Candles | 本地 K 线图
+
+基于本地行情存储（core.prices）与 Plotly 的自托管 K 线图，
+无需加载第三方脚本，可用于离线部署：
+- 服务端将日线聚合为周线 / 月线（开 first、高 max、低 min、收 last、量 sum）
+- 可选均线与成交量叠加
+- 每个周期只发送最近 MAX_BARS 根 K 线（约为图表宽度可分辨的数量）
+- 生成的 Figure 按 (存储版本, 代码, 周期, 叠加选项) 缓存
+- 配色遵循 A 股习惯：涨红跌绿
+================================================================================
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+
+# ==================== 常量 | Constants ====================
+
+# 月末重采样别名：pandas 2.2 起为 'ME'（'M' 已弃用），更早版本只认 'M'
+MONTH_END = 'ME' if tuple(int(p) for p in pd.__version__.split('.')[:2]) >= (2, 2) else 'M'
+
+INTERVALS = {
+    '日线 | D': None,
+    '周线 | W': 'W-FRI',
+    '月线 | M': MONTH_END,
+}
+
+MA_WINDOWS = (5, 20, 60)
+MA_COLORS = ('#f59e0b', '#8b5cf6', '#3498db')
+MAX_BARS = 350
+UP_COLOR = '#ef4444'
+DOWN_COLOR = '#10b981'
+
+
+# ==================== 聚合 | Aggregation ====================
+
+def aggregate(bars: pd.DataFrame, rule: str = None) -> pd.DataFrame:
+    """
+    日线聚合为更长周期
+
+    Args:
+        bars: date,open,high,low,close,volume 日线（按日期升序）
+        rule: pandas 重采样规则，None 为不聚合
+
+    Returns:
+        同结构的 K 线表，date 为该周期最后一个交易日
+    """
+    if rule is None or bars.empty:
+        return bars
+    out = bars.assign(last_day=bars['date']).set_index('date').resample(rule).agg({
+        'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum', 'last_day': 'last'
+    })
+    out = out.dropna(subset=['close']).rename(columns={'last_day': 'date'}).reset_index(drop=True)
+    return out[['date', 'open', 'high', 'low', 'close', 'volume']]
+
+
+def moving_average(close: np.ndarray, window: int) -> np.ndarray:
+    """简单移动平均（前 window-1 个为 NaN） | Simple moving average"""
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(len(close), np.nan)
+    if len(close) >= window:
+        csum = np.concatenate([[0.0], np.cumsum(close)])
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+# ==================== 图表 | Figure ====================
+
+def build_candle_figure(bars: pd.DataFrame, title: str = '', ma_windows=MA_WINDOWS,
+                        show_volume: bool = True, max_bars: int = MAX_BARS) -> go.Figure:
+    """
+    构建 K 线图
+
+    均线在截取最近 max_bars 根之前计算，保证首段均线完整
+    """
+    close = bars['close'].to_numpy(dtype=np.float64)
+    averages = [(w, moving_average(close, w)) for w in ma_windows]
+    bars = bars.tail(max_bars)
+    tail = slice(len(close) - len(bars), None)
+    dates = bars['date'].dt.strftime('%Y-%m-%d')
+
+    rows = 2 if show_volume else 1
+    fig = make_subplots(
+        rows=rows, cols=1, shared_xaxes=True, vertical_spacing=0.03,
+        row_heights=[0.75, 0.25] if show_volume else [1.0]
+    )
+    fig.add_trace(go.Candlestick(
+        x=dates,
+        open=bars['open'], high=bars['high'], low=bars['low'], close=bars['close'],
+        name='K线',
+        increasing=dict(line=dict(color=UP_COLOR), fillcolor=UP_COLOR),
+        decreasing=dict(line=dict(color=DOWN_COLOR), fillcolor=DOWN_COLOR),
+    ), row=1, col=1)
+
+    for (window, values), color in zip(averages, MA_COLORS):
+        fig.add_trace(go.Scatter(
+            x=dates, y=values[tail], mode='lines', name=f'MA{window}',
+            line=dict(color=color, width=1)
+        ), row=1, col=1)
+
+    if show_volume:
+        up = bars['close'].to_numpy() >= bars['open'].to_numpy()
+        fig.add_trace(go.Bar(
+            x=dates, y=bars['volume'], name='成交量 | Vol',
+            marker_color=np.where(up, UP_COLOR, DOWN_COLOR), showlegend=False
+        ), row=2, col=1)
+
+    fig.update_layout(
+        title=title,
+        height=480 if show_volume else 400,
+        template="plotly_white",
+        hovermode="x unified",
+        xaxis_rangeslider_visible=False,
+        margin=dict(l=10, r=10, t=40, b=10),
+        legend=dict(orientation='h', y=1.02, x=0)
+    )
+    # 隐藏非交易日（周末 / 节假日）造成的空档
+    fig.update_xaxes(type='category', nticks=8)
+    return fig
+
+
+_figures = {}
+_figures_lock = threading.Lock()
+_MAX_FIGURES = 128
+
+
+def candle_figure(store, symbol: str, interval: str = '日线 | D', ma_windows=MA_WINDOWS,
+                  show_volume: bool = True, title: str = ''):
+    """
+    返回本地 K 线图（按存储版本 / 代码 / 周期 / 叠加缓存）
+
+    Args:
+        store: core.prices.PriceStore
+        symbol: 6 位代码
+        interval: INTERVALS 中的周期
+
+    Returns:
+        go.Figure；存储中没有该代码时返回 None
+    """
+    ma_windows = tuple(ma_windows)
+    key = (store.version_dir, symbol, interval, ma_windows, show_volume, title)
+    with _figures_lock:
+        fig = _figures.get(key)
+    if fig is not None:
+        return fig
+    if symbol not in store:
+        return None
+
+    bars = aggregate(store.history(symbol), INTERVALS[interval])
+    fig = build_candle_figure(bars, title, ma_windows, show_volume)
+
+    with _figures_lock:
+        if len(_figures) >= _MAX_FIGURES:
+            _figures.clear()
+        _figures[key] = fig
+    return fig
@@ -0,0 +1,157 @@
+"""
+================================================================================
+EigenFlow Charts | 净值图表
+
+Backtest 标签页的服务端降采样与图表缓存：
+- LTTB（Largest-Triangle-Three-Buckets）保留曲线形状，点数按图表宽度确定
+- 完整分辨率数据留在服务端；选择较短区间时只对该区间降采样，
+  区间足够短时直接发送全部原始点
+- 生成的 Figure 按 (净值文件版本, 区间, 点数预算) 缓存；st.plotly_chart 每次重跑
+  仍会把 Figure 序列化为 JSON（无公开接口传入预序列化结果），其大小受点数预算限制
+================================================================================
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+# ==================== 常量 | Constants ====================
+
+CHART_WIDTH_PX = 700          # 与 .block-container max-width 一致
+POINTS_PER_PX = 2
+
+RANGE_OPTIONS = {
+    '全部 | All': None,
+    '5年 | 5Y': pd.DateOffset(years=5),
+    '1年 | 1Y': pd.DateOffset(years=1),
+    '6月 | 6M': pd.DateOffset(months=6),
+    '3月 | 3M': pd.DateOffset(months=3),
+}
+
+
+def point_budget(width_px: int = CHART_WIDTH_PX) -> int:
+    """由图表宽度确定点数预算 | Points to send for a chart this wide"""
+    return max(3, int(width_px * POINTS_PER_PX))
+
+
+# ==================== 降采样 | Downsampling ====================
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets 降采样
+
+    Args:
+        x, y: 数值型坐标（日期需先转为数字）
+        n_out: 输出点数
+
+    Returns:
+        被保留点的下标（含首尾）
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo = hi
+        nhi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nlo:nhi].mean()
+        avg_y = y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def minmax_downsample(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    最小 / 最大值分桶降采样（全向量化，适合极长序列）
+
+    每桶保留最小与最大点，输出约 n_out 个下标
+    """
+    n = len(y)
+    buckets = n_out // 2
+    if buckets < 1 or n <= n_out:
+        return np.arange(n)
+    size = n // buckets
+    body = np.asarray(y[:size * buckets]).reshape(buckets, size)
+    base = np.arange(buckets) * size
+    idx = np.concatenate([base + body.argmin(axis=1), base + body.argmax(axis=1), [n - 1]])
+    return np.unique(np.concatenate([[0], idx]))
+
+
+# ==================== 图表 | Figure ====================
+
+def build_equity_figure(dates, equity) -> go.Figure:
+    """构建净值曲线图 | Build the NAV line figure"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=dates,
+        y=equity,
+        mode='lines',
+        name='净值 | NAV',
+        line=dict(color='#3498db', width=2),
+        fill='tozeroy',
+        fillcolor='rgba(52, 152, 219, 0.1)'
+    ))
+
+    fig.update_layout(
+        title="策略净值曲线 | Strategy NAV Curve",
+        xaxis_title="日期 | Date",
+        yaxis_title="净值 | NAV",
+        height=350,
+        template="plotly_white",
+        hovermode="x unified"
+    )
+    return fig
+
+
+_figures = {}
+_figures_lock = threading.Lock()
+_MAX_FIGURES = 64
+
+
+def equity_figure(equity_df: pd.DataFrame, version, range_label: str = '全部 | All',
+                  width_px: int = CHART_WIDTH_PX) -> go.Figure:
+    """
+    返回降采样后的净值图（按版本 / 区间 / 宽度缓存）
+
+    Args:
+        equity_df: 完整分辨率的 date,equity 表（只读）
+        version: 净值文件版本（core.loader.FileVersion）
+        range_label: RANGE_OPTIONS 中的区间
+        width_px: 图表宽度（像素）
+    """
+    budget = point_budget(width_px)
+    key = (version, range_label, budget)
+    with _figures_lock:
+        fig = _figures.get(key)
+    if fig is not None:
+        return fig
+
+    dates = equity_df['date']
+    values = equity_df['equity'].to_numpy(dtype=np.float64)
+    offset = RANGE_OPTIONS.get(range_label)
+    if offset is not None and len(dates):
+        start = np.searchsorted(dates.to_numpy(), (dates.iloc[-1] - offset).to_datetime64())
+        dates, values = dates.iloc[start:], values[start:]
+
+    x = dates.to_numpy().astype('datetime64[ns]').astype(np.int64)
+    keep = lttb(x, values, budget)
+    fig = build_equity_figure(dates.iloc[keep], values[keep])
+
+    with _figures_lock:
+        if len(_figures) >= _MAX_FIGURES:
+            _figures.clear()
+        _figures[key] = fig
+    return fig
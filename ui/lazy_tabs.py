@@ -0,0 +1,79 @@
+"""
+================================================================================
+EigenFlow Lazy Tabs | 按需计算的标签页
+
+- lazy_tabs：只有当前选中的标签页会执行其内容；
+  依赖 st.tabs(key=..., on_change="rerun") 的选中状态，旧版 Streamlit 自动回退为全部执行
+- prefetch：后台线程预热“下一个可能打开”的标签页所需数据（只做数据缓存，
+  不调用任何 Streamlit API），同一任务进行中时不重复提交
+================================================================================
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+
+# ==================== 标签页 | Tabs ====================
+
+def lazy_tabs(labels, key: str):
+    """
+    创建带选中状态的标签页
+
+    Returns:
+        (tabs, opened)：opened[i] 为 True 表示第 i 个标签页需要渲染
+    """
+    try:
+        tabs = st.tabs(labels, key=key, on_change="rerun")
+    except TypeError:
+        # 旧版本不支持选中状态：全部渲染
+        tabs = st.tabs(labels)
+        return tabs, [True] * len(tabs)
+
+    opened = [bool(getattr(tab, 'open', False)) for tab in tabs]
+    if not any(opened):
+        opened[0] = True
+    return tabs, opened
+
+
+def next_tab(opened) -> int:
+    """下一个可能打开的标签页（按顺序的下一个） | Most likely next tab"""
+    current = opened.index(True) if True in opened else 0
+    return (current + 1) % len(opened)
+
+
+# ==================== 后台预取 | Background Prefetch ====================
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='eigenflow-prefetch')
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def prefetch(task_key, func, *args):
+    """
+    在后台执行数据预热任务
+
+    Args:
+        task_key: 去重键（通常含数据版本）；同键任务未完成前不会重复提交
+        func: 纯数据函数，不得调用 Streamlit API
+    """
+    with _pending_lock:
+        if task_key in _pending:
+            return
+        _pending.add(task_key)
+
+    def run():
+        try:
+            func(*args)
+        except Exception:
+            # 预热失败不影响页面（标签页打开时会同步重算），但需留下记录
+            logger.exception("prefetch %r failed", task_key)
+        finally:
+            with _pending_lock:
+                _pending.discard(task_key)
+
+    _executor.submit(run)
@@ -0,0 +1,114 @@
+"""
+================================================================================
+EigenFlow Signal List | 信号清单渲染
+
+将 Featured / Silver / Other 三档信号一次性渲染为单个 HTML 片段：
+- 模板在模块加载时确定，逐行只做 format_map，整表一次 join
+- 直接使用列数组（代码 / 名称 / 分数），不做 iloc 逐行取值
+- 结果按信号文件版本缓存，整张清单作为一个元素发送
+- 档位规则：Rank 1 精选，Rank 2–3 银牌，其余为其他信号（支持 Top-50/100）
+
+注意：模板不含行首缩进与空行，避免被 Markdown 识别为代码块
+================================================================================
+"""
+
+import html
+import threading
+
+import numpy as np
+
+
+# ==================== 模板 | Templates ====================
+
+FEATURED_TEMPLATE = (
+    '<div class="signal-card risk-on" style="border: 2px solid #f59e0b;">'
+    '<div class="signal-label" style="color: #b45309;">★ Featured Signal</div>'
+    '<div style="font-size: 1.2em; font-weight: 700; color: #1a1a2e;">{code} · {name}</div>'
+    '<div style="font-size: 0.85em; color: #78350f; margin-top: 4px;">Score: {score}</div>'
+    '</div>'
+)
+
+SILVER_HEADER = '<h4>◆ Silver Tier</h4>'
+SILVER_TEMPLATE = (
+    '<div class="stock-item" style="border-left-color: #6b7280;">'
+    '<div style="display: flex; justify-content: space-between; align-items: center;">'
+    '<div><strong>{code}</strong><span style="color: #666; margin-left: 8px;">{name}</span></div>'
+    '<div style="color: #6b7280; font-weight: 500;">{score}</div>'
+    '</div></div>'
+)
+
+OTHER_HEADER = '<h4>◇ Other Signals</h4>'
+OTHER_TEMPLATE = (
+    '<div class="stock-item">'
+    '<div style="display: flex; justify-content: space-between; align-items: center;">'
+    '<div><span style="color: #999; margin-right: 8px;">{rank}.</span>'
+    '<strong>{code}</strong><span style="color: #666; margin-left: 8px;">{name}</span></div>'
+    '<div style="color: #9ca3af;">{score}</div>'
+    '</div></div>'
+)
+
+SILVER_RANKS = 3
+
+
+# ==================== 渲染 | Rendering ====================
+
+def render_signal_html(symbols, names, scores) -> str:
+    """
+    由列数组渲染完整信号清单
+
+    Args:
+        symbols: 6 位代码序列（已按 rank 排序）
+        names: 名称序列
+        scores: 分数序列
+
+    Returns:
+        HTML 字符串
+    """
+    n = len(symbols)
+    if n == 0:
+        return ''
+
+    codes = [html.escape(str(c)) for c in symbols]
+    labels = [html.escape(str(x)) for x in names]
+    score_text = np.char.mod('%.2f', np.asarray(scores, dtype=np.float64)).tolist()
+    rows = [{'rank': i + 1, 'code': c, 'name': m, 'score': s}
+            for i, (c, m, s) in enumerate(zip(codes, labels, score_text))]
+
+    parts = [FEATURED_TEMPLATE.format_map(rows[0])]
+    if n >= SILVER_RANKS:
+        parts.append(SILVER_HEADER)
+        parts.extend(SILVER_TEMPLATE.format_map(r) for r in rows[1:SILVER_RANKS])
+    if n > SILVER_RANKS:
+        parts.append(OTHER_HEADER)
+        parts.extend(OTHER_TEMPLATE.format_map(r) for r in rows[SILVER_RANKS:])
+    return '\n'.join(parts)
+
+
+_html_cache = {}
+_html_lock = threading.Lock()
+_MAX_ENTRIES = 128
+
+
+def signal_list_html(df, version_key) -> str:
+    """
+    渲染并按版本缓存信号清单
+
+    Args:
+        df: 含 symbol（可选 name / score）的 Top-N 表
+        version_key: 信号来源版本（文件版本 + 日期 + N 等），决定缓存命中
+    """
+    with _html_lock:
+        cached = _html_cache.get(version_key)
+    if cached is not None:
+        return cached
+
+    symbols = df['symbol'].tolist()
+    names = df['name'].tolist() if 'name' in df.columns else symbols
+    scores = df['score'].to_numpy() if 'score' in df.columns else np.zeros(len(df))
+    result = render_signal_html(symbols, names, scores)
+
+    with _html_lock:
+        if len(_html_cache) >= _MAX_ENTRIES:
+            _html_cache.clear()
+        _html_cache[version_key] = result
+    return result